@@ -0,0 +1,147 @@
+"""
+Quality and speed of the vector bin-packing heuristics.
+
+Quality: every heuristic (and the CPU-only baselines) places --batches
+random batches of each --sizes on --clusters clusters; the table gives the
+mean excess of its peak utilization over the MinUtilizationOptimizer
+optimum, and the batches it failed to place. Speed: the p50/p99 latency and
+rate of single-VM admission decisions through optimize() on a 50-cluster
+fleet, the cost of the decision itself (GreedyPlacementEngine.select on a
+ClusterState, without building an optimizer from the usage dicts), and the
+VMs per second of one batch of 50k VMs.
+
+Usage:
+    python -m benchmarks.bench_bin_packing [--sizes 10 100 300] [--clusters 3]
+        [--batches 5] [--decisions 2000]
+"""
+
+import argparse
+import copy
+import time
+
+import numpy as np
+
+from benchmarks.bench_warm_start import make_batch
+from src.models.baseline_optimizer import BaselineOptimizer
+from src.models.baseline_optimizer_inv import BaselineOptimizerInv
+from src.models.bin_packing_optimizer import (
+    BestFitOptimizer,
+    DotProductOptimizer,
+    FirstFitDecreasingOptimizer,
+    MaxMinResidualOptimizer,
+)
+from src.models.cluster_state import ClusterState
+from src.models.greedy_engine import GreedyPlacementEngine
+from src.models.min_max_optimizer import MinUtilizationOptimizer
+
+HEURISTICS = [
+    FirstFitDecreasingOptimizer,
+    BestFitOptimizer,
+    DotProductOptimizer,
+    MaxMinResidualOptimizer,
+    BaselineOptimizer,
+    BaselineOptimizerInv,
+]
+
+
+def place(optimizer_class, batch, **kwargs):
+    # The baselines write the placement back into the usage dicts
+    return optimizer_class(**copy.deepcopy(batch), seed=0, **kwargs).optimize()[2]
+
+
+def quality(sizes, num_clusters, batches):
+    """{size: {optimizer: (mean excess over the optimum, failures)}}"""
+    table = {}
+    for num_vms in sizes:
+        excess = {h: [] for h in HEURISTICS}
+        failures = dict.fromkeys(HEURISTICS, 0)
+        for seed in range(batches):
+            batch = make_batch(num_vms, num_clusters, seed)
+            optimum = place(MinUtilizationOptimizer, batch)
+            for optimizer_class in HEURISTICS:
+                z = place(optimizer_class, batch)
+                if z is None:
+                    failures[optimizer_class] += 1
+                else:
+                    excess[optimizer_class].append(z / optimum - 1)
+        table[num_vms] = {
+            h: (np.mean(excess[h]) if excess[h] else np.nan, failures[h])
+            for h in HEURISTICS
+        }
+    return table
+
+
+def admission(optimizer_class, fleet, demands):
+    """Seconds of each single-VM optimize() call"""
+    times = []
+    for k, demand in enumerate(demands):
+        start = time.perf_counter()
+        optimizer_class(
+            fleet["clusters"],
+            {},
+            [f"vm{k}"],
+            fleet["current_usage"],
+            fleet["cluster_capacity"],
+            {f"vm{k}": demand},
+            seed=0,
+        ).optimize()
+        times.append(time.perf_counter() - start)
+    return np.array(times)
+
+
+def decision(optimizer_class, state, demands):
+    """Seconds of each GreedyPlacementEngine.select call with the heuristic's score"""
+    engine = GreedyPlacementEngine(state, score=optimizer_class.score, seed=0)
+    vectors = [state.demand_vector(demand) for demand in demands]
+    times = []
+    for vector in vectors:
+        start = time.perf_counter()
+        engine.select(vector)
+        times.append(time.perf_counter() - start)
+    return np.array(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bin-packing heuristics")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 300])
+    parser.add_argument("--clusters", type=int, default=3)
+    parser.add_argument("--batches", type=int, default=5)
+    parser.add_argument("--decisions", type=int, default=2000)
+    args = parser.parse_args()
+
+    table = quality(args.sizes, args.clusters, args.batches)
+    print("Peak utilization over the MinUtilizationOptimizer optimum (failed batches)")
+    print(f"{'optimizer':<28}" + "".join(f"{f'{n} vms':>16}" for n in args.sizes))
+    for optimizer_class in HEURISTICS:
+        cells = ""
+        for num_vms in args.sizes:
+            excess, failed = table[num_vms][optimizer_class]
+            cells += f"{excess:>11.2%} ({failed})"
+        print(f"{optimizer_class.__name__:<28}{cells}")
+
+    fleet = make_batch(50000, 50)
+    state = ClusterState.from_dicts(
+        fleet["clusters"], fleet["current_usage"], fleet["cluster_capacity"]
+    )
+    demands = [fleet["vm_demand"][vm] for vm in fleet["new_vms"][: args.decisions]]
+    print()
+    print("Single-VM admission on 50 clusters")
+    print(
+        f"{'optimizer':<28} {'optimize p50 us':>15} {'p99 us':>8} "
+        f"{'decisions/s':>11} {'select p50 us':>13} {'50k batch VMs/s':>15}"
+    )
+    for optimizer_class in HEURISTICS[:4]:
+        times = admission(optimizer_class, fleet, demands) * 1e6
+        select = decision(optimizer_class, state, demands) * 1e6
+        start = time.perf_counter()
+        place(optimizer_class, fleet)
+        rate = len(fleet["new_vms"]) / (time.perf_counter() - start)
+        print(
+            f"{optimizer_class.__name__:<28} {np.median(times):15.0f} "
+            f"{np.percentile(times, 99):8.0f} {1e6 / times.mean():11.0f} "
+            f"{np.median(select):13.1f} {rate:15.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Model size and solve time of the two-level HostAwareOptimizer against the
+flat x[v,h] formulation.
+
+The fleet has --hosts hosts split evenly over --clusters clusters, each host
+already running one VM. Both models are built for the same --vms new VMs;
+the flat one is only solved when it fits in the CPLEX Community Edition
+limits (1000 variables and constraints), otherwise only its build time and
+size are reported. Both are solved to a relative MIP gap of --mip-gap:
+proving the last 0.1% optimal dominates the solve time of either model.
+
+Usage:
+    python -m benchmarks.bench_host_aware [--hosts 1000] [--clusters 8] [--vms 100]
+        [--mip-gap 0.001]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.models.host_aware_optimizer import HostAwareOptimizer
+
+RESOURCES = ["cpu", "mem", "disk"]
+COMMUNITY_EDITION_LIMIT = 1000
+
+
+class FlatHostAwareOptimizer(HostAwareOptimizer):
+    decompose = False
+
+
+def make_fleet(num_hosts, num_clusters, num_vms, seed=0):
+    rng = np.random.default_rng(seed)
+    clusters = [f"c{i + 1}" for i in range(num_clusters)]
+    hosts = [f"h{k + 1}" for k in range(num_hosts)]
+    host_cluster = {h: clusters[k % num_clusters] for k, h in enumerate(hosts)}
+    host_capacity = {h: dict.fromkeys(RESOURCES, 100.0) for h in hosts}
+
+    vm_demand = {}
+    existing_placements = {}
+    for h in hosts:
+        vm = f"old_{h}"
+        vm_demand[vm] = dict(zip(RESOURCES, rng.uniform(10.0, 70.0, 3).tolist()))
+        existing_placements[vm] = h
+    new_vms = [f"vm{k + 1}" for k in range(num_vms)]
+    for vm in new_vms:
+        vm_demand[vm] = dict(zip(RESOURCES, rng.uniform(5.0, 30.0, 3).tolist()))
+
+    return dict(
+        clusters=clusters,
+        existing_placements=existing_placements,
+        new_vms=new_vms,
+        current_usage=None,
+        cluster_capacity=None,
+        vm_demand=vm_demand,
+        hosts=hosts,
+        host_capacity=host_capacity,
+        host_cluster=host_cluster,
+        seed=0,
+    )
+
+
+def measure(optimizer_class, fleet, mip_gap):
+    """(variables, constraints, build seconds, solve seconds, z) of one model"""
+    start = time.perf_counter()
+    optimizer = optimizer_class(**fleet)
+    model = optimizer.create_model()
+    optimizer.add_objective()
+    model.parameters.mip.tolerances.mipgap = mip_gap
+    built = time.perf_counter() - start
+
+    size = (model.number_of_variables, model.number_of_constraints)
+    if max(size) > COMMUNITY_EDITION_LIMIT:
+        return (*size, built, None, None)
+
+    start = time.perf_counter()
+    _, _, z, _ = optimizer.solve()
+    return (*size, built, time.perf_counter() - start, z)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host-aware placement models")
+    parser.add_argument("--hosts", type=int, default=1000)
+    parser.add_argument("--clusters", type=int, default=8)
+    parser.add_argument("--vms", type=int, default=100)
+    parser.add_argument("--mip-gap", type=float, default=1e-3)
+    args = parser.parse_args()
+
+    # The requested fleet, then a small one both models can solve
+    sizes = [(args.hosts, args.clusters, args.vms), (30, 3, 15)]
+
+    print(
+        f"{'hosts x vms':<14} {'model':<8} {'vars':>8} {'consts':>8} "
+        f"{'build s':>9} {'solve s':>9} {'z':>8}"
+    )
+    for num_hosts, num_clusters, num_vms in sizes:
+        fleet = make_fleet(num_hosts, num_clusters, num_vms)
+        for name, optimizer_class in [
+            ("2-level", HostAwareOptimizer),
+            ("flat", FlatHostAwareOptimizer),
+        ]:
+            variables, constraints, built, solved, z = measure(
+                optimizer_class, fleet, args.mip_gap
+            )
+            solve = f"{solved:9.3f}" if solved is not None else f"{'-':>9}"
+            value = f"{z:8.4f}" if z is not None else f"{'-':>8}"
+            print(
+                f"{f'{num_hosts} x {num_vms}':<14} {name:<8} {variables:>8} "
+                f"{constraints:>8} {built:9.3f} {solve} {value}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Per-placement latency of a fresh MinUtilizationOptimizer MIP per placement
+against the incremental docplex model and the closed-form single-VM path,
+on the 100-VM test scenarios.
+
+Usage:
+    python -m benchmarks.bench_incremental
+"""
+
+import copy
+import random
+
+import matplotlib
+import numpy as np
+
+from src.models.incremental_optimizer import IncrementalMinUtilizationOptimizer
+from src.models.min_max_optimizer import MinUtilizationOptimizer
+from src.services.sequential_placement import SequentialPlacementSimulation
+from src.services.test_config import generate_test_scenarios
+from src.services.utils import OutputManager
+
+matplotlib.use("Agg")
+
+
+class ColdMinUtilizationOptimizer(MinUtilizationOptimizer):
+    """MinUtilizationOptimizer forced through CPLEX for single VMs"""
+
+    analytical_single_vm = False
+
+
+OPTIMIZERS = [
+    ColdMinUtilizationOptimizer,
+    IncrementalMinUtilizationOptimizer,
+    MinUtilizationOptimizer,
+]
+
+
+def run_scenario(scenario, optimizer_model, output_manager, seed=0):
+    """Run one scenario with the given optimizer and return its execution times"""
+    config = copy.copy(scenario)
+    config.optimizer_model = optimizer_model
+    random.seed(seed)
+    simulation = SequentialPlacementSimulation(config, output_manager)
+    simulation.run_simulation()
+    return simulation.execution_times
+
+
+def main():
+    output_manager = OutputManager()
+    scenarios = [
+        s
+        for s in generate_test_scenarios()
+        if s.num_vms == 100
+        and s.optimizer_model is MinUtilizationOptimizer
+        and s.batch_size == 1
+    ]
+
+    print(f"{'scenario':<24} {'optimizer':<44} {'mean ms':>9} {'p50 ms':>9}")
+    for scenario in scenarios:
+        means = {}
+        for optimizer_model in OPTIMIZERS:
+            times = run_scenario(scenario, optimizer_model, output_manager)
+            means[optimizer_model] = np.mean(times)
+            print(
+                f"{scenario.name:<24} {optimizer_model.__name__:<44} "
+                f"{np.mean(times) * 1000:>9.2f} {np.median(times) * 1000:>9.2f}"
+            )
+        for optimizer_model in OPTIMIZERS[1:]:
+            speedup = means[ColdMinUtilizationOptimizer] / means[optimizer_model]
+            print(
+                f"{scenario.name:<24} {'speedup ' + optimizer_model.__name__:<44} "
+                f"{speedup:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
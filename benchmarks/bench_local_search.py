@@ -0,0 +1,69 @@
+"""
+Quality and time of LocalSearchOptimizer on batches up to a nightly
+rebalancing of 50k VMs.
+
+Each --size VMS:CLUSTERS batch places VMS new VMs on CLUSTERS clusters
+(capacities drawn so that the batch takes roughly half of the free space,
+unevenly over resources). Reports the greedy start's peak utilization, the
+local search result and lower bound within --time-limit, the gap between
+them and the wall time. When the MinUtilizationOptimizer MIP fits in the
+CPLEX Community Edition limits it is also solved, for the exact z.
+
+Usage:
+    python -m benchmarks.bench_local_search [--size 300:3 --size 50000:50]
+        [--time-limit 10] [--solver docplex]
+"""
+
+import argparse
+import time
+
+from benchmarks.bench_warm_start import COMMUNITY_EDITION_LIMIT, make_batch
+from src.models.local_search_optimizer import LocalSearchOptimizer
+from src.models.min_max_optimizer import MinUtilizationOptimizer
+from src.models.solvers import SOLVERS
+
+SIZES = ["300:3", "5000:20", "50000:50"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local search optimizer")
+    parser.add_argument("--size", action="append", help="VMS:CLUSTERS batch")
+    parser.add_argument("--time-limit", type=float, default=10.0)
+    parser.add_argument("--solver", choices=SOLVERS, default="docplex")
+    args = parser.parse_args()
+
+    print(
+        f"{'vms':>6} {'clusters':>8} {'greedy z':>8} {'z':>8} {'bound':>8} "
+        f"{'gap':>6} {'seconds':>8} {'mip z':>8}"
+    )
+    for size in args.size or SIZES:
+        num_vms, num_clusters = map(int, size.split(":"))
+        batch = make_batch(num_vms, num_clusters)
+
+        optimizer = LocalSearchOptimizer(
+            **batch, seed=0, solver=args.solver, time_limit=args.time_limit
+        )
+        start = time.perf_counter()
+        _, _, z, _ = optimizer.optimize()
+        elapsed = time.perf_counter() - start
+
+        greedy = LocalSearchOptimizer(**batch, seed=0)
+        greedy.create_model()
+        greedy.initial_assignment()
+
+        mip_z = f"{'-':>8}"
+        if num_vms * num_clusters + 1 <= COMMUNITY_EDITION_LIMIT:
+            reference = MinUtilizationOptimizer(
+                **batch, solver=args.solver, time_limit=args.time_limit
+            )
+            mip_z = f"{reference.optimize()[2]:8.4f}"
+
+        print(
+            f"{num_vms:>6} {num_clusters:>8} {greedy.work.peak_utilization():8.4f} "
+            f"{z:8.4f} {optimizer.bound:8.4f} {optimizer.gap:6.2%} "
+            f"{elapsed:8.2f} {mip_z}"
+        )
+
+
+if __name__ == "__main__":
+    main()
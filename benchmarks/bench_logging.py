@@ -0,0 +1,62 @@
+"""
+Placement time of every test scenario with quiet (WARNING) and verbose
+(DEBUG) logging. Verbose records are formatted and written to os.devnull, so
+the difference is the cost of building and emitting the messages.
+
+Usage:
+    python -m benchmarks.bench_logging
+"""
+
+import copy
+import logging
+import os
+
+import matplotlib
+import numpy as np
+
+from src.services.sequential_placement import SequentialPlacementSimulation
+from src.services.test_config import generate_test_scenarios
+from src.services.utils import OutputManager
+
+matplotlib.use("Agg")
+
+LEVELS = {"quiet": logging.WARNING, "verbose": logging.DEBUG}
+
+
+def run_scenario(scenario, level, output_manager, seed=0):
+    """Run one scenario at the given log level and return its execution times"""
+    logger = logging.getLogger("src")
+    handler = logging.StreamHandler(open(os.devnull, "w"))
+    logger.addHandler(handler)
+    logger.propagate = False
+    logger.setLevel(level)
+    try:
+        scenario = copy.copy(scenario)
+        scenario.seed = seed
+        simulation = SequentialPlacementSimulation(scenario, output_manager)
+        simulation.run_simulation()
+    finally:
+        logger.removeHandler(handler)
+        handler.stream.close()
+        logger.propagate = True
+    return simulation.execution_times
+
+
+def main():
+    output_manager = OutputManager()
+
+    print(f"{'scenario':<40} {'quiet ms':>9} {'verbose ms':>11} {'ratio':>7}")
+    for scenario in generate_test_scenarios():
+        means = {
+            name: np.mean(run_scenario(scenario, level, output_manager))
+            for name, level in LEVELS.items()
+        }
+        print(
+            f"{scenario.name:<40} {means['quiet'] * 1000:>9.3f} "
+            f"{means['verbose'] * 1000:>11.3f} "
+            f"{means['verbose'] / means['quiet']:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
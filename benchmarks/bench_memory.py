@@ -0,0 +1,95 @@
+"""
+Memory held by a simulation's metrics and placement histories.
+
+Runs one simulation with keep_history=True and one without, measures with
+tracemalloc the memory retained by each finished simulation and reports the
+difference, i.e. the cost of the in-memory histories. A round-robin
+optimizer keeps the run itself fast and its cost independent of the number
+of placements, so 100k placements take seconds.
+
+Usage:
+    python -m benchmarks.bench_memory [--vms 100000] [--clusters 3]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from src.models.base_optimizer import BaseVMOptimizer
+from src.services.sequential_placement import SequentialPlacementSimulation
+from src.services.test_config import TestConfig
+
+
+class RoundRobinOptimizer(BaseVMOptimizer):
+    """Places VM k on cluster k mod n and reports the resulting utilization"""
+
+    def create_model(self):
+        pass
+
+    def add_objective(self):
+        pass
+
+    def solve(self):
+        placement_plan = {}
+        cluster_utilization = {c: dict(u) for c, u in self.current_usage.items()}
+        offset = len(self.existing_placements)
+        for k, vm in enumerate(self.new_vms):
+            cluster = self.clusters[(offset + k) % len(self.clusters)]
+            placement_plan[vm] = cluster
+            for r in self.resources:
+                cluster_utilization[cluster][r] += (
+                    self.vm_demand[vm][r] / self.cluster_capacity[cluster][r]
+                )
+        return placement_plan, cluster_utilization, 0.0, {}
+
+    def optimize(self):
+        return self.solve()
+
+
+def large_config(num_vms, num_clusters):
+    clusters = [f"c{i + 1}" for i in range(num_clusters)]
+    return TestConfig(
+        name="memory",
+        num_vms=num_vms,
+        clusters=clusters,
+        cluster_capacity={c: {"cpu": 1e9, "mem": 1e9, "disk": 1e9} for c in clusters},
+        optimizer_model=RoundRobinOptimizer,
+        seed=0,
+    )
+
+
+def measure(num_vms, num_clusters, keep_history):
+    """Bytes retained by a finished simulation and its run time"""
+    config = large_config(num_vms, num_clusters)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    simulation = SequentialPlacementSimulation(config, None, keep_history=keep_history)
+    simulation.run_simulation()
+    elapsed = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    assert len(simulation.existing_placements) == num_vms
+    return retained, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulation history memory")
+    parser.add_argument("--vms", type=int, default=100000)
+    parser.add_argument("--clusters", type=int, default=3)
+    args = parser.parse_args()
+
+    with_history, elapsed = measure(args.vms, args.clusters, keep_history=True)
+    without_history, _ = measure(args.vms, args.clusters, keep_history=False)
+    history = with_history - without_history
+    print(
+        f"{args.vms} placements on {args.clusters} clusters ({elapsed:.1f}s)\n"
+        f"  retained with history:    {with_history / 2**20:8.1f} MiB\n"
+        f"  retained without history: {without_history / 2**20:8.1f} MiB\n"
+        f"  histories:                {history / 2**20:8.1f} MiB "
+        f"({history / args.vms:.0f} bytes/placement)"
+    )
+
+
+if __name__ == "__main__":
+    main()
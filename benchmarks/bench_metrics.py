@@ -0,0 +1,76 @@
+"""
+Cost per placement step of the metrics pass: full recomputation with
+PlacementMetrics.calculate_metrics (from the usage dicts and from a
+ClusterState) against IncrementalMetricsTracker, which only updates the
+cluster that changed.
+
+Usage:
+    python -m benchmarks.bench_metrics
+"""
+
+import time
+
+import numpy as np
+
+from src.models.cluster_state import ClusterState
+from src.services.metrics import IncrementalMetricsTracker, PlacementMetrics
+
+RESOURCES = ["cpu", "mem", "disk"]
+
+
+def placements(num_clusters, steps, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(num_clusters, size=steps), rng.uniform(0, 1e-4, (steps, 3))
+
+
+def bench_dicts(clusters, usage, steps):
+    current_usage = {c: dict(zip(RESOURCES, row)) for c, row in zip(clusters, usage)}
+    start = time.perf_counter()
+    for i, delta in zip(*steps):
+        for r, d in zip(RESOURCES, delta):
+            current_usage[clusters[i]][r] += d
+        PlacementMetrics().calculate_metrics(current_usage, 0.0)
+    return time.perf_counter() - start
+
+
+def bench_state(clusters, usage, steps):
+    state = ClusterState(clusters, np.ones_like(usage), usage)
+    start = time.perf_counter()
+    for i, delta in zip(*steps):
+        state.place(i, delta)
+        PlacementMetrics().calculate_metrics(state, 0.0)
+    return time.perf_counter() - start
+
+
+def bench_tracker(clusters, usage, steps):
+    initial_usage = {c: dict(zip(RESOURCES, row)) for c, row in zip(clusters, usage)}
+    tracker = IncrementalMetricsTracker(clusters, initial_usage)
+    start = time.perf_counter()
+    for i, delta in zip(*steps):
+        tracker.add_usage(i, delta)
+        tracker.record()
+    return time.perf_counter() - start
+
+
+def main(num_steps=2000):
+    print(
+        f"{'clusters':>8} {'dicts us':>10} {'state us':>10} {'tracker us':>11} "
+        f"{'speedup':>8}"
+    )
+    for num_clusters in [10, 100, 1000, 5000]:
+        clusters = [f"c{i + 1}" for i in range(num_clusters)]
+        usage = np.random.default_rng(1).uniform(0.1, 0.5, (num_clusters, 3))
+        steps = placements(num_clusters, num_steps)
+
+        times = [
+            bench(clusters, usage.copy(), steps) / num_steps * 1e6
+            for bench in (bench_dicts, bench_state, bench_tracker)
+        ]
+        print(
+            f"{num_clusters:>8} {times[0]:>10.1f} {times[1]:>10.1f} "
+            f"{times[2]:>11.1f} {times[0] / times[2]:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Admission latency and throughput of the placement service under load.
+
+Starts the service in-process on an ephemeral local port and runs a
+closed-loop load generator: each of --concurrency clients holds one
+connection and sends --requests single-VM place requests back to back.
+Every optimizer is run unbatched (max_batch=1) and micro-batched
+(--max-batch VMs, --max-wait ms). Reports client-side p50/p99 latency, the
+request rate and the mean number of requests per solved batch. Clusters are
+large enough that no request is rejected.
+
+Usage:
+    python -m benchmarks.bench_placement_service [--concurrency 1 8 32]
+        [--requests 50] [--max-batch 64] [--max-wait 0] [--solver docplex]
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from src.models.bin_packing_optimizer import MaxMinResidualOptimizer
+from src.models.min_max_optimizer import MinUtilizationOptimizer
+from src.models.solvers import SOLVERS
+from src.services.metrics import latency_summary
+from src.services.placement_service import PlacementClient, PlacementService
+
+RESOURCES = ["cpu", "mem", "disk"]
+NUM_CLUSTERS = 8
+
+
+def make_service(optimizer_class, max_batch, max_wait, solver):
+    rng = np.random.default_rng(0)
+    clusters = [f"c{i + 1}" for i in range(NUM_CLUSTERS)]
+    usage = rng.uniform(0.1, 0.4, (NUM_CLUSTERS, len(RESOURCES)))
+    return PlacementService(
+        clusters,
+        {c: dict(zip(RESOURCES, row)) for c, row in zip(clusters, usage.tolist())},
+        {c: dict.fromkeys(RESOURCES, 1e6) for c in clusters},
+        optimizer_class=optimizer_class,
+        max_batch=max_batch,
+        max_wait=max_wait,
+        seed=0,
+        solver=solver,
+    )
+
+
+async def client_loop(port, client_id, num_requests, latencies):
+    rng = np.random.default_rng(client_id)
+    client = await PlacementClient.connect(port=port)
+    for k in range(num_requests):
+        demand = dict(zip(RESOURCES, rng.uniform(5.0, 20.0, 3).tolist()))
+        start = time.perf_counter()
+        response = await client.place({f"vm{client_id}_{k}": demand})
+        latencies.append(time.perf_counter() - start)
+        assert "error" not in response, response
+    await client.close()
+
+
+async def run_load(service, concurrency, num_requests):
+    server = await service.serve(port=0)
+    port = server.sockets[0].getsockname()[1]
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(client_loop(port, i, num_requests, latencies) for i in range(concurrency))
+    )
+    elapsed = time.perf_counter() - start
+    server.close()
+    await server.wait_closed()
+    await service.stop()
+    return latency_summary(latencies), len(latencies) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Placement service load test")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=50, help="Per client")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait", type=float, default=0.0, help="Milliseconds")
+    parser.add_argument("--solver", choices=SOLVERS, default="docplex")
+    args = parser.parse_args()
+
+    print(
+        f"{'optimizer':<24} {'mode':<8} {'clients':>7} {'p50 ms':>8} "
+        f"{'p99 ms':>8} {'req/s':>8} {'batch':>6}"
+    )
+    for optimizer_class in [MinUtilizationOptimizer, MaxMinResidualOptimizer]:
+        for concurrency in args.concurrency:
+            for mode, max_batch in [("single", 1), ("batched", args.max_batch)]:
+                service = make_service(
+                    optimizer_class, max_batch, args.max_wait / 1000.0, args.solver
+                )
+                latency, rate = asyncio.run(
+                    run_load(service, concurrency, args.requests)
+                )
+                print(
+                    f"{optimizer_class.__name__:<24} {mode:<8} {concurrency:>7} "
+                    f"{latency['p50'] * 1000:8.2f} {latency['p99'] * 1000:8.2f} "
+                    f"{rate:8.0f} {service.stats()['mean_batch_size']:6.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
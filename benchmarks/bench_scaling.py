@@ -0,0 +1,83 @@
+"""
+Placement cost against the number of clusters.
+
+For every size of the sweep, generates a scenario with
+scenario_generator.generate_scenario (heterogeneous capacities, skewed
+initial utilization, correlated lognormal demands) and reports its
+generation time. Then, for every optimizer, --vms single-VM arrivals are
+placed through SequentialPlacementSimulation, and the greedy engine places
+them through EventDrivenSimulation. Reports VMs per second, solve latency
+percentiles and the final peak utilization.
+
+Usage:
+    python -m benchmarks.bench_scaling [--clusters 10 100 1000 10000]
+        [--vms 200] [--optimizer MinUtilizationOptimizer]
+"""
+
+import argparse
+import copy
+import time
+
+from src.services.event_simulation import EventDrivenSimulation
+from src.services.placement_service import OPTIMIZERS
+from src.services.scenario_generator import SCALING_SIZES, generate_scenario
+from src.services.sequential_placement import SequentialPlacementSimulation
+
+DEFAULT_OPTIMIZERS = [
+    "MinUtilizationOptimizer",
+    "MaxMinResidualOptimizer",
+    "BestFitOptimizer",
+]
+
+
+def report(name, vms, throughput, latency, peak):
+    print(
+        f"  {name:<30} {vms:>6} {throughput:10.0f} "
+        f"{latency['p50'] * 1000:9.3f} {latency['p99'] * 1000:9.3f} {peak:6.1%}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Placement cost by cluster count")
+    parser.add_argument("--clusters", type=int, nargs="+", default=SCALING_SIZES)
+    parser.add_argument("--vms", type=int, default=200)
+    parser.add_argument("--optimizer", action="append", choices=OPTIMIZERS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for n in args.clusters:
+        start = time.perf_counter()
+        base = generate_scenario(n, num_vms=args.vms, seed=args.seed)
+        generation = time.perf_counter() - start
+        print(f"\n{n} clusters (generated in {generation * 1000:.1f} ms)")
+        print(
+            f"  {'optimizer':<30} {'placed':>6} {'vms/s':>10} "
+            f"{'p50 ms':>9} {'p99 ms':>9} {'peak':>6}"
+        )
+        for name in args.optimizer or DEFAULT_OPTIMIZERS:
+            config = copy.copy(base)
+            config.optimizer_model = OPTIMIZERS[name]
+            summary = SequentialPlacementSimulation(
+                config, None, keep_history=False
+            ).run_simulation()
+            peak = summary["final_metrics"]["overall_metrics"]["max_utilization"]
+            report(
+                name,
+                summary["vms_placed"],
+                summary["throughput"],
+                summary["latency"],
+                peak,
+            )
+
+            engine = EventDrivenSimulation(config).run_simulation()
+            report(
+                f"  engine ({name[:-9]})",
+                engine["vms_placed"],
+                engine["arrivals"] / engine["total_time"],
+                engine["latency"],
+                engine["max_peak_utilization"],
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Solve time and objective of the docplex and NumPy solver backends on the
+generate_test_scenarios set.
+
+Every scenario solved by a MIP optimizer is simulated once; at each
+placement step the same model inputs are solved with both backends, so
+objectives are compared on identical states. Single VMs go through the
+model too (MinUtilizationOptimizer's closed-form path is disabled). Reports
+the mean and p50 solve time per backend, the largest objective difference
+and the share of steps whose objectives agree within 0.1%.
+
+Usage:
+    python -m benchmarks.bench_solvers [--scenario NAME ...]
+"""
+
+import argparse
+import copy
+import time
+
+import numpy as np
+
+from src.models.min_max_optimizer import MinUtilizationOptimizer
+from src.models.min_max_per_cluster_optimizer import MinMaxPerClusterOptimizer
+from src.models.solvers import SOLVERS
+from src.services.sequential_placement import SequentialPlacementSimulation
+from src.services.test_config import generate_test_scenarios
+
+
+class ColdMinUtilizationOptimizer(MinUtilizationOptimizer):
+    """MinUtilizationOptimizer forced through the solver for single VMs"""
+
+    analytical_single_vm = False
+
+
+MIP_OPTIMIZERS = {
+    MinUtilizationOptimizer: ColdMinUtilizationOptimizer,
+    MinMaxPerClusterOptimizer: MinMaxPerClusterOptimizer,
+}
+
+
+def paired(optimizer_class, steps):
+    """
+    Subclass of optimizer_class that solves every step with each backend and
+    appends {solver: (seconds, objective)} to steps. The simulation continues
+    with the first backend's result.
+    """
+
+    class Paired(optimizer_class):
+        def optimize(self):
+            results = {}
+            step = {}
+            for solver in SOLVERS:
+                optimizer = optimizer_class(
+                    self.clusters,
+                    self.existing_placements,
+                    self.new_vms,
+                    self.current_usage,
+                    self.cluster_capacity,
+                    self.vm_demand,
+                    seed=self.rng,
+                    solver=solver,
+                )
+                start = time.perf_counter()
+                results[solver] = optimizer.optimize()
+                step[solver] = (time.perf_counter() - start, results[solver][2])
+            steps.append(step)
+            return results[SOLVERS[0]]
+
+    return Paired
+
+
+def run(scenario):
+    """Per-step {solver: (seconds, objective)} of one scenario"""
+    steps = []
+    config = copy.copy(scenario)
+    config.optimizer_model = paired(MIP_OPTIMIZERS[scenario.optimizer_model], steps)
+    simulation = SequentialPlacementSimulation(config, None, keep_history=False)
+    simulation.run_simulation()
+    return steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solver backend comparison")
+    parser.add_argument("--scenario", action="append", help="Only this scenario")
+    args = parser.parse_args()
+
+    scenarios = [
+        s
+        for s in generate_test_scenarios()
+        if s.optimizer_model in MIP_OPTIMIZERS
+        and (not args.scenario or s.name in args.scenario)
+    ]
+
+    reference, other = SOLVERS
+    print(
+        f"{'scenario':<40} {'steps':>5} "
+        + " ".join(f"{f'{solver} ms':>12} {'p50':>7}" for solver in SOLVERS)
+        + f" {'max |dz|':>9} {'same':>5}"
+    )
+    for i, scenario in enumerate(scenarios):
+        scenario.seed = i
+        steps = run(scenario)
+
+        timings = ""
+        for solver in SOLVERS:
+            times = np.array([step[solver][0] for step in steps]) * 1000
+            timings += f" {times.mean():12.2f} {np.median(times):7.2f}"
+
+        differences = []
+        for step in steps:
+            a, b = step[reference][1], step[other][1]
+            if a is None or b is None:
+                differences.append(0.0 if a is b else np.inf)
+            else:
+                differences.append(abs(a - b))
+        differences = np.array(differences)
+        scale = np.array([abs(step[reference][1] or 1.0) for step in steps])
+        same = np.mean(differences <= 1e-3 * scale)
+
+        print(
+            f"{scenario.name:<40} {len(steps):>5}{timings} "
+            f"{differences.max():9.2e} {same:5.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
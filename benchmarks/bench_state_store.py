@@ -0,0 +1,120 @@
+"""
+Parallel placement through the versioned ClusterStateStore.
+
+--batches batches of --batch-size VMs are placed on --clusters clusters by
+--workers placers, as threads sharing the store (ClusterStateStore.place)
+and as worker processes computing proposals from pickled snapshots, with
+the parent committing them and resubmitting conflicts. Reports VMs per
+second, plain commits, commits merged after a capacity re-check, conflicts
+and the final peak utilization. Clusters are sized so that the last
+batches run them close to full, where conflicts start to be rejected.
+
+Usage:
+    python -m benchmarks.bench_state_store [--workers 1 4 8] [--batches 200]
+        [--batch-size 8] [--clusters 8] [--solver docplex]
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from src.models.cluster_state import ClusterState
+from src.models.min_max_optimizer import MinUtilizationOptimizer
+from src.models.solvers import SOLVERS
+from src.models.state_store import ClusterStateStore, propose
+
+RESOURCES = ["cpu", "mem", "disk"]
+
+
+def make_workload(num_batches, batch_size, num_clusters):
+    rng = np.random.default_rng(0)
+    batches = []
+    for b in range(num_batches):
+        names = [f"vm{b}_{k}" for k in range(batch_size)]
+        batches.append(
+            {n: dict(zip(RESOURCES, rng.uniform(5.0, 20.0, 3).tolist())) for n in names}
+        )
+    total = 12.5 * num_batches * batch_size
+    state = ClusterState(
+        [f"c{i + 1}" for i in range(num_clusters)],
+        np.full((num_clusters, 3), 1.1 * total / num_clusters),
+        np.zeros((num_clusters, 3)),
+    )
+    return state, batches
+
+
+def run_threads(state, batches, workers, solver):
+    store = ClusterStateStore(state)
+
+    def place(vm_demand):
+        return store.place(
+            MinUtilizationOptimizer, list(vm_demand), vm_demand, solver=solver
+        )
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        plans = list(pool.map(place, batches))
+    return store, sum(len(p) for p in plans if p is not None)
+
+
+def run_processes(state, batches, workers, solver, max_retries=10):
+    store = ClusterStateStore(state)
+    placed = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+
+        def submit(vm_demand):
+            return pool.submit(
+                propose,
+                MinUtilizationOptimizer,
+                store.snapshot(),
+                list(vm_demand),
+                vm_demand,
+                solver=solver,
+            )
+
+        pending = {submit(vm_demand): (vm_demand, 0) for vm_demand in batches}
+        while pending:
+            future = next(iter(pending))
+            vm_demand, attempt = pending.pop(future)
+            proposal = future.result()
+            if proposal is None:
+                continue
+            if store.commit(proposal) is not None:
+                placed += len(proposal.placement_plan)
+            elif attempt < max_retries:
+                store.retries += 1
+                pending[submit(vm_demand)] = (vm_demand, attempt + 1)
+    return store, placed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel placement via the store")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--batches", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--clusters", type=int, default=8)
+    parser.add_argument("--solver", choices=SOLVERS, default="docplex")
+    args = parser.parse_args()
+
+    state, batches = make_workload(args.batches, args.batch_size, args.clusters)
+    print(
+        f"{'mode':<10} {'workers':>7} {'vms/s':>8} {'placed':>7} {'commits':>7} "
+        f"{'merged':>7} {'conflicts':>9} {'retries':>7} {'peak':>6}"
+    )
+    for mode, run in [("threads", run_threads), ("processes", run_processes)]:
+        for workers in args.workers:
+            start = time.perf_counter()
+            store, placed = run(state, batches, workers, args.solver)
+            elapsed = time.perf_counter() - start
+            stats = store.stats()
+            print(
+                f"{mode:<10} {workers:>7} {placed / elapsed:8.0f} {placed:>7} "
+                f"{stats['commits']:>7} {stats['merged']:>7} "
+                f"{stats['conflicts']:>9} {stats['retries']:>7} "
+                f"{stats['peak_utilization']:6.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""
+Benchmark suite of every optimizer with a regression check.
+
+Every concrete BaseVMOptimizer subclass in src.models places a batch of
+VMs on each cell of a grid of (clusters, batch size, resources). The
+instances have skewed initial utilization, lognormal correlated demands
+(see scenario_generator) and about twice the batch's demand free. Per run
+the suite records:
+
+- build: seconds constructing the optimizer and in its log, build and
+  warm_start phases (see BaseVMOptimizer.phase)
+- solve: the remaining seconds of optimize(): the solve and extract phases
+  and anything outside the phases
+- memory: peak Python memory of optimize() (tracemalloc, in a separate run;
+  memory allocated inside CPLEX is not seen)
+- peak: peak utilization after placement, the quality every optimizer
+  shares (None when the batch was not placed)
+
+Times are the minimum over --repeat runs. A run raising an exception, such
+as a model over the CPLEX Community Edition limits, is recorded with its
+error.
+
+--save writes the results with the machine and settings to a JSON baseline
+file. --check compares them to a baseline and exits with status 1 when a
+run regressed: build, solve or memory above (1 + --threshold) times the
+baseline and by more than a noise floor, peak utilization above the
+baseline by more than --quality-tolerance, or a failure or error where the
+baseline placed the batch. Baselines only compare on the same machine.
+
+Usage:
+    python -m benchmarks.bench_suite [--grid quick|full] [--optimizer NAME]
+        [--save benchmarks/baseline.json] [--check benchmarks/baseline.json]
+        [--threshold 1.0] [--quality-tolerance 0.005]
+"""
+
+import argparse
+import copy
+import importlib
+import inspect
+import itertools
+import json
+import pkgutil
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import src.models
+from src.models.base_optimizer import BaseVMOptimizer
+from src.models.host_aware_optimizer import HostAwareOptimizer
+from src.models.solvers import SOLVERS, default_solver
+from src.services.scenario_generator import CorrelatedDemand, skewed_utilization
+
+RESOURCE_NAMES = ["cpu", "mem", "disk", "net", "gpu", "iops", "ssd", "fpga"]
+
+GRIDS = {
+    # Every MIP of this grid fits the CPLEX Community Edition limits (1000
+    # variables and constraints), so every cell is timed with either solver
+    "quick": {"clusters": [10, 30, 50], "vms": [1, 10], "resources": [3, 5]},
+    "full": {
+        "clusters": [10, 100, 1000],
+        "vms": [1, 10, 100, 1000],
+        "resources": [3, 5, 8],
+    },
+}
+
+# Optimizer phases (see BaseVMOptimizer.phase) counted as model building
+BUILD_PHASES = ["log", "build", "warm_start"]
+
+# Differences below these are noise, never regressions
+TIME_FLOOR = 5e-3
+MEMORY_FLOOR = 256 * 1024
+
+HOSTS_PER_CLUSTER = 2
+
+
+def optimizer_classes():
+    """{name: class} of every concrete BaseVMOptimizer subclass in src.models"""
+    for module in pkgutil.iter_modules(src.models.__path__):
+        try:
+            importlib.import_module(f"src.models.{module.name}")
+        except ImportError:
+            # Optimizers of missing optional dependencies are left out
+            continue
+    found = {}
+    stack = [BaseVMOptimizer]
+    while stack:
+        for cls in stack.pop().__subclasses__():
+            stack.append(cls)
+            if (
+                cls.__module__.startswith("src.models.")
+                and not inspect.isabstract(cls)
+                # Bases of score-driven heuristics without a score
+                and getattr(cls, "score", True) is not None
+            ):
+                found[cls.__name__] = cls
+    return dict(sorted(found.items()))
+
+
+def make_instance(num_clusters, num_vms, num_resources, seed=0):
+    """Keyword arguments of a BaseVMOptimizer for one grid cell"""
+    rng = np.random.default_rng(seed)
+    resources = RESOURCE_NAMES[:num_resources]
+    clusters = [f"c{i + 1}" for i in range(num_clusters)]
+    new_vms = [f"vm{k + 1}" for k in range(num_vms)]
+
+    demand = CorrelatedDemand(dict.fromkeys(resources, 10.0), 0.4, 0.5, resources)
+    demands = demand.sample(rng, num_vms)
+    usage = skewed_utilization(rng, num_clusters, 0.3, 0.5)[:, None] * rng.lognormal(
+        0.0, 0.1, (num_clusters, num_resources)
+    )
+    usage = np.clip(usage, 0.0, 0.9)
+    # Free space of about twice the batch's demand, and room for at least two
+    # VMs per cluster, unevenly spread
+    mean = np.array(list(demand.mean().values()))
+    free = 2.0 * mean * max(num_vms / num_clusters, 2.0)
+    share = rng.lognormal(0.0, 0.3, (num_clusters, num_resources))
+    capacity = free * share / (1.0 - usage)
+
+    return dict(
+        clusters=clusters,
+        existing_placements={},
+        new_vms=new_vms,
+        current_usage={
+            c: dict(zip(resources, row)) for c, row in zip(clusters, usage.tolist())
+        },
+        cluster_capacity={
+            c: dict(zip(resources, row)) for c, row in zip(clusters, capacity.tolist())
+        },
+        vm_demand={
+            vm: dict(zip(resources, row)) for vm, row in zip(new_vms, demands.tolist())
+        },
+    )
+
+
+def host_instance(instance):
+    """
+    HostAwareOptimizer arguments for an instance: every cluster split in
+    HOSTS_PER_CLUSTER equal hosts, each running one VM holding its share of
+    the cluster's used units
+    """
+    instance = dict(instance)
+    usage = instance.pop("current_usage")
+    vm_demand = dict(instance["vm_demand"])
+    hosts, host_capacity, host_cluster, existing = [], {}, {}, {}
+    for c, capacity in instance["cluster_capacity"].items():
+        for k in range(HOSTS_PER_CLUSTER):
+            h = f"{c}h{k + 1}"
+            hosts.append(h)
+            host_cluster[h] = c
+            host_capacity[h] = {r: v / HOSTS_PER_CLUSTER for r, v in capacity.items()}
+            vm_demand[f"old_{h}"] = {
+                r: usage[c][r] * v for r, v in host_capacity[h].items()
+            }
+            existing[f"old_{h}"] = h
+    instance.update(
+        existing_placements=existing,
+        current_usage=None,
+        vm_demand=vm_demand,
+        hosts=hosts,
+        host_capacity=host_capacity,
+        host_cluster=host_cluster,
+    )
+    return instance
+
+
+def make_optimizer(optimizer_class, instance, solver, time_limit):
+    if issubclass(optimizer_class, HostAwareOptimizer):
+        instance = host_instance(instance)
+    else:
+        instance = copy.deepcopy(instance)
+    return optimizer_class(**instance, seed=0, solver=solver, time_limit=time_limit)
+
+
+def run_once(optimizer_class, instance, solver, time_limit):
+    """(build seconds, solve seconds, peak utilization or None) of one run"""
+    start = time.perf_counter_ns()
+    optimizer = make_optimizer(optimizer_class, instance, solver, time_limit)
+    constructed = time.perf_counter_ns() - start
+
+    start = time.perf_counter_ns()
+    placement_plan, cluster_utilization, _, _ = optimizer.optimize()
+    total = time.perf_counter_ns() - start
+    build = sum(optimizer.phase_times.get(phase, 0) for phase in BUILD_PHASES)
+
+    peak = None
+    if placement_plan is not None:
+        peak = max(max(u.values()) for u in cluster_utilization.values())
+    return (constructed + build) * 1e-9, (total - build) * 1e-9, peak
+
+
+def peak_memory(optimizer_class, instance, solver, time_limit):
+    """Peak bytes of Python memory allocated building and running an optimizer"""
+    tracemalloc.start()
+    try:
+        make_optimizer(optimizer_class, instance, solver, time_limit).optimize()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(optimizer_class, instance, solver, time_limit, repeat):
+    """Result record of one optimizer on one grid cell"""
+    try:
+        runs = [
+            run_once(optimizer_class, instance, solver, time_limit)
+            for _ in range(repeat)
+        ]
+        memory = peak_memory(optimizer_class, instance, solver, time_limit)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}".splitlines()[0]}
+    return {
+        "build": min(r[0] for r in runs),
+        "solve": min(r[1] for r in runs),
+        "memory": memory,
+        "peak": runs[0][2],
+    }
+
+
+def cell_key(name, num_clusters, num_vms, num_resources):
+    return f"{name}/c{num_clusters}-v{num_vms}-r{num_resources}"
+
+
+def run_suite(optimizers, grid, solver, time_limit, repeat, seed=0):
+    """{cell key: result record} of every optimizer on every grid cell"""
+    results = {}
+    for num_clusters, num_vms, num_resources in itertools.product(
+        grid["clusters"], grid["vms"], grid["resources"]
+    ):
+        instance = make_instance(num_clusters, num_vms, num_resources, seed)
+        for name, optimizer_class in optimizers.items():
+            key = cell_key(name, num_clusters, num_vms, num_resources)
+            results[key] = measure(
+                optimizer_class, instance, solver, time_limit, repeat
+            )
+            print(format_result(key, results[key]), flush=True)
+    return results
+
+
+def format_result(key, result):
+    if "error" in result:
+        return f"{key:<52} {result['error'][:60]}"
+    peak = "failed" if result["peak"] is None else f"{result['peak']:6.1%}"
+    return (
+        f"{key:<52} {result['build'] * 1000:10.3f} {result['solve'] * 1000:10.3f} "
+        f"{result['memory'] / 2**20:9.2f} {peak:>7}"
+    )
+
+
+def regressions(baseline, results, threshold, quality_tolerance):
+    """
+    (key, metric, baseline value, new value) of every run of results that
+    regressed against the baseline results; cells missing from either are
+    not compared
+    """
+    found = []
+    for key, new in results.items():
+        old = baseline.get(key)
+        if old is None or "error" in old:
+            continue
+        if "error" in new:
+            found.append((key, "error", None, new["error"]))
+            continue
+        if new["peak"] is None:
+            if old["peak"] is not None:
+                found.append((key, "peak", old["peak"], None))
+            continue
+        for metric, floor in [
+            ("build", TIME_FLOOR),
+            ("solve", TIME_FLOOR),
+            ("memory", MEMORY_FLOOR),
+        ]:
+            if (
+                new[metric] > (1.0 + threshold) * old[metric]
+                and new[metric] - old[metric] > floor
+            ):
+                found.append((key, metric, old[metric], new[metric]))
+        if old["peak"] is not None and new["peak"] > old["peak"] + quality_tolerance:
+            found.append((key, "peak", old["peak"], new["peak"]))
+    return found
+
+
+def machine():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "numpy": np.__version__,
+    }
+
+
+def main():
+    optimizers = optimizer_classes()
+    parser = argparse.ArgumentParser(description="Optimizer benchmark suite")
+    parser.add_argument("--grid", choices=GRIDS, default="quick")
+    parser.add_argument("--optimizer", action="append", choices=optimizers)
+    parser.add_argument("--solver", choices=SOLVERS, default=default_solver())
+    parser.add_argument("--time-limit", type=float, default=2.0, help="Per solve (s)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="Write the results to this baseline file")
+    parser.add_argument("--check", help="Compare the results to this baseline file")
+    parser.add_argument(
+        "--threshold", type=float, default=1.0, help="Relative time/memory slack"
+    )
+    parser.add_argument(
+        "--quality-tolerance",
+        type=float,
+        default=0.005,
+        help="Peak utilization slack (absolute)",
+    )
+    args = parser.parse_args()
+
+    if args.optimizer:
+        optimizers = {name: optimizers[name] for name in args.optimizer}
+    grid = GRIDS[args.grid]
+    print(
+        f"{'optimizer/cell':<52} {'build ms':>10} {'solve ms':>10} "
+        f"{'mem MiB':>9} {'peak':>7}"
+    )
+    results = run_suite(
+        optimizers, grid, args.solver, args.time_limit, args.repeat, args.seed
+    )
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {
+                    "machine": machine(),
+                    "solver": args.solver,
+                    "time_limit": args.time_limit,
+                    "repeat": args.repeat,
+                    "seed": args.seed,
+                    "grid": grid,
+                    "results": results,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+            f.write("\n")
+        print(f"\nBaseline written to {args.save}")
+
+    if args.check:
+        with open(args.check) as f:
+            baseline = json.load(f)
+        if baseline["machine"] != machine():
+            print("\nWarning: the baseline was recorded on another machine")
+        found = regressions(
+            baseline["results"], results, args.threshold, args.quality_tolerance
+        )
+        if found:
+            print(f"\n{len(found)} regressions against {args.check}:")
+            for key, metric, old, new in found:
+                print(f"  {key:<52} {metric:<7} {old} -> {new}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.check}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Placement latency under per-solve time budgets.
+
+Runs the unbalanced_initial_batched scenario with large batches, where
+proving the min-max placement optimal can take seconds, once per time limit.
+Reports the latency distribution, how many solves stopped at the limit, the
+worst gap of the placements returned and the final imbalance.
+
+Usage:
+    python -m benchmarks.bench_time_limit [--batch-size 40] [--solver docplex]
+        [--limits none 0.1 0.02]
+    python -m benchmarks.bench_time_limit --solver numpy --batch-size 10 \
+        --limits none 1 0.1
+"""
+
+import argparse
+import copy
+
+import numpy as np
+
+from src.services.sequential_placement import SequentialPlacementSimulation
+from src.services.test_config import generate_test_scenarios
+
+
+def parse_limit(value):
+    return None if value == "none" else float(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve time budgets")
+    parser.add_argument("--batch-size", type=int, default=40)
+    parser.add_argument("--solver", default="docplex")
+    parser.add_argument(
+        "--limits", nargs="+", type=parse_limit, default=[None, 0.1, 0.02]
+    )
+    args = parser.parse_args()
+
+    (scenario,) = [
+        s for s in generate_test_scenarios() if s.name == "unbalanced_initial_batched"
+    ]
+
+    print(
+        f"{'time limit':>10} {'p50 s':>8} {'p99 s':>8} {'max s':>8} "
+        f"{'hits':>5} {'max gap':>8} {'imbalance':>10}"
+    )
+    for limit in args.limits:
+        config = copy.copy(scenario)
+        config.batch_size = args.batch_size
+        config.solver = args.solver
+        config.time_limit = limit
+        config.seed = 0
+        simulation = SequentialPlacementSimulation(config, None, keep_history=False)
+        summary = simulation.run_simulation()
+
+        latency = summary["latency"]
+        gaps = simulation.metrics_tracker.history["mip_gap"]
+        print(
+            f"{'none' if limit is None else limit:>10} {latency['p50']:8.3f} "
+            f"{latency['p99']:8.3f} {latency['max']:8.3f} "
+            f"{summary['limit_hits']:>5} {np.nanmax(gaps):8.2%} "
+            f"{summary['final_metrics']['overall_imbalance']:10.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Trace replay throughput and placement latency per optimizer.
+
+Writes a production-shaped trace of --vms VMs to a temporary .csv.gz
+file, or replays --trace: arrivals follow a daily cycle (peak at 3x the
+trough), demands are lognormal with memory and disk correlated with CPU,
+and lifetimes are lognormal (median --lifetime seconds). The trace is
+streamed through SequentialPlacementSimulation for every optimizer at full
+speed on --clusters clusters sized to run 70% full on average, reporting placed
+and rejected VMs, VMs per second, solve latency percentiles and the final
+peak utilization. Also reports the raw trace read rate.
+
+Usage:
+    python -m benchmarks.bench_trace_replay [--vms 20000] [--clusters 20]
+        [--trace trace.csv.gz] [--optimizer MinUtilizationOptimizer]
+"""
+
+import argparse
+import math
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from src.services.placement_service import OPTIMIZERS
+from src.services.sequential_placement import RESOURCES
+from src.services.test_config import TestConfig
+from src.services.trace_replay import read_trace, replay, write_trace
+
+DEFAULT_OPTIMIZERS = [
+    "MinUtilizationOptimizer",
+    "MaxMinResidualOptimizer",
+    "DotProductOptimizer",
+    "BestFitOptimizer",
+    "FirstFitDecreasingOptimizer",
+]
+DAY = 86400.0
+
+
+def production_trace(num_vms, mean_rate, median_lifetime, seed=0):
+    """Yield trace rows with a daily arrival cycle and correlated demands"""
+    rng = np.random.default_rng(seed)
+    arrival = 0.0
+    for k in range(num_vms):
+        # Each gap is drawn at the rate of the previous arrival's time of day
+        rate = mean_rate * (1.0 + 0.5 * math.sin(2 * math.pi * arrival / DAY))
+        arrival += rng.exponential(1.0 / rate)
+        cpu = rng.lognormal(1.0, 0.6)
+        mem = cpu * rng.lognormal(0.7, 0.3)
+        disk = rng.lognormal(2.0, 0.8)
+        lifetime = rng.lognormal(math.log(median_lifetime), 1.2)
+        yield (
+            f"vm{k}",
+            arrival,
+            {"cpu": cpu, "mem": mem, "disk": disk},
+            arrival + lifetime,
+        )
+
+
+def make_config(num_clusters, mean_rate, median_lifetime):
+    # Offered load: arrival rate x mean lifetime VMs of mean demand each
+    mean_live = mean_rate * median_lifetime * math.exp(1.2**2 / 2)
+    mean_demand = {
+        "cpu": math.exp(1.0 + 0.18),
+        "mem": math.exp(1.0 + 0.18) * math.exp(0.7 + 0.045),
+        "disk": math.exp(2.0 + 0.32),
+    }
+    capacity = {r: mean_live * mean_demand[r] / num_clusters / 0.7 for r in RESOURCES}
+    clusters = [f"c{i + 1}" for i in range(num_clusters)]
+    return TestConfig(
+        name="trace",
+        num_vms=0,
+        clusters=clusters,
+        cluster_capacity={c: dict(capacity) for c in clusters},
+        seed=0,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trace replay per optimizer")
+    parser.add_argument("--vms", type=int, default=20000)
+    parser.add_argument("--clusters", type=int, default=20)
+    parser.add_argument("--rate", type=float, default=1.0, help="Mean arrivals/s")
+    parser.add_argument("--lifetime", type=float, default=600.0, help="Median (s)")
+    parser.add_argument("--trace", help="Replay this trace instead")
+    parser.add_argument("--optimizer", action="append", choices=OPTIMIZERS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.trace
+        if path is None:
+            path = os.path.join(tmp, "trace.csv.gz")
+            write_trace(path, production_trace(args.vms, args.rate, args.lifetime))
+
+        start = time.perf_counter()
+        rows = sum(1 for _ in read_trace(path))
+        read_time = time.perf_counter() - start
+        print(f"{rows} trace rows read at {rows / read_time:.0f} rows/s\n")
+
+        print(
+            f"{'optimizer':<28} {'placed':>8} {'rejected':>8} {'vms/s':>8} "
+            f"{'p50 ms':>8} {'p99 ms':>8} {'peak':>6}"
+        )
+        for name in args.optimizer or DEFAULT_OPTIMIZERS:
+            config = make_config(args.clusters, args.rate, args.lifetime)
+            config.optimizer_model = OPTIMIZERS[name]
+            summary = replay(config, path)
+            latency = summary["latency"]
+            peak = summary["final_metrics"]["overall_metrics"]["max_utilization"]
+            print(
+                f"{name:<28} {summary['vms_placed']:>8} "
+                f"{summary['rejected_vms']:>8} {summary['throughput']:8.0f} "
+                f"{latency['p50'] * 1000:8.3f} {latency['p99'] * 1000:8.3f} "
+                f"{peak:6.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Solve time saved by greedy MIP starts in the MIP optimizers.
+
+For each --sizes batch of new VMs placed at once on --clusters clusters
+(capacities drawn so that the batch takes roughly half of the free space),
+MinUtilizationOptimizer and MinMaxPerClusterOptimizer solve the same inputs
+cold (warm_start = False) and warm. Reports the greedy heuristic's time and
+peak utilization, then the median wall time of --repeat full solves (capped
+at --time-limit) cold and warm, the time saved and the optimum's peak
+utilization, and finally the peak utilization each returns within a
+--budget time limit ("-" when no placement is found in time). The warm
+wall times include the heuristic. Batches whose model exceeds the CPLEX
+Community Edition limits (1000 variables or constraints) on docplex only
+report the greedy placement.
+
+Usage:
+    python -m benchmarks.bench_warm_start [--sizes 10 100 300 1000]
+        [--clusters 3] [--solver docplex] [--time-limit 30] [--budget 0.01]
+        [--repeat 3]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.models.min_max_optimizer import MinUtilizationOptimizer
+from src.models.min_max_per_cluster_optimizer import MinMaxPerClusterOptimizer
+from src.models.solvers import SOLVERS
+
+RESOURCES = ["cpu", "mem", "disk"]
+COMMUNITY_EDITION_LIMIT = 1000
+
+
+class BatchMinUtilizationOptimizer(MinUtilizationOptimizer):
+    """MinUtilizationOptimizer forced through the solver for single VMs"""
+
+    analytical_single_vm = False
+
+
+class ColdMinUtilizationOptimizer(BatchMinUtilizationOptimizer):
+    warm_start = False
+
+
+class ColdMinMaxPerClusterOptimizer(MinMaxPerClusterOptimizer):
+    warm_start = False
+
+
+# Warm-started optimizer and its cold twin
+OPTIMIZERS = {
+    BatchMinUtilizationOptimizer: ColdMinUtilizationOptimizer,
+    MinMaxPerClusterOptimizer: ColdMinMaxPerClusterOptimizer,
+}
+
+
+def make_batch(num_vms, num_clusters, seed=0):
+    rng = np.random.default_rng(seed)
+    clusters = [f"c{i + 1}" for i in range(num_clusters)]
+    new_vms = [f"vm{k + 1}" for k in range(num_vms)]
+    vm_demand = {
+        vm: dict(zip(RESOURCES, rng.uniform(5.0, 20.0, 3).tolist())) for vm in new_vms
+    }
+    usage = rng.uniform(0.1, 0.4, (num_clusters, 3))
+    # Free space of about twice the batch's demand, unevenly spread
+    share = rng.uniform(0.5, 1.5, (num_clusters, 3))
+    capacity = 2.0 * 12.5 * num_vms * share / num_clusters / (1.0 - usage)
+    return dict(
+        clusters=clusters,
+        existing_placements={},
+        new_vms=new_vms,
+        current_usage={
+            c: dict(zip(RESOURCES, row)) for c, row in zip(clusters, usage.tolist())
+        },
+        cluster_capacity={
+            c: dict(zip(RESOURCES, row)) for c, row in zip(clusters, capacity.tolist())
+        },
+        vm_demand=vm_demand,
+    )
+
+
+def model_size(optimizer_class, num_vms, num_clusters):
+    """(variables, constraints) of the optimizer's model"""
+    x = num_vms * num_clusters
+    bounds = num_clusters * len(RESOURCES)
+    if issubclass(optimizer_class, MinMaxPerClusterOptimizer):
+        return x + bounds, num_vms + 2 * bounds
+    return x + 1, num_vms + 2 * bounds
+
+
+def greedy(optimizer):
+    """Heuristic milliseconds and peak utilization of the last warm start"""
+    return (
+        f"{optimizer.warm_start_time * 1000:9.2f} "
+        f"{peak(optimizer.warm_start_utilization)}"
+    )
+
+
+def solve(optimizer_class, batch, solver, time_limit, repeat):
+    """(median seconds, peak utilization, optimizer) of repeated optimize() calls"""
+    times = []
+    for _ in range(repeat):
+        optimizer = optimizer_class(
+            **batch, seed=0, solver=solver, time_limit=time_limit
+        )
+        start = time.perf_counter()
+        result = optimizer.optimize()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)), result[2], optimizer
+
+
+def peak(z):
+    return f"{z:8.4f}" if z is not None else f"{'-':>8}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Greedy MIP start savings")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 300, 1000])
+    parser.add_argument("--clusters", type=int, default=3)
+    parser.add_argument("--solver", choices=SOLVERS, default="docplex")
+    parser.add_argument("--time-limit", type=float, default=30.0)
+    parser.add_argument("--budget", type=float, default=0.01)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Load the solver libraries outside of the measurements
+    solve(ColdMinUtilizationOptimizer, make_batch(2, 2), args.solver, None, 1)
+
+    print(
+        f"{'vms':>5} {'optimizer':<28} {'greedy ms':>9} {'greedy z':>8} "
+        f"{'cold s':>8} {'warm s':>8} {'saved':>6} {'z':>8} "
+        f"{'budget cold z':>13} {'warm z':>8}"
+    )
+    for num_vms in args.sizes:
+        batch = make_batch(num_vms, args.clusters)
+        for optimizer_class, cold_class in OPTIMIZERS.items():
+            name = optimizer_class.__name__
+            size = model_size(optimizer_class, num_vms, args.clusters)
+            if args.solver == "docplex" and max(size) > COMMUNITY_EDITION_LIMIT:
+                # Only the heuristic: the model cannot be solved
+                optimizer = optimizer_class(**batch, seed=0, solver=args.solver)
+                optimizer.create_model()
+                optimizer.add_warm_start()
+                print(
+                    f"{num_vms:>5} {name:<28} {greedy(optimizer)} "
+                    f"{'model exceeds the Community Edition limits':>42}"
+                )
+                continue
+
+            cold_s, _, _ = solve(
+                cold_class, batch, args.solver, args.time_limit, args.repeat
+            )
+            warm_s, z, optimizer = solve(
+                optimizer_class, batch, args.solver, args.time_limit, args.repeat
+            )
+            _, budget_cold_z, _ = solve(cold_class, batch, args.solver, args.budget, 1)
+            _, budget_warm_z, _ = solve(
+                optimizer_class, batch, args.solver, args.budget, 1
+            )
+            print(
+                f"{num_vms:>5} {name:<28} {greedy(optimizer)} "
+                f"{cold_s:8.3f} {warm_s:8.3f} {1 - warm_s / cold_s:6.0%} {peak(z)} "
+                f"{peak(budget_cold_z):>13} {peak(budget_warm_z)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,29 @@
+import logging
+import math
+import time
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+import numpy as np
+
+from src.models.cluster_state import DEFAULT_RESOURCES, ClusterState
+from src.models.greedy_engine import GreedyPlacementEngine, largest_first
+from src.models.solvers import add_mip_start, default_solver, new_model
+
+logger = logging.getLogger(__name__)
+
+# Phases of an optimize() call timed by BaseVMOptimizer.phase: logging the
+# inputs, building the model, the warm start heuristic, the solver (or the
+# heuristic search) and extracting the result from the solution
+PHASES = ["log", "build", "warm_start", "solve", "extract"]
 
 
 class BaseVMOptimizer(ABC):
+    # Seed each MIP solve with a greedy placement scored by warm_start_score,
+    # a greedy_engine score function (see add_warm_start)
+    warm_start = False
+    warm_start_score = None
+
     def __init__(
         self,
         clusters,
@@ -10,6 +32,10 @@ class BaseVMOptimizer(ABC):
         current_usage,
         cluster_capacity,
         vm_demand,
+        seed=None,
+        solver=None,
+        time_limit=None,
+        mip_gap=None,
     ):
         self.clusters = clusters
         self.existing_placements = existing_placements
@@ -17,44 +43,206 @@ class BaseVMOptimizer(ABC):
         self.current_usage = current_usage
         self.cluster_capacity = cluster_capacity
         self.vm_demand = vm_demand
-        self.resources = ["cpu", "mem", "disk"]
+        # Resources of the capacity dicts, cpu, mem and disk when not given
+        first = next(iter((cluster_capacity or {}).values()), None)
+        self.resources = list(first or DEFAULT_RESOURCES)
+        self._state = None
+        # Random source for randomized decisions such as tie-breaks; accepts a
+        # seed or an existing np.random.Generator
+        self.rng = np.random.default_rng(seed)
+        # MIP backend of create_model, "docplex" or "numpy" (see solvers.py)
+        self.solver = solver or default_solver()
+        # Budget of each solve: seconds and relative MIP gap (None = solver
+        # default). A solve cut short returns its best incumbent.
+        self.time_limit = time_limit
+        self.mip_gap = mip_gap
+        # Outcome of the last solve: relative gap of the returned placement
+        # (None without a MIP) and whether the time limit was hit
+        self.gap = None
+        self.hit_limit = False
+        # Last warm start: heuristic seconds and peak utilization of the
+        # greedy placement (None when the heuristic did not run or failed)
+        self.warm_start_time = None
+        self.warm_start_utilization = None
+        # Nanoseconds spent in each phase (see phase), and the stack of the
+        # phases running
+        self.phase_times = {}
+        self._phase_stack = []
 
-    def print_initial_state(self):
-        """Print initial state information"""
-        print("\nInitial State:")
-        for vm, cluster in self.existing_placements.items():
-            print(f"VM {vm} is already placed in cluster {cluster}")
+    @classmethod
+    def from_state(cls, state, existing_placements, new_vms, vm_demand, **kwargs):
+        """Create an optimizer from a ClusterState instead of nested dicts"""
+        optimizer = cls(
+            state.clusters,
+            existing_placements,
+            new_vms,
+            state.to_usage_dict(),
+            state.to_capacity_dict(),
+            vm_demand,
+            **kwargs,
+        )
+        optimizer._state = state.copy()
+        return optimizer
 
-        print("\nCurrent Cluster State:")
-        for c in self.clusters:
-            print(
-                f"Cluster {c}:",
-                {r: f"{v:.1%}" for r, v in self.current_usage[c].items()},
+    @property
+    def state(self):
+        """ClusterState view of current_usage and cluster_capacity"""
+        if self._state is None:
+            self._state = ClusterState.from_dicts(
+                self.clusters, self.current_usage, self.cluster_capacity, self.resources
+            )
+        return self._state
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time the block as phase name with perf_counter_ns. Phases add up over
+        the optimizer's lifetime (see reset_phases) and are exclusive: time
+        in a nested phase only counts for the nested one.
+        """
+        frame = [0]  # Nanoseconds of the nested phases
+        self._phase_stack.append(frame)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            self._phase_stack.pop()
+            if self._phase_stack:
+                self._phase_stack[-1][0] += elapsed
+            self.phase_times[name] = self.phase_times.get(name, 0) + elapsed - frame[0]
+
+    def reset_phases(self):
+        """Forget the phase times, e.g. before reusing the optimizer"""
+        self.phase_times = {}
+
+    def solve_model(self, mdl):
+        """Solve mdl as the solve phase and keep its details; the solution"""
+        with self.phase("solve"):
+            solution = mdl.solve()
+        self.record_solve_details(mdl)
+        return solution
+
+    def new_model(self, name):
+        """Empty MIP model on this optimizer's solver backend and budget"""
+        return new_model(name, self.solver, self.time_limit, self.mip_gap)
+
+    def record_solve_details(self, mdl):
+        """Keep the gap and limit status of the model's last solve"""
+        details = mdl.solve_details
+        if details is None:
+            return
+        self.hit_limit = details.has_hit_limit()
+        gap = details.mip_relative_gap
+        self.gap = None if gap is None or not math.isfinite(gap) else gap
+        if self.hit_limit:
+            logger.info(
+                "Solve stopped early: %s (time limit %ss, gap %s)",
+                details.status,
+                self.time_limit,
+                "none" if self.gap is None else f"{self.gap:.2%}",
             )
 
-        print("\nVM Resource Demands:")
-        for vm, demands in self.vm_demand.items():
-            print(f"{vm}:", {r: f"{v:.1f} units" for r, v in demands.items()})
+    def greedy_plan(self, score):
+        """
+        {vm: cluster} placing new_vms largest first (by dominant resource
+        share) on the feasible cluster with the lowest score, and the
+        resulting ClusterState; None if some VM fits nowhere
+        """
+        state = self.state.copy()
+        demands = state.demand_matrix(self.vm_demand, self.new_vms)
+        order = largest_first(state, demands)
+
+        engine = GreedyPlacementEngine(state, score=score, seed=self.rng)
+        assignments = engine.place_batch(demands[order])
+        if np.any(assignments < 0):
+            return None
+        plan = {
+            self.new_vms[k]: self.clusters[i]
+            for k, i in zip(order.tolist(), assignments.tolist())
+        }
+        return plan, state
+
+    def add_warm_start(self):
+        """
+        Hand the greedy_plan for warm_start_score to the model as a MIP start
+        on x[v, c]; the solver completes the remaining variables. Records the
+        heuristic time and the start's peak utilization. Returns the plan or
+        None.
+        """
+        start = time.perf_counter()
+        with self.phase("warm_start"):
+            greedy = self.greedy_plan(self.warm_start_score)
+        self.warm_start_time = time.perf_counter() - start
+        if greedy is None:
+            self.warm_start_utilization = None
+            return None
+
+        plan, state = greedy
+        self.warm_start_utilization = state.peak_utilization()
+        with self.phase("warm_start"):
+            add_mip_start(
+                self.mdl,
+                {
+                    self.x[v, c]: 1.0 if plan[v] == c else 0.0
+                    for v in self.new_vms
+                    for c in self.clusters
+                },
+            )
+        logger.debug(
+            "Warm start: greedy peak utilization %.2f%% in %.2f ms",
+            self.warm_start_utilization * 100,
+            self.warm_start_time * 1000,
+        )
+        return plan
+
+    def print_initial_state(self):
+        """Log initial state information (DEBUG)"""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        with self.phase("log"):
+            logger.debug("Initial State:")
+            for vm, cluster in self.existing_placements.items():
+                logger.debug("VM %s is already placed in cluster %s", vm, cluster)
+
+            logger.debug("Current Cluster State:")
+            for c in self.clusters:
+                logger.debug(
+                    "Cluster %s: %s",
+                    c,
+                    {r: f"{v:.1%}" for r, v in self.current_usage[c].items()},
+                )
+
+            logger.debug("VM Resource Demands:")
+            for vm, demands in self.vm_demand.items():
+                logger.debug(
+                    "%s: %s", vm, {r: f"{v:.1f} units" for r, v in demands.items()}
+                )
 
     def print_decision_variables(self):
-        """Print decision variables information"""
-        print("\nDecision Variables Generated:")
-        print("Binary variables x[v,c]:")
+        """Log decision variables information (DEBUG)"""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+
+        logger.debug("Decision Variables Generated:")
+        logger.debug("Binary variables x[v,c]:")
         for v in self.new_vms:
             for c in self.clusters:
-                print(f"x[{v},{c}] ∈ {{0,1}}")
-        print("\nContinuous variable z:")
-        print("z ∈ ℝ")
+                logger.debug("x[%s,%s] ∈ {0,1}", v, c)
+        logger.debug("Continuous variable z:")
+        logger.debug("z ∈ ℝ")
 
-    def print_constraints(self, constraint, description):
-        """Print constraint information"""
-        print(f"{description}: {constraint}")
+    def print_constraints(self, constraint, description, *args):
+        """Log constraint information (DEBUG); description is a %-format string"""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(description + ": %s", *args, constraint)
 
     def print_optimization_results(self, final_utilization):
-        """Print optimization results"""
-        print("\nOptimization Results:")
-        print(
-            f"z = {final_utilization:.2%} (max minimum utilization across all resources and clusters)"
+        """Log optimization results (INFO)"""
+        logger.info(
+            "Optimization Results: z = %.2f%% "
+            "(max minimum utilization across all resources and clusters)",
+            final_utilization * 100,
         )
 
     @abstractmethod
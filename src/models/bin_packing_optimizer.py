@@ -0,0 +1,101 @@
+import logging
+
+import numpy as np
+
+from src.models.base_optimizer import BaseVMOptimizer
+from src.models.greedy_engine import (
+    GreedyPlacementEngine,
+    dot_product,
+    first_fit,
+    l2_residual,
+    largest_first,
+    peak_after,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BinPackingOptimizer(BaseVMOptimizer):
+    """
+    Vector bin-packing heuristic over every resource in self.resources.
+
+    New VMs are placed largest first (by dominant resource share), each on
+    the feasible cluster with the lowest score, computed for all clusters in
+    one NumPy pass by the greedy engine. Subclasses set score to a
+    greedy_engine score function. No solver is involved, so a placement
+    decision takes microseconds. The caller's usage dicts are not modified.
+    """
+
+    score = None
+
+    def create_model(self):
+        """No optimization model needed for a heuristic"""
+        return None
+
+    def add_objective(self):
+        """No objective function needed for a heuristic"""
+        pass
+
+    def optimize(self):
+        """Main optimization workflow"""
+        self.print_initial_state()
+        with self.phase("extract"):
+            return self.solve()
+
+    def solve(self):
+        with self.phase("build"):
+            state = self.state.copy()
+            demands = state.demand_matrix(self.vm_demand, self.new_vms)
+        with self.phase("solve"):
+            order = largest_first(state, demands)
+            engine = GreedyPlacementEngine(state, score=self.score, seed=self.rng)
+            assignments = np.empty(len(self.new_vms), dtype=np.int64)
+            assignments[order] = engine.place_batch(demands[order])
+
+        if np.any(assignments < 0):
+            logger.info(
+                "Failed to place VM %s: No cluster has sufficient resources",
+                self.new_vms[int(np.argmin(assignments))],
+            )
+            return None, None, None, None
+
+        placement_plan = {
+            vm: self.clusters[i] for vm, i in zip(self.new_vms, assignments.tolist())
+        }
+        final_placement = {c: [] for c in self.clusters}
+        for vm, cluster in self.existing_placements.items():
+            final_placement[cluster].append(vm)
+        for vm, cluster in placement_plan.items():
+            final_placement[cluster].append(vm)
+
+        final_utilization = state.peak_utilization()
+        self.print_optimization_results(final_utilization)
+
+        return placement_plan, state.to_usage_dict(), final_utilization, final_placement
+
+
+class FirstFitDecreasingOptimizer(BinPackingOptimizer):
+    """First cluster, in the order of self.clusters, that fits each VM"""
+
+    score = staticmethod(first_fit)
+
+
+class BestFitOptimizer(BinPackingOptimizer):
+    """Cluster left with the smallest L2 norm of free capacity shares"""
+
+    score = staticmethod(l2_residual)
+
+
+class DotProductOptimizer(BinPackingOptimizer):
+    """Cluster whose free capacity shares align best with the VM's demand"""
+
+    score = staticmethod(dot_product)
+
+
+class MaxMinResidualOptimizer(BinPackingOptimizer):
+    """
+    Cluster left with the largest smallest free share; maximizing the
+    smallest residual is minimizing the peak utilization after placement
+    """
+
+    score = staticmethod(peak_after)
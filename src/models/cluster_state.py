@@ -0,0 +1,93 @@
+import numpy as np
+
+DEFAULT_RESOURCES = ["cpu", "mem", "disk"]
+
+
+class ClusterState:
+    """
+    Dense clusters x resources representation of cluster capacity and usage.
+
+    capacity holds resource units and usage holds utilization fractions, the
+    same quantities as the cluster_capacity and current_usage dicts used by the
+    optimizers. Rows follow the order of clusters and columns the order of
+    resources; cluster_index and resource_index map names to positions.
+    """
+
+    def __init__(self, clusters, capacity, usage, resources=None):
+        self.clusters = list(clusters)
+        self.resources = list(resources or DEFAULT_RESOURCES)
+        self.cluster_index = {c: i for i, c in enumerate(self.clusters)}
+        self.resource_index = {r: j for j, r in enumerate(self.resources)}
+
+        shape = (len(self.clusters), len(self.resources))
+        self.capacity = np.array(capacity, dtype=np.float64).reshape(shape)
+        self.usage = np.array(usage, dtype=np.float64).reshape(shape)
+
+    @classmethod
+    def from_dicts(cls, clusters, current_usage, cluster_capacity, resources=None):
+        """Build a state from the nested current_usage/cluster_capacity dicts"""
+        resources = list(resources or DEFAULT_RESOURCES)
+        capacity = [[cluster_capacity[c][r] for r in resources] for c in clusters]
+        usage = [[current_usage[c][r] for r in resources] for c in clusters]
+        return cls(clusters, capacity, usage, resources)
+
+    def to_usage_dict(self):
+        """Nested {cluster: {resource: utilization}} dict, as current_usage"""
+        return {
+            c: dict(zip(self.resources, row))
+            for c, row in zip(self.clusters, self.usage.tolist())
+        }
+
+    def to_capacity_dict(self):
+        """Nested {cluster: {resource: units}} dict, as cluster_capacity"""
+        return {
+            c: dict(zip(self.resources, row))
+            for c, row in zip(self.clusters, self.capacity.tolist())
+        }
+
+    def demand_vector(self, demand):
+        """Resource vector for a single {resource: units} demand dict"""
+        return np.array([demand[r] for r in self.resources], dtype=np.float64)
+
+    def demand_matrix(self, vm_demand, vms=None):
+        """VMs x resources matrix of demands, rows in the order of vms"""
+        vms = list(vm_demand) if vms is None else vms
+        return np.array(
+            [[vm_demand[v][r] for r in self.resources] for v in vms],
+            dtype=np.float64,
+        ).reshape(len(vms), len(self.resources))
+
+    def copy(self):
+        return ClusterState(self.clusters, self.capacity, self.usage, self.resources)
+
+    @property
+    def used(self):
+        """Used resource units per cluster and resource"""
+        return self.usage * self.capacity
+
+    @property
+    def available(self):
+        """Available resource units per cluster and resource"""
+        return self.capacity - self.used
+
+    def utilization_after(self, demand):
+        """Utilization of every cluster if demand were placed on it"""
+        return self.usage + demand / self.capacity
+
+    def feasible_mask(self, demand):
+        """Clusters able to host demand without exceeding 100% utilization"""
+        return np.all(self.utilization_after(demand) <= 1.0, axis=1)
+
+    def place(self, cluster, demand):
+        """Add demand to a cluster, given by name or row index"""
+        i = self.cluster_index.get(cluster, cluster)
+        self.usage[i] += demand / self.capacity[i]
+
+    def release(self, cluster, demand):
+        """Remove demand from a cluster, given by name or row index"""
+        i = self.cluster_index.get(cluster, cluster)
+        self.usage[i] -= demand / self.capacity[i]
+
+    def peak_utilization(self):
+        """Maximum utilization across all clusters and resources"""
+        return float(self.usage.max()) if self.usage.size else 0.0
@@ -0,0 +1,91 @@
+import numpy as np
+
+
+def cpu_utilization(state, demand=None):
+    """Score clusters by current CPU utilization (lower is better)"""
+    return state.usage[:, state.resource_index["cpu"]]
+
+
+def cpu_available(state, demand=None):
+    """Score clusters by available CPU units (lower is better)"""
+    return state.available[:, state.resource_index["cpu"]]
+
+
+def peak_after(state, demand):
+    """Score clusters by their highest utilization once demand is placed"""
+    return state.utilization_after(demand).max(axis=1)
+
+
+def utilization_added(state, demand):
+    """Score clusters by the total utilization demand adds to them"""
+    return (demand / state.capacity).sum(axis=1)
+
+
+def first_fit(state, demand):
+    """Score clusters by position, so the first feasible cluster wins"""
+    return np.arange(len(state.clusters), dtype=np.float64)
+
+
+def l2_residual(state, demand):
+    """Score clusters by the L2 norm of their free share after placement"""
+    return np.linalg.norm(1.0 - state.utilization_after(demand), axis=1)
+
+
+def dot_product(state, demand):
+    """Score clusters by the alignment of demand with their free share (higher first)"""
+    return -((demand / state.capacity) * (1.0 - state.usage)).sum(axis=1)
+
+
+def largest_first(state, demands):
+    """Row order of a demand matrix by decreasing dominant resource share"""
+    share = (demands / state.capacity.max(axis=0)).max(axis=1)
+    return np.argsort(-share, kind="stable")
+
+
+class GreedyPlacementEngine:
+    """
+    Vectorized greedy placement on a ClusterState.
+
+    Each decision computes the feasibility mask and the score of every cluster
+    in one NumPy pass and picks the feasible cluster with the lowest score.
+    A score is called with the state and the demand vector being placed.
+    Exact ties are broken at random with the engine's generator, so a seeded
+    engine is reproducible. Placements are applied to the state in place.
+    """
+
+    def __init__(self, state, score=cpu_utilization, seed=None):
+        self.state = state
+        self.score = score
+        # default_rng passes an existing Generator through unchanged
+        self.rng = np.random.default_rng(seed)
+
+    def select(self, demand):
+        """Row index of the best cluster for a demand vector, or None"""
+        feasible = self.state.feasible_mask(demand)
+        if not feasible.any():
+            return None
+
+        scores = np.where(feasible, self.score(self.state, demand), np.inf)
+        best = np.flatnonzero(scores == scores.min())
+        if len(best) > 1:
+            return int(self.rng.choice(best))
+        return int(best[0])
+
+    def place(self, demand):
+        """Select a cluster for demand and apply the placement"""
+        i = self.select(demand)
+        if i is not None:
+            self.state.place(i, demand)
+        return i
+
+    def place_batch(self, demands):
+        """
+        Place a VMs x resources demand matrix in row order. Returns the chosen
+        row index per VM, -1 for VMs that fit nowhere (those are skipped).
+        """
+        assignments = np.full(len(demands), -1, dtype=np.int64)
+        for k, demand in enumerate(np.asarray(demands, dtype=np.float64)):
+            i = self.place(demand)
+            if i is not None:
+                assignments[k] = i
+        return assignments
@@ -0,0 +1,309 @@
+import logging
+
+import numpy as np
+
+from src.models.base_optimizer import BaseVMOptimizer
+
+logger = logging.getLogger(__name__)
+
+
+class HostAwareOptimizer(BaseVMOptimizer):
+    """
+    Min-max utilization placement of new VMs on hosts grouped in clusters.
+
+    existing_placements maps VMs to hosts and the placement plan maps every
+    new VM to a host. vm_demand must hold the demands of the placed VMs as
+    well as of the new ones (ValueError otherwise): per-host used units are
+    aggregated from the existing placements once, when the optimizer is
+    created. cluster_capacity and
+    current_usage default to the sums over each cluster's hosts.
+
+    By default the problem is decomposed in two levels: a cluster-level MIP
+    with x[v,c] variables picks the cluster of every VM (only for clusters
+    having a host the VM fits on), then the VMs of each cluster are packed on
+    its hosts, largest first, each on the host with the lowest peak
+    utilization after placement. A VM that fits on no host of its cluster
+    forbids that cluster and the cluster-level model is solved again. The
+    model has VMs x clusters variables instead of VMs x hosts; set decompose
+    to False to solve the flat x[v,h] model instead.
+    """
+
+    decompose = True
+
+    def __init__(
+        self,
+        clusters,
+        existing_placements,
+        new_vms,
+        current_usage,
+        cluster_capacity,
+        vm_demand,
+        hosts,
+        host_capacity,
+        host_cluster,
+        seed=None,
+        solver=None,
+        time_limit=None,
+        mip_gap=None,
+    ):
+        missing = [vm for vm in existing_placements if vm not in vm_demand]
+        if missing:
+            raise ValueError(
+                f"vm_demand has no demand for {len(missing)} placed VMs, "
+                f"such as {missing[:3]}"
+            )
+        super().__init__(
+            clusters,
+            existing_placements,
+            new_vms,
+            current_usage,
+            cluster_capacity,
+            vm_demand,
+            seed=seed,
+            solver=solver,
+            time_limit=time_limit,
+            mip_gap=mip_gap,
+        )
+        self.hosts = list(hosts)
+        self.host_cluster = host_cluster
+        self.host_index = {h: i for i, h in enumerate(self.hosts)}
+        cluster_index = {c: i for i, c in enumerate(self.clusters)}
+
+        # Per-host aggregates, computed in a single pass over the placements
+        self.host_capacity = np.array(
+            [[host_capacity[h][r] for r in self.resources] for h in self.hosts],
+            dtype=np.float64,
+        ).reshape(len(self.hosts), len(self.resources))
+        self.host_used = np.zeros_like(self.host_capacity)
+        rows = [self.host_index[h] for h in existing_placements.values()]
+        demands = [
+            [vm_demand[vm][r] for r in self.resources] for vm in existing_placements
+        ]
+        if rows:
+            np.add.at(self.host_used, rows, demands)
+        self.host_cluster_index = np.array(
+            [cluster_index[host_cluster[h]] for h in self.hosts], dtype=np.int64
+        )
+        self.cluster_hosts = [
+            np.flatnonzero(self.host_cluster_index == i)
+            for i in range(len(self.clusters))
+        ]
+
+        if self.cluster_capacity is None:
+            self.cluster_capacity = {
+                c: dict(
+                    zip(self.resources, self.host_capacity[hosts_of_c].sum(0).tolist())
+                )
+                for c, hosts_of_c in zip(self.clusters, self.cluster_hosts)
+            }
+        if self.current_usage is None:
+            self.current_usage = {
+                c: {
+                    r: float(self.host_used[hosts_of_c, j].sum())
+                    / self.cluster_capacity[c][r]
+                    for j, r in enumerate(self.resources)
+                }
+                for c, hosts_of_c in zip(self.clusters, self.cluster_hosts)
+            }
+
+        self.demand = np.array(
+            [[vm_demand[v][r] for r in self.resources] for v in self.new_vms],
+            dtype=np.float64,
+        ).reshape(len(self.new_vms), len(self.resources))
+        # fits[v, h]: new VM v fits on host h by itself
+        free = self.host_capacity - self.host_used
+        self.fits = np.all(self.demand[:, None, :] <= free[None, :, :], axis=2)
+
+    def create_model(self):
+        if self.decompose:
+            return self.create_cluster_model()
+        return self.create_flat_model()
+
+    def create_cluster_model(self):
+        """Cluster-level model: x[v,c] for clusters with a host v fits on"""
+        self.mdl = self.new_model("vm_host_cluster_placement")
+
+        fits_cluster = np.stack(
+            [self.fits[:, hosts].any(axis=1) for hosts in self.cluster_hosts], axis=1
+        )
+        pairs = [
+            (self.new_vms[k], self.clusters[i]) for k, i in zip(*fits_cluster.nonzero())
+        ]
+        self.x = self.mdl.binary_var_dict(pairs, name="x")
+        self.z = self.mdl.continuous_var(name="z")
+
+        self.print_decision_variables()
+
+        placeable = {c: [] for c in self.clusters}
+        options = {v: [] for v in self.new_vms}
+        for v, c in pairs:
+            placeable[c].append(v)
+            options[v].append(c)
+
+        for v in self.new_vms:
+            if not options[v]:
+                logger.info("VM %s fits on no host", v)
+                return None
+            self.mdl.add_constraint(self.mdl.sum(self.x[v, c] for c in options[v]) == 1)
+
+        for c in self.clusters:
+            for r in self.resources:
+                load = (
+                    self.mdl.sum(
+                        self.vm_demand[v][r] * self.x[v, c] for v in placeable[c]
+                    )
+                    + self.current_usage[c][r] * self.cluster_capacity[c][r]
+                )
+                constraint = self.mdl.add_constraint(
+                    load <= self.cluster_capacity[c][r]
+                )
+                self.print_constraints(
+                    constraint, "Constraint for cluster %s, resource %s", c, r
+                )
+                self.mdl.add_constraint(load / self.cluster_capacity[c][r] <= self.z)
+
+        return self.mdl
+
+    def create_flat_model(self):
+        """Flat model: x[v,h] for every host v fits on"""
+        self.mdl = self.new_model("vm_host_placement")
+
+        pairs = [(self.new_vms[k], self.hosts[h]) for k, h in zip(*self.fits.nonzero())]
+        self.x = self.mdl.binary_var_dict(pairs, name="x")
+        self.z = self.mdl.continuous_var(name="z")
+
+        on_host = {h: [] for h in self.hosts}
+        options = {v: [] for v in self.new_vms}
+        for v, h in pairs:
+            on_host[h].append(v)
+            options[v].append(h)
+
+        for v in self.new_vms:
+            if not options[v]:
+                logger.info("VM %s fits on no host", v)
+                return None
+            self.mdl.add_constraint(self.mdl.sum(self.x[v, h] for h in options[v]) == 1)
+
+        for h in self.hosts:
+            if not on_host[h]:
+                continue
+            i = self.host_index[h]
+            for j, r in enumerate(self.resources):
+                self.mdl.add_constraint(
+                    self.mdl.sum(
+                        self.vm_demand[v][r] * self.x[v, h] for v in on_host[h]
+                    )
+                    + self.host_used[i, j]
+                    <= self.host_capacity[i, j]
+                )
+
+        for c, hosts_of_c in zip(self.clusters, self.cluster_hosts):
+            terms = [
+                (v, self.hosts[i]) for i in hosts_of_c for v in on_host[self.hosts[i]]
+            ]
+            for r in self.resources:
+                load = (
+                    self.mdl.sum(self.vm_demand[v][r] * self.x[v, h] for v, h in terms)
+                    + self.current_usage[c][r] * self.cluster_capacity[c][r]
+                )
+                self.mdl.add_constraint(load / self.cluster_capacity[c][r] <= self.z)
+
+        return self.mdl
+
+    def add_objective(self):
+        self.mdl.minimize(self.z)
+
+    def optimize(self):
+        """Main optimization workflow"""
+        self.print_initial_state()
+
+        with self.phase("build"):
+            model = self.create_model()
+            if model is not None:
+                self.add_objective()
+        if model is None:
+            return None, None, None, None
+
+        with self.phase("extract"):
+            return self.solve()
+
+    def solve(self):
+        if not self.decompose:
+            solution = self.solve_model(self.mdl)
+            if solution is None:
+                return None, None, None, None
+            placement_plan = {
+                v: h for (v, h), var in self.x.items() if solution.get_value(var) > 0.5
+            }
+            return self.results(solution.get_value(self.z), placement_plan)
+
+        # Every failed packing forbids one (VM, cluster) pair
+        for _ in range(len(self.x) + 1):
+            solution = self.solve_model(self.mdl)
+            if solution is None:
+                return None, None, None, None
+
+            cluster_plan = {
+                v: c for (v, c), var in self.x.items() if solution.get_value(var) > 0.5
+            }
+            with self.phase("solve"):
+                placement_plan, unplaced = self.assign_hosts(cluster_plan)
+            if not unplaced:
+                return self.results(solution.get_value(self.z), placement_plan)
+
+            for v in unplaced:
+                logger.debug(
+                    "VM %s fits on no remaining host of %s", v, cluster_plan[v]
+                )
+                self.x[v, cluster_plan[v]].ub = 0
+
+        return None, None, None, None
+
+    def assign_hosts(self, cluster_plan):
+        """
+        Pack the VMs of every cluster on its hosts. Returns the {vm: host}
+        plan and the VMs that fit on no host of their cluster.
+        """
+        vm_index = {v: k for k, v in enumerate(self.new_vms)}
+        used = self.host_used.copy()
+        placement_plan = {}
+        unplaced = []
+
+        by_cluster = {c: [] for c in self.clusters}
+        for v, c in cluster_plan.items():
+            by_cluster[c].append(vm_index[v])
+
+        for i, c in enumerate(self.clusters):
+            hosts = self.cluster_hosts[i]
+            capacity = self.host_capacity[hosts]
+            # Largest VMs first, by their share of the cluster's capacity
+            members = np.array(by_cluster[c], dtype=np.int64)
+            share = (self.demand[members] / capacity.sum(axis=0)).sum(axis=1)
+            for k in members[np.argsort(-share, kind="stable")].tolist():
+                after = used[hosts] + self.demand[k]
+                feasible = np.all(after <= capacity, axis=1)
+                if not feasible.any():
+                    unplaced.append(self.new_vms[k])
+                    continue
+                peak = np.where(feasible, (after / capacity).max(axis=1), np.inf)
+                best = np.flatnonzero(peak == peak.min())
+                h = hosts[best[0] if len(best) == 1 else self.rng.choice(best)]
+                used[h] += self.demand[k]
+                placement_plan[self.new_vms[k]] = self.hosts[h]
+
+        return placement_plan, unplaced
+
+    def results(self, final_utilization, placement_plan):
+        """Result tuple of a {vm: host} plan, as returned by solve()"""
+        self.print_optimization_results(final_utilization)
+
+        cluster_plan = {v: self.host_cluster[h] for v, h in placement_plan.items()}
+        cluster_utilization = self.calculate_utilization(None, cluster_plan)
+
+        final_placement = {h: [] for h in self.hosts}
+        for vm, host in self.existing_placements.items():
+            final_placement[host].append(vm)
+        for vm, host in placement_plan.items():
+            final_placement[host].append(vm)
+
+        return placement_plan, cluster_utilization, final_utilization, final_placement
@@ -0,0 +1,194 @@
+from src.models.min_max_optimizer import MinUtilizationOptimizer
+
+
+class IncrementalMinUtilizationOptimizer(MinUtilizationOptimizer):
+    """
+    MinUtilizationOptimizer that keeps a single live docplex model across
+    sequential placements.
+
+    New VMs are mapped onto reusable placement slots x[s, c]. Between calls only
+    the slot demand coefficients and the right-hand sides derived from the
+    current usage change; slots are added when a larger batch arrives and
+    retired (zero demand) when a smaller one does. The previous solution is
+    handed to CPLEX as a MIP start. Use update() to move to the next VMs
+    instead of building a new optimizer.
+
+    Per-placement data is written straight to the CPLEX engine, so the docplex
+    expressions keep the coefficients of the skeleton (zero demand, zero usage)
+    and exporting the model does not reflect the current placement.
+    """
+
+    incremental = True
+    # Every placement goes through the live model
+    analytical_single_vm = False
+    # The previous solution is the MIP start
+    warm_start = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.solver != "docplex":
+            raise ValueError(f"{type(self).__name__} requires the docplex solver")
+        self.mdl = None
+        self.x = {}
+        self.z = None
+        self.num_slots = 0
+        self.capacity_constraints = {}
+        self.utilization_constraints = {}
+        self.last_solution = {}
+
+    def update(self, existing_placements, new_vms, current_usage, vm_demand):
+        """Point the live model at the next VMs and the current cluster usage"""
+        self.existing_placements = existing_placements
+        self.new_vms = new_vms
+        self.current_usage = current_usage
+        self.vm_demand = vm_demand
+
+    def _add_slots(self, count):
+        """Add placement slots with their assignment constraints"""
+        for s in range(self.num_slots, self.num_slots + count):
+            for c in self.clusters:
+                self.x[s, c] = self.mdl.binary_var(name=f"x_{s}_{c}")
+            self.mdl.add_constraint(
+                self.mdl.sum(self.x[s, c] for c in self.clusters) == 1,
+                f"slot_{s}",
+            )
+            # New slots start with zero demand; coefficients are set on load
+            for c in self.clusters:
+                for r in self.resources:
+                    self.capacity_constraints[c, r].lhs.add_term(self.x[s, c], 0)
+                    self.utilization_constraints[c, r].lhs.add_term(self.x[s, c], 0)
+        self.num_slots += count
+
+    def _build_skeleton(self):
+        """Create the persistent model with one constraint pair per (c, r)"""
+        # docplex is only imported when used, as in solvers.new_model
+        from docplex.mp.model import Model
+
+        self.mdl = Model("vm_cluster_placement_incremental")
+        cpx = self.mdl.get_cplex()
+        if self.time_limit is not None:
+            cpx.parameters.timelimit.set(self.time_limit)
+        if self.mip_gap is not None:
+            cpx.parameters.mip.tolerances.mipgap.set(self.mip_gap)
+        self.z = self.mdl.continuous_var(name="z")
+
+        # Capacity: sum_s d[s,r] x[s,c] <= cap[c,r] - used[c,r]
+        # Utilization: sum_s d[s,r]/cap[c,r] x[s,c] - z <= -used[c,r]/cap[c,r]
+        for c in self.clusters:
+            for r in self.resources:
+                self.capacity_constraints[c, r] = self.mdl.add_constraint(
+                    self.mdl.linear_expr() <= 0, f"capacity_{c}_{r}"
+                )
+                self.utilization_constraints[c, r] = self.mdl.add_constraint(
+                    self.mdl.linear_expr() - self.z <= 0, f"utilization_{c}_{r}"
+                )
+
+        self.mdl.minimize(self.z)
+
+    def _load_data(self):
+        """
+        Write the current demands and usage into the live model. Coefficients
+        and right-hand sides are pushed to the CPLEX engine in two bulk calls;
+        going through docplex would resynchronise every constraint separately.
+        """
+        cpx = self.mdl.get_cplex()
+        coefficients = []
+        rhs = []
+
+        for c in self.clusters:
+            for r in self.resources:
+                capacity = self.cluster_capacity[c][r]
+                used = self.current_usage[c][r] * capacity
+                capacity_row = self.capacity_constraints[c, r].index
+                utilization_row = self.utilization_constraints[c, r].index
+
+                for s in range(self.num_slots):
+                    demand = (
+                        self.vm_demand[self.new_vms[s]][r]
+                        if s < len(self.new_vms)
+                        else 0.0  # retired slot
+                    )
+                    column = self.x[s, c].index
+                    coefficients.append((capacity_row, column, demand))
+                    coefficients.append((utilization_row, column, demand / capacity))
+
+                rhs.append((capacity_row, capacity - used))
+                rhs.append((utilization_row, -used / capacity))
+
+        cpx.linear_constraints.set_coefficients(coefficients)
+        cpx.linear_constraints.set_rhs(rhs)
+
+    def create_model(self):
+        if self.mdl is None:
+            self._build_skeleton()
+            self.print_decision_variables()
+
+        if len(self.new_vms) > self.num_slots:
+            self._add_slots(len(self.new_vms) - self.num_slots)
+
+        self._load_data()
+        return self.mdl
+
+    def add_objective(self):
+        """Objective is set once when the skeleton is built"""
+        pass
+
+    def solve(self):
+        """
+        Solve on the CPLEX engine directly, warm-started from the previous
+        assignment; docplex's solve wrapper costs as much as the solve itself.
+        """
+        from cplex import SparsePair
+
+        cpx = self.mdl.get_cplex()
+        columns = [
+            self.x[s, c].index for s in range(self.num_slots) for c in self.clusters
+        ]
+
+        if self.last_solution:
+            with self.phase("warm_start"):
+                cpx.MIP_starts.delete()
+                cpx.MIP_starts.add(
+                    SparsePair(
+                        ind=list(self.last_solution),
+                        val=list(self.last_solution.values()),
+                    ),
+                    cpx.MIP_starts.effort_level.check_feasibility,
+                )
+
+        with self.phase("solve"):
+            cpx.solve()
+        status = cpx.solution.status
+        self.hit_limit = cpx.solution.get_status() in (
+            status.MIP_time_limit_feasible,
+            status.MIP_time_limit_infeasible,
+        )
+        if not cpx.solution.is_primal_feasible():
+            self.gap = None
+            return None, None, None, None
+
+        solution = cpx.solution
+        self.gap = solution.MIP.get_mip_relative_gap()
+        self.last_solution = dict(zip(columns, solution.get_values(columns)))
+
+        # Create placement plan
+        placement_plan = {}
+        final_utilization = solution.get_values(self.z.index)
+
+        self.print_optimization_results(final_utilization)
+
+        for s, v in enumerate(self.new_vms):
+            for c in self.clusters:
+                if self.last_solution[self.x[s, c].index] > 0.5:
+                    placement_plan[v] = c
+
+        cluster_utilization = self.calculate_utilization(solution, placement_plan)
+
+        # Calculate final placement
+        final_placement = {c: [] for c in self.clusters}
+        for vm, cluster in self.existing_placements.items():
+            final_placement[cluster].append(vm)
+        for vm, cluster in placement_plan.items():
+            final_placement[cluster].append(vm)
+
+        return placement_plan, cluster_utilization, final_utilization, final_placement
@@ -0,0 +1,346 @@
+import logging
+import time
+
+import numpy as np
+
+from src.models.base_optimizer import BaseVMOptimizer
+from src.models.greedy_engine import (
+    GreedyPlacementEngine,
+    largest_first,
+    peak_after,
+)
+from src.models.min_max_optimizer import MinUtilizationOptimizer
+from src.models.solvers import add_mip_start
+
+logger = logging.getLogger(__name__)
+
+# Improvements smaller than this are treated as no improvement
+EPSILON = 1e-12
+
+
+class LocalSearchOptimizer(BaseVMOptimizer):
+    """
+    Min-max utilization placement by local search, for batches too large for
+    the MIP of MinUtilizationOptimizer.
+
+    Starts from the greedy placement (largest VMs first on the cluster with
+    the lowest peak after placement) and improves it until time_limit:
+
+    - move: one of the move_candidates VMs using the most of the bottleneck
+      resource leaves the bottleneck cluster (the one holding the peak
+      utilization) for the cluster where the pair's peak is lowest;
+    - swap: when no move helps, a sample of VMs on the bottleneck is
+      exchanged with a sample of VMs elsewhere;
+    - large neighbourhood: when neither helps, the VMs of the bottleneck
+      and of neighbourhood_clusters random clusters are removed and
+      re-placed greedily in random order, keeping the result unless the
+      peak got worse.
+
+    Every step is evaluated for all candidates in one NumPy pass. The
+    achieved z is reported with a lower bound: the aggregate capacity,
+    current peak and single-VM bounds, and the best bound of the
+    MinUtilizationOptimizer MIP when it has at most mip_bound_variables
+    variables (solved from the local search result within the same time
+    limit, whose incumbent is kept if it beats the search). The search stops
+    early once within mip_gap of the other bounds or after stall_limit
+    neighbourhood steps without a new best z.
+    """
+
+    # Budget when no time_limit is given (seconds)
+    default_time_limit = 1.0
+    # Largest MIP solved for a lower bound; 0 disables it
+    mip_bound_variables = 1000
+    # VMs of the bottleneck considered by the move step
+    move_candidates = 256
+    # Sample size per side of the swap step
+    swap_sample = 64
+    # Random clusters emptied with the bottleneck in a neighbourhood step
+    neighbourhood_clusters = 2
+    # Neighbourhood steps without a new best z before the search stops
+    stall_limit = 200
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Lower bounds on z of the last solve; mip_bound stays None when the
+        # MIP was not solved
+        self.bound = None
+        self.mip_bound = None
+        # Whether the MIP of the last solve stopped at the time limit
+        self.mip_hit_limit = False
+        # Accepted moves, swaps and neighbourhood steps of the last solve
+        self.moves = 0
+        self.swaps = 0
+        self.neighbourhoods = 0
+
+    def create_model(self):
+        """Dense demand matrix of the new VMs and a working cluster state"""
+        self.work = self.state.copy()
+        self.demands = self.work.demand_matrix(self.vm_demand, self.new_vms)
+        return self.work
+
+    def add_objective(self):
+        """The objective, the peak utilization, is built into the search"""
+        pass
+
+    def optimize(self):
+        """Main optimization workflow"""
+        self.print_initial_state()
+        with self.phase("build"):
+            self.create_model()
+            self.add_objective()
+        with self.phase("solve"):
+            return self.solve()
+
+    def solve(self):
+        start = time.perf_counter()
+        budget = (
+            self.time_limit if self.time_limit is not None else self.default_time_limit
+        )
+        deadline = start + budget
+        self.moves = self.swaps = self.neighbourhoods = 0
+
+        self.assign = self.initial_assignment()
+        if self.assign is None:
+            self.gap = None
+            return None, None, None, None
+
+        self.bound = self.lower_bound()
+        tolerance = self.mip_gap if self.mip_gap is not None else 1e-4
+        best = self.work.peak_utilization()
+        best_assign, best_usage = self.assign.copy(), self.work.usage.copy()
+        stopped = False
+        stall = 0
+        while best - self.bound > tolerance * best and stall < self.stall_limit:
+            if time.perf_counter() > deadline:
+                stopped = True
+                break
+            if not (self.move() or self.swap()):
+                stall += 1
+                if not self.neighbourhood():
+                    continue
+            z = self.work.peak_utilization()
+            if z < best - EPSILON:
+                best = z
+                best_assign, best_usage = self.assign.copy(), self.work.usage.copy()
+                stall = 0
+
+        self.assign = best_assign
+        self.work.usage = best_usage
+        best = self.mip_lower_bound(deadline, best)
+        # Either the search or the MIP solved after it ran out of time
+        self.hit_limit = stopped or self.mip_hit_limit
+        self.gap = max(best - self.bound, 0.0) / best if best > 0 else 0.0
+
+        logger.info(
+            "Local search: z %.4f, lower bound %.4f (gap %.2f%%) in %.2fs after "
+            "%d moves, %d swaps, %d neighbourhood steps",
+            best,
+            self.bound,
+            self.gap * 100,
+            time.perf_counter() - start,
+            self.moves,
+            self.swaps,
+            self.neighbourhoods,
+        )
+        with self.phase("extract"):
+            return self.results(best)
+
+    def initial_assignment(self):
+        """Greedy cluster index per new VM, largest first; None if one fits nowhere"""
+        order = largest_first(self.work, self.demands)
+        engine = GreedyPlacementEngine(self.work, score=peak_after, seed=self.rng)
+        assign = np.empty(len(self.new_vms), dtype=np.int64)
+        assign[order] = engine.place_batch(self.demands[order])
+        if np.any(assign < 0):
+            return None
+        return assign
+
+    def lower_bound(self):
+        """
+        Largest of three bounds on the optimal z: total used plus new demand
+        over total capacity per resource, the current peak utilization, and
+        for every new VM its lowest peak_after over the clusters it fits
+        """
+        state = self.state
+        total = (state.used.sum(axis=0) + self.demands.sum(axis=0)) / (
+            state.capacity.sum(axis=0)
+        )
+        after = state.usage[None] + self.demands[:, None] / state.capacity[None]
+        peaks = np.where(np.all(after <= 1.0, axis=2), after.max(axis=2), np.inf)
+        single = peaks.min(axis=1).max() if len(self.new_vms) else 0.0
+        return float(max(total.max(), state.peak_utilization(), single))
+
+    def move(self):
+        """Best single move off the bottleneck cluster; False if none improves"""
+        usage, capacity = self.work.usage, self.work.capacity
+        peaks = usage.max(axis=1)
+        b = int(np.argmax(peaks))
+        on = np.flatnonzero(self.assign == b)
+        if on.size == 0:
+            return False
+        if on.size > self.move_candidates:
+            # The VMs using the most of the bottleneck resource
+            r = int(np.argmax(usage[b]))
+            top = np.argpartition(-self.demands[on, r], self.move_candidates)
+            on = on[top[: self.move_candidates]]
+
+        demand = self.demands[on]
+        source = (usage[b] - demand / capacity[b]).max(axis=1)
+        after = usage[None] + demand[:, None] / capacity[None]
+        target = np.where(np.all(after <= 1.0, axis=2), after.max(axis=2), np.inf)
+        target[:, b] = np.inf
+        pair = np.maximum(source[:, None], target)
+
+        k, c = np.unravel_index(np.argmin(pair), pair.shape)
+        if pair[k, c] >= peaks[b] - EPSILON:
+            return False
+        self.relocate(on[k], int(c))
+        self.moves += 1
+        return True
+
+    def swap(self):
+        """Best swap of sampled VMs on and off the bottleneck; False if none improves"""
+        usage, capacity = self.work.usage, self.work.capacity
+        peaks = usage.max(axis=1)
+        b = int(np.argmax(peaks))
+        on = np.flatnonzero(self.assign == b)
+        off = np.flatnonzero(self.assign != b)
+        if on.size == 0 or off.size == 0:
+            return False
+        if on.size > self.swap_sample:
+            on = self.rng.choice(on, self.swap_sample, replace=False)
+        if off.size > self.swap_sample:
+            off = self.rng.choice(off, self.swap_sample, replace=False)
+
+        d_on, d_off = self.demands[on], self.demands[off]
+        c = self.assign[off]
+        # Bottleneck after giving up on[i] and taking off[j], and the other
+        # cluster after the opposite exchange (i x j x resources)
+        source = (usage[b] + (d_off[None] - d_on[:, None]) / capacity[b]).max(axis=2)
+        other = usage[c][None] + (d_on[:, None] - d_off[None]) / capacity[c][None]
+        feasible = np.all(other <= 1.0, axis=2) & (source <= 1.0)
+        pair = np.where(feasible, np.maximum(source, other.max(axis=2)), np.inf)
+
+        i, j = np.unravel_index(np.argmin(pair), pair.shape)
+        if pair[i, j] >= peaks[b] - EPSILON:
+            return False
+        self.relocate(on[i], int(c[j]))
+        self.relocate(off[j], b)
+        self.swaps += 1
+        return True
+
+    def neighbourhood(self):
+        """
+        Re-place the VMs of the bottleneck and of random other clusters in
+        random order; keeps the result unless the peak got worse
+        """
+        usage = self.work.usage
+        b = int(np.argmax(usage.max(axis=1)))
+        others = np.delete(np.arange(len(self.clusters)), b)
+        chosen = self.rng.choice(
+            others, min(self.neighbourhood_clusters, others.size), replace=False
+        )
+        vms = np.flatnonzero(np.isin(self.assign, np.append(chosen, b)))
+        if vms.size == 0:
+            return False
+
+        before = self.work.peak_utilization()
+        saved_assign, saved_usage = self.assign[vms].copy(), usage.copy()
+        for k in vms:
+            self.work.release(int(self.assign[k]), self.demands[k])
+        order = self.rng.permutation(vms)
+        engine = GreedyPlacementEngine(self.work, score=peak_after, seed=self.rng)
+        placed = engine.place_batch(self.demands[order])
+        self.assign[order] = placed
+
+        if np.any(placed < 0) or self.work.peak_utilization() > before + EPSILON:
+            self.assign[vms] = saved_assign
+            self.work.usage = saved_usage
+            return False
+        self.neighbourhoods += 1
+        return True
+
+    def relocate(self, k, cluster):
+        """Move new VM k to cluster (row index) in the working state"""
+        self.work.release(int(self.assign[k]), self.demands[k])
+        self.work.place(cluster, self.demands[k])
+        self.assign[k] = cluster
+
+    def mip_lower_bound(self, deadline, best):
+        """
+        Raise self.bound to the best bound of the MinUtilizationOptimizer MIP,
+        started from the current assignment (of peak best), if it is small
+        enough and time is left. The MIP incumbent replaces the assignment
+        when its peak is lower; returns the peak of the kept assignment.
+        """
+        self.mip_bound = None
+        self.mip_hit_limit = False
+        size = len(self.new_vms) * len(self.clusters) + 1
+        remaining = deadline - time.perf_counter()
+        if size > self.mip_bound_variables or remaining <= 0:
+            return best
+
+        reference = MinUtilizationOptimizer.from_state(
+            self.state,
+            self.existing_placements,
+            self.new_vms,
+            self.vm_demand,
+            solver=self.solver,
+            time_limit=remaining,
+            mip_gap=self.mip_gap,
+        )
+        mdl = reference.create_model()
+        reference.add_objective()
+        add_mip_start(
+            mdl,
+            {
+                reference.x[v, c]: 1.0 if self.assign[k] == i else 0.0
+                for k, v in enumerate(self.new_vms)
+                for i, c in enumerate(self.clusters)
+            },
+        )
+        solution = mdl.solve()
+        if mdl.solve_details is not None:
+            self.mip_hit_limit = mdl.solve_details.has_hit_limit()
+        if solution is None:
+            return best
+        if mdl.solve_details.best_bound is not None:
+            self.mip_bound = float(mdl.solve_details.best_bound)
+            self.bound = max(self.bound, self.mip_bound)
+        if solution.objective_value >= best - EPSILON:
+            return best
+
+        values = np.array(
+            [
+                [solution.get_value(reference.x[v, c]) for c in self.clusters]
+                for v in self.new_vms
+            ]
+        )
+        saved_assign, saved_usage = self.assign, self.work.usage.copy()
+        self.assign = values.argmax(axis=1)
+        self.work.usage = self.state.usage.copy()
+        for k, i in enumerate(self.assign.tolist()):
+            self.work.place(i, self.demands[k])
+        z = self.work.peak_utilization()
+        if z >= best - EPSILON:
+            self.assign, self.work.usage = saved_assign, saved_usage
+            return best
+        logger.info("MIP incumbent improves the local search peak to %.4f", z)
+        return z
+
+    def results(self, final_utilization):
+        """Standard 4-tuple of the working state and assignment"""
+        self.print_optimization_results(final_utilization)
+
+        placement_plan = {
+            v: self.clusters[i] for v, i in zip(self.new_vms, self.assign.tolist())
+        }
+        cluster_utilization = self.work.to_usage_dict()
+
+        final_placement = {c: [] for c in self.clusters}
+        for vm, cluster in self.existing_placements.items():
+            final_placement[cluster].append(vm)
+        for vm, cluster in placement_plan.items():
+            final_placement[cluster].append(vm)
+
+        return placement_plan, cluster_utilization, final_utilization, final_placement
@@ -1,11 +1,18 @@
-from docplex.mp.model import Model
+import numpy as np
 
 from src.models.base_optimizer import BaseVMOptimizer
+from src.models.greedy_engine import peak_after
 
 
 class MinUtilizationOptimizer(BaseVMOptimizer):
+    # Place a single new VM with the closed-form solution instead of CPLEX
+    analytical_single_vm = True
+    # Start each solve from a greedy placement
+    warm_start = True
+    warm_start_score = staticmethod(peak_after)
+
     def create_model(self):
-        self.mdl = Model("vm_cluster_placement")
+        self.mdl = self.new_model("vm_cluster_placement")
 
         # Decision variables
         self.x = self.mdl.binary_var_dict(
@@ -20,7 +27,7 @@ class MinUtilizationOptimizer(BaseVMOptimizer):
             constraint = self.mdl.add_constraint(
                 self.mdl.sum(self.x[v, c] for c in self.clusters) == 1
             )
-            self.print_constraints(constraint, f"Constraint for VM {v}")
+            self.print_constraints(constraint, "Constraint for VM %s", v)
 
         # Resource capacity constraints
         for c in self.clusters:
@@ -38,7 +45,7 @@ class MinUtilizationOptimizer(BaseVMOptimizer):
                     <= self.cluster_capacity[c][r]
                 )
                 self.print_constraints(
-                    constraint, f"Constraint for cluster {c}, resource {r}"
+                    constraint, "Constraint for cluster %s, resource %s", c, r
                 )
 
                 # Utilization constraint
@@ -53,7 +60,7 @@ class MinUtilizationOptimizer(BaseVMOptimizer):
                     <= self.z
                 )
                 self.print_constraints(
-                    z_constraint, f"Z Constraint - Cluster {c}, Resource {r}"
+                    z_constraint, "Z Constraint - Cluster %s, Resource %s", c, r
                 )
 
         return self.mdl
@@ -64,16 +71,25 @@ class MinUtilizationOptimizer(BaseVMOptimizer):
     def optimize(self):
         """Main optimization workflow"""
         self.print_initial_state()
-        model = self.create_model()
+        if self.analytical_single_vm and len(self.new_vms) == 1:
+            with self.phase("solve"):
+                return self.solve_single_vm()
+
+        with self.phase("build"):
+            model = self.create_model()
+            if model is not None:
+                self.add_objective()
         if model is None:
             return None, None, None, None
 
-        self.add_objective()
+        if self.warm_start:
+            self.add_warm_start()
 
-        return self.solve()
+        with self.phase("extract"):
+            return self.solve()
 
     def solve(self):
-        solution = self.mdl.solve()
+        solution = self.solve_model(self.mdl)
         if solution is None:
             return None, None, None, None
 
@@ -98,3 +114,58 @@ class MinUtilizationOptimizer(BaseVMOptimizer):
             final_placement[cluster].append(vm)
 
         return placement_plan, cluster_utilization, final_utilization, final_placement
+
+    def solve_single_vm(self):
+        """
+        Exact solution of the model for a single new VM, without a solver.
+
+        Placing v on cluster c gives z_c = max(max_r u'[c, r], max_{c' != c,r}
+        u[c', r]) where u is the current utilization and u' the utilization
+        after placement. The optimum is the feasible cluster with the lowest
+        z_c; ties go to the cluster whose own post-placement peak is lowest.
+        Returns the same 4-tuple as solve().
+        """
+        vm = self.new_vms[0]
+        capacity = np.array(
+            [
+                [self.cluster_capacity[c][r] for r in self.resources]
+                for c in self.clusters
+            ]
+        )
+        current = np.array(
+            [[self.current_usage[c][r] for r in self.resources] for c in self.clusters]
+        )
+        demand = np.array([self.vm_demand[vm][r] for r in self.resources])
+
+        # Same capacity test as the MIP: demand + used units <= capacity
+        feasible = np.all(demand + current * capacity <= capacity, axis=1)
+        if not feasible.any():
+            return None, None, None, None
+
+        peak_after = ((current * capacity + demand) / capacity).max(axis=1)
+        peak_before = current.max(axis=1)
+
+        # Highest current peak among the other clusters, via the top two peaks
+        order = np.argsort(peak_before)[::-1]
+        others_peak = np.full(len(self.clusters), peak_before[order[0]])
+        others_peak[order[0]] = (
+            peak_before[order[1]] if len(self.clusters) > 1 else -np.inf
+        )
+
+        z = np.where(feasible, np.maximum(peak_after, others_peak), np.inf)
+        candidates = np.flatnonzero(z == z.min())
+        best = candidates[np.argmin(peak_after[candidates])]
+
+        final_utilization = float(z[best])
+        self.gap = 0.0
+        self.print_optimization_results(final_utilization)
+
+        placement_plan = {vm: self.clusters[best]}
+        cluster_utilization = self.calculate_utilization(None, placement_plan)
+
+        final_placement = {c: [] for c in self.clusters}
+        for existing_vm, cluster in self.existing_placements.items():
+            final_placement[cluster].append(existing_vm)
+        final_placement[self.clusters[best]].append(vm)
+
+        return placement_plan, cluster_utilization, final_utilization, final_placement
@@ -1,6 +1,9 @@
-from docplex.mp.model import Model
+import logging
 
 from src.models.base_optimizer import BaseVMOptimizer
+from src.models.greedy_engine import utilization_added
+
+logger = logging.getLogger(__name__)
 
 
 class MinMaxPerClusterOptimizer(BaseVMOptimizer):
@@ -9,9 +12,13 @@ class MinMaxPerClusterOptimizer(BaseVMOptimizer):
     This ensures balanced resource utilization within each cluster independently.
     """
 
+    # Start each solve from a greedy placement
+    warm_start = True
+    warm_start_score = staticmethod(utilization_added)
+
     def create_model(self):
         """Create optimization model with variables and base constraints"""
-        self.mdl = Model("vm_cluster_placement_min_max_per_cluster")
+        self.mdl = self.new_model("vm_cluster_placement_min_max_per_cluster")
 
         # Decision variables for VM placement
         self.x = self.mdl.binary_var_dict(
@@ -31,7 +38,7 @@ class MinMaxPerClusterOptimizer(BaseVMOptimizer):
                 self.mdl.sum(self.x[v, c] for c in self.clusters) == 1,
                 f"vm_placement_{v}",
             )
-            self.print_constraints(constraint, f"Placement constraint for VM {v}")
+            self.print_constraints(constraint, "Placement constraint for VM %s", v)
 
         # Resource capacity and utilization constraints
         for c in self.clusters:
@@ -51,7 +58,9 @@ class MinMaxPerClusterOptimizer(BaseVMOptimizer):
                 )
                 self.print_constraints(
                     capacity_constraint,
-                    f"Capacity constraint for cluster {c}, resource {r}",
+                    "Capacity constraint for cluster %s, resource %s",
+                    c,
+                    r,
                 )
 
                 # Max utilization constraint per resource per cluster
@@ -68,7 +77,9 @@ class MinMaxPerClusterOptimizer(BaseVMOptimizer):
                 )
                 self.print_constraints(
                     utilization_constraint,
-                    f"Utilization constraint for cluster {c}, resource {r}",
+                    "Utilization constraint for cluster %s, resource %s",
+                    c,
+                    r,
                 )
 
         return self.mdl
@@ -85,17 +96,22 @@ class MinMaxPerClusterOptimizer(BaseVMOptimizer):
     def optimize(self):
         """Main optimization workflow"""
         self.print_initial_state()
-        model = self.create_model()
+        with self.phase("build"):
+            model = self.create_model()
+            if model is not None:
+                self.add_objective()
         if model is None:
             return None, None, None, None
 
-        self.add_objective()
+        if self.warm_start:
+            self.add_warm_start()
 
-        return self.solve()
+        with self.phase("extract"):
+            return self.solve()
 
     def solve(self):
         """Solve the optimization model and return results"""
-        solution = self.mdl.solve()
+        solution = self.solve_model(self.mdl)
         if solution is None:
             return None, None, None, None
 
@@ -127,17 +143,21 @@ class MinMaxPerClusterOptimizer(BaseVMOptimizer):
         for vm, cluster in placement_plan.items():
             final_placement[cluster].append(vm)
 
-        # Print optimization results
-        print("\nOptimization Results:")
-        print("\nFinal Utilization per Cluster and Resource:")
-        for c in self.clusters:
-            print(f"\nCluster {c}:")
-            for r in self.resources:
-                print(f"  {r}: {cluster_utilization[c][r]:.2%}")
-
-        print(f"\nMaximum utilization across all clusters: {final_utilization:.2%}")
-        print("\nPlacement Plan:")
-        for vm, cluster in placement_plan.items():
-            print(f"VM {vm} → Cluster {cluster}")
+        # Log optimization results
+        logger.info(
+            "Optimization Results: maximum utilization across all clusters: %.2f%%",
+            final_utilization * 100,
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Final Utilization per Cluster and Resource:")
+            for c in self.clusters:
+                logger.debug(
+                    "Cluster %s: %s",
+                    c,
+                    {r: f"{cluster_utilization[c][r]:.2%}" for r in self.resources},
+                )
+            logger.debug("Placement Plan:")
+            for vm, cluster in placement_plan.items():
+                logger.debug("VM %s → Cluster %s", vm, cluster)
 
         return placement_plan, cluster_utilization, final_utilization, final_placement
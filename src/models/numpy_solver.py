@@ -0,0 +1,581 @@
+import math
+import time
+
+import numpy as np
+
+# Feasibility and integrality tolerances, close to CPLEX's defaults
+TOLERANCE = 1e-9
+INTEGRALITY = 1e-6
+
+# solve_lp outcome when the simplex stops before proving optimality
+ITERATION_LIMIT = "iteration limit"
+
+
+class LinearExpr:
+    """Sum of coef * variable terms plus a constant"""
+
+    __slots__ = ("terms", "constant")
+
+    def __init__(self, terms=None, constant=0.0):
+        self.terms = terms if terms is not None else {}
+        self.constant = constant
+
+    @staticmethod
+    def of(value):
+        if isinstance(value, LinearExpr):
+            return value
+        if isinstance(value, Var):
+            return LinearExpr({value.index: 1.0})
+        return LinearExpr(constant=float(value))
+
+    def copy(self):
+        return LinearExpr(dict(self.terms), self.constant)
+
+    def add(self, other, scale=1.0):
+        """Add scale * other in place"""
+        other = LinearExpr.of(other)
+        for index, coef in other.terms.items():
+            self.terms[index] = self.terms.get(index, 0.0) + scale * coef
+        self.constant += scale * other.constant
+        return self
+
+    def scaled(self, factor):
+        return LinearExpr(
+            {i: coef * factor for i, coef in self.terms.items()},
+            self.constant * factor,
+        )
+
+    def __add__(self, other):
+        return self.copy().add(other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self.copy().add(other, -1.0)
+
+    def __rsub__(self, other):
+        return LinearExpr.of(other).copy().add(self, -1.0)
+
+    def __neg__(self):
+        return self.scaled(-1.0)
+
+    def __mul__(self, factor):
+        return self.scaled(float(factor))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, divisor):
+        return self.scaled(1.0 / float(divisor))
+
+    def __le__(self, other):
+        return LinearConstraint(self - other, "<=")
+
+    def __ge__(self, other):
+        return LinearConstraint(LinearExpr.of(other) - self, "<=")
+
+    def __eq__(self, other):
+        return LinearConstraint(self - other, "==")
+
+    __hash__ = None
+
+
+class Var:
+    """Decision variable of a NumpyModel"""
+
+    __slots__ = ("model", "index", "name")
+
+    def __init__(self, model, index, name):
+        self.model = model
+        self.index = index
+        self.name = name
+
+    @property
+    def lb(self):
+        return self.model._lb[self.index]
+
+    @lb.setter
+    def lb(self, value):
+        self.model._lb[self.index] = value
+
+    @property
+    def ub(self):
+        return self.model._ub[self.index]
+
+    @ub.setter
+    def ub(self, value):
+        self.model._ub[self.index] = value
+
+    def _expr(self):
+        return LinearExpr({self.index: 1.0})
+
+    def __add__(self, other):
+        return self._expr().add(other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self._expr().add(other, -1.0)
+
+    def __rsub__(self, other):
+        return LinearExpr.of(other).copy().add(self, -1.0)
+
+    def __neg__(self):
+        return LinearExpr({self.index: -1.0})
+
+    def __mul__(self, factor):
+        return LinearExpr({self.index: float(factor)})
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, divisor):
+        return LinearExpr({self.index: 1.0 / float(divisor)})
+
+    def __le__(self, other):
+        return self._expr() <= other
+
+    def __ge__(self, other):
+        return self._expr() >= other
+
+    def __eq__(self, other):
+        return self._expr() == other
+
+    __hash__ = object.__hash__
+
+    def __str__(self):
+        return self.name
+
+
+class LinearConstraint:
+    """expr <= 0 or expr == 0, the constant of expr holding the right-hand side"""
+
+    __slots__ = ("expr", "sense", "name")
+
+    def __init__(self, expr, sense, name=None):
+        self.expr = expr
+        self.sense = sense
+        self.name = name
+
+    def __str__(self):
+        terms = " + ".join(f"{coef:g} x{i}" for i, coef in self.expr.terms.items())
+        return f"{terms or '0'} {self.sense} {-self.expr.constant:g}"
+
+
+class Solution:
+    __slots__ = ("values", "objective_value")
+
+    def __init__(self, values, objective_value):
+        self.values = values
+        self.objective_value = objective_value
+
+    def get_value(self, item):
+        if isinstance(item, Var):
+            return float(self.values[item.index])
+        expr = LinearExpr.of(item)
+        return expr.constant + sum(
+            coef * self.values[i] for i, coef in expr.terms.items()
+        )
+
+
+class SolveDetails:
+    """Outcome of the last NumpyModel.solve(), named as docplex's SolveDetails"""
+
+    __slots__ = (
+        "status",
+        "mip_relative_gap",
+        "best_bound",
+        "time",
+        "nb_nodes_processed",
+    )
+
+    def __init__(self, status, mip_relative_gap, best_bound, time, nb_nodes_processed):
+        self.status = status
+        self.mip_relative_gap = mip_relative_gap
+        self.best_bound = best_bound
+        self.time = time
+        self.nb_nodes_processed = nb_nodes_processed
+
+    def has_hit_limit(self):
+        return self.status in ("time limit exceeded", "iteration limit exceeded")
+
+
+class NumpyModel:
+    """
+    Mixed-integer linear model solved offline with NumPy.
+
+    Implements the part of the docplex Model API used by the optimizers
+    (variable dicts, sum, add_constraint, minimize/maximize, solve and
+    Solution.get_value), so a model can be written once for either backend.
+    Models are solved by depth-first branch-and-bound on the most fractional
+    binary, with every LP relaxation solved by a dense two-phase simplex.
+    Nodes whose bound is within mip_gap (relative) of the incumbent are
+    pruned, as with CPLEX's default MIP gap. MIP starts given with
+    add_mip_start seed the incumbent before the search. Once time_limit
+    seconds have passed the search stops and the best incumbent is returned,
+    with its gap to the lowest open bound in solve_details. A relaxation the
+    simplex cannot solve within its iteration limit leaves its node open
+    (status "iteration limit exceeded") instead of failing. Meant for the
+    small per-step models of the simulation, not for thousands of variables.
+    """
+
+    def __init__(self, name="model", mip_gap=1e-4, absolute_gap=1e-6, time_limit=None):
+        self.name = name
+        self.mip_gap = mip_gap
+        self.absolute_gap = absolute_gap
+        self.time_limit = time_limit
+        self.solve_details = None
+        self._names = []
+        self._lb = []
+        self._ub = []
+        self._integer = []
+        self._constraints = []
+        self._objective = LinearExpr()
+        self._sign = 1.0
+        self._mip_starts = []
+        self.nodes = 0
+
+    @property
+    def number_of_variables(self):
+        return len(self._names)
+
+    @property
+    def number_of_constraints(self):
+        return len(self._constraints)
+
+    def _var(self, name, lb, ub, integer):
+        var = Var(self, len(self._names), name)
+        self._names.append(name)
+        self._lb.append(float(lb))
+        self._ub.append(float(ub))
+        self._integer.append(integer)
+        return var
+
+    @staticmethod
+    def _key_name(name, key):
+        key = key if isinstance(key, tuple) else (key,)
+        return "_".join([name, *map(str, key)])
+
+    def binary_var(self, name=None):
+        return self._var(name or f"x{len(self._names)}", 0.0, 1.0, True)
+
+    def continuous_var(self, lb=0.0, ub=math.inf, name=None):
+        return self._var(name or f"x{len(self._names)}", lb, ub, False)
+
+    def binary_var_dict(self, keys, name="x"):
+        return {k: self.binary_var(self._key_name(name, k)) for k in keys}
+
+    def continuous_var_dict(self, keys, lb=0.0, ub=math.inf, name="x"):
+        return {k: self.continuous_var(lb, ub, self._key_name(name, k)) for k in keys}
+
+    def linear_expr(self):
+        return LinearExpr()
+
+    def sum(self, items):
+        total = LinearExpr()
+        for item in items:
+            if isinstance(item, Var):
+                total.terms[item.index] = total.terms.get(item.index, 0.0) + 1.0
+            else:
+                total.add(item)
+        return total
+
+    def add_constraint(self, constraint, name=None):
+        constraint.name = name
+        self._constraints.append(constraint)
+        return constraint
+
+    def minimize(self, expr):
+        self._objective = LinearExpr.of(expr)
+        self._sign = 1.0
+
+    def maximize(self, expr):
+        self._objective = LinearExpr.of(expr)
+        self._sign = -1.0
+
+    def add_mip_start(self, values):
+        """
+        Start the next solve from a {var: value} assignment. As with a docplex
+        MIP start, integer variables missing from values and all continuous
+        variables are completed by the solver: the start's integer values are
+        fixed and the remaining problem is solved at the root.
+        """
+        self._mip_starts.append({var.index: float(v) for var, v in values.items()})
+
+    def _arrays(self):
+        """Dense (c, A_ub, b_ub, A_eq, b_eq) of the minimization problem"""
+        n = len(self._names)
+        c = np.zeros(n)
+        for i, coef in self._objective.terms.items():
+            c[i] = self._sign * coef
+
+        rows = {"<=": [], "==": []}
+        rhs = {"<=": [], "==": []}
+        for constraint in self._constraints:
+            row = np.zeros(n)
+            for i, coef in constraint.expr.terms.items():
+                row[i] = coef
+            rows[constraint.sense].append(row)
+            rhs[constraint.sense].append(-constraint.expr.constant)
+
+        def matrix(sense):
+            return np.array(rows[sense]).reshape(len(rows[sense]), n)
+
+        return (
+            c,
+            matrix("<="),
+            np.array(rhs["<="]),
+            matrix("=="),
+            np.array(rhs["=="]),
+        )
+
+    def solve(self, **kwargs):
+        """
+        Solve to within mip_gap or until time_limit; returns a Solution, or
+        None if infeasible or no incumbent was found in time
+        """
+        start = time.perf_counter()
+        c, a_ub, b_ub, a_eq, b_eq = self._arrays()
+        integer = np.flatnonzero(self._integer)
+        best_x, best = None, math.inf
+        # Lowest bound of the nodes pruned by the gap tolerance or left open
+        # because their relaxation hit the simplex iteration limit
+        pruned_bound = math.inf
+        unsolved = False
+        status = "integer optimal solution"
+        self.nodes = 0
+
+        def pruned(bound):
+            return best_x is not None and bound >= best - max(
+                self.absolute_gap, self.mip_gap * abs(best)
+            )
+
+        for start_values in self._mip_starts:
+            lb, ub = np.array(self._lb), np.array(self._ub)
+            for i, value in start_values.items():
+                if self._integer[i]:
+                    lb[i] = ub[i] = value
+            self.nodes += 1
+            completed = solve_lp(c, a_ub, b_ub, a_eq, b_eq, lb, ub)
+            if completed is None or completed is ITERATION_LIMIT:
+                continue
+            bound, x = completed
+            distance = np.abs(x[integer] - np.round(x[integer]))
+            if bound < best and (distance.size == 0 or distance.max() <= INTEGRALITY):
+                x[integer] = np.round(x[integer])
+                best_x, best = x, bound
+
+        # Nodes carry their parent's bound, so nodes made redundant by a later
+        # incumbent are dropped without solving their relaxation
+        stack = [(np.array(self._lb), np.array(self._ub), -math.inf)]
+        while stack:
+            if (
+                self.time_limit is not None
+                and time.perf_counter() - start > self.time_limit
+            ):
+                status = "time limit exceeded"
+                break
+            lb, ub, parent_bound = stack.pop()
+            if pruned(parent_bound):
+                pruned_bound = min(pruned_bound, parent_bound)
+                continue
+            self.nodes += 1
+            relaxation = solve_lp(c, a_ub, b_ub, a_eq, b_eq, lb, ub)
+            if relaxation is None:
+                continue
+            if relaxation is ITERATION_LIMIT:
+                pruned_bound = min(pruned_bound, parent_bound)
+                unsolved = True
+                continue
+            bound, x = relaxation
+            if pruned(bound):
+                pruned_bound = min(pruned_bound, bound)
+                continue
+
+            distance = np.abs(x[integer] - np.round(x[integer]))
+            if distance.size == 0 or distance.max() <= INTEGRALITY:
+                x[integer] = np.round(x[integer])
+                best_x, best = x, bound
+                continue
+
+            # Branch on the most fractional variable, rounding direction first
+            j = integer[np.argmax(distance)]
+            down_ub = ub.copy()
+            down_ub[j] = math.floor(x[j])
+            up_lb = lb.copy()
+            up_lb[j] = math.ceil(x[j])
+            down, up = (lb, down_ub, bound), (up_lb, ub, bound)
+            stack.extend([down, up] if x[j] - math.floor(x[j]) >= 0.5 else [up, down])
+
+        elapsed = time.perf_counter() - start
+        if unsolved and status == "integer optimal solution":
+            status = "iteration limit exceeded"
+        if best_x is None:
+            if status == "integer optimal solution":
+                status = "integer infeasible"
+            self.solve_details = SolveDetails(status, None, None, elapsed, self.nodes)
+            return None
+
+        lowest = min([best, pruned_bound] + [node[2] for node in stack])
+        objective = self._objective.constant + self._sign * best
+        # No finite bound when an open node was never solved (as the root)
+        bound, gap = None, None
+        if math.isfinite(lowest):
+            bound = self._objective.constant + self._sign * lowest
+            gap = abs(objective - bound) / (1e-10 + abs(objective))
+        self.solve_details = SolveDetails(status, gap, bound, elapsed, self.nodes)
+        return Solution(best_x, objective)
+
+
+def solve_lp(c, a_ub, b_ub, a_eq, b_eq, lb, ub):
+    """
+    min c.x subject to a_ub.x <= b_ub, a_eq.x == b_eq and lb <= x <= ub.
+
+    Fixed variables are substituted out, the others shifted to x - lb >= 0
+    with finite upper bounds added as rows. Returns (objective, x), None if
+    the problem is infeasible or unbounded, or ITERATION_LIMIT if the simplex
+    did not converge.
+    """
+    if np.any(ub < lb - TOLERANCE):
+        return None
+
+    free = ub > lb
+    fixed = ~free
+    x = np.where(fixed, lb, 0.0)
+
+    # Right-hand sides once fixed variables and lower bounds are accounted for
+    b_ub = b_ub - a_ub @ lb
+    b_eq = b_eq - a_eq @ lb
+    a_ub = a_ub[:, free]
+    a_eq = a_eq[:, free]
+    n = int(free.sum())
+
+    # Upper bounds implied by a nonnegative equality row (as sum_c x[v,c] == 1
+    # for binaries) need no row of their own
+    span = ub[free] - lb[free]
+    implied = np.full(n, np.inf)
+    for row, rhs in zip(a_eq, b_eq):
+        if rhs >= 0 and np.all(row >= 0):
+            positive = row > 0
+            implied[positive] = np.minimum(implied[positive], rhs / row[positive])
+    bounded = np.flatnonzero(np.isfinite(span) & (implied > span + TOLERANCE))
+    bound_rows = np.zeros((len(bounded), n))
+    bound_rows[np.arange(len(bounded)), bounded] = 1.0
+    a_ub = np.vstack([a_ub, bound_rows])
+    b_ub = np.concatenate([b_ub, span[bounded]])
+
+    y = _simplex(c[free], a_ub, b_ub, a_eq, b_eq)
+    if y is None or y is ITERATION_LIMIT:
+        return y
+    x[free] = lb[free] + y
+    return float(c @ x), x
+
+
+def _pivot(tableau, basis, row, column):
+    tableau[row] /= tableau[row, column]
+    factors = tableau[:, column].copy()
+    factors[row] = 0.0
+    tableau -= np.outer(factors, tableau[row])
+    basis[row] = column
+
+
+def _iterate(tableau, basis, columns, max_iterations=None):
+    """
+    Primal simplex on the first `columns` columns, minimizing the last row.
+    Dantzig's rule, falling back to Bland's rule against cycling. Returns
+    "optimal", "unbounded" or ITERATION_LIMIT after max_iterations pivots
+    (default growing with the tableau size).
+    """
+    m = len(basis)
+    if max_iterations is None:
+        max_iterations = max(10000, 50 * (m + columns))
+    for iteration in range(max_iterations):
+        reduced = tableau[-1, :columns]
+        if iteration < max_iterations // 2:
+            column = int(np.argmin(reduced))
+            if reduced[column] >= -TOLERANCE:
+                return "optimal"
+        else:
+            candidates = np.flatnonzero(reduced < -TOLERANCE)
+            if not candidates.size:
+                return "optimal"
+            column = int(candidates[0])
+
+        entries = tableau[:m, column]
+        positive = entries > TOLERANCE
+        if not positive.any():
+            return "unbounded"
+        ratios = np.full(m, np.inf)
+        ratios[positive] = tableau[:m, -1][positive] / entries[positive]
+        ties = np.flatnonzero(ratios <= ratios.min() + TOLERANCE)
+        row = int(ties[np.argmin(basis[ties])])
+        _pivot(tableau, basis, row, column)
+    return ITERATION_LIMIT
+
+
+def _simplex(c, a_ub, b_ub, a_eq, b_eq):
+    """
+    min c.y subject to a_ub.y <= b_ub, a_eq.y == b_eq, y >= 0, by the
+    two-phase tableau method. Returns y, None if infeasible or unbounded, or
+    ITERATION_LIMIT.
+    """
+    m_ub, n = a_ub.shape
+    m = m_ub + len(a_eq)
+    if m == 0:
+        return np.zeros(n) if np.all(c >= -TOLERANCE) else None
+
+    # Columns: y, one slack per <= row, one artificial per row
+    a = np.zeros((m, n + m_ub))
+    a[:m_ub, :n] = a_ub
+    a[:m_ub, n:] = np.eye(m_ub)
+    a[m_ub:, :n] = a_eq
+    b = np.concatenate([b_ub, b_eq])
+    negative = b < 0
+    a[negative] *= -1
+    b = np.abs(b)
+
+    # Rows whose slack can start in the basis need no artificial
+    basis = np.full(m, -1)
+    slack_rows = np.flatnonzero(~negative[:m_ub])
+    basis[slack_rows] = n + slack_rows
+    artificial_rows = np.flatnonzero(basis < 0)
+    k = len(artificial_rows)
+    columns = n + m_ub
+
+    tableau = np.zeros((m + 1, columns + k + 1))
+    tableau[:m, :columns] = a
+    tableau[artificial_rows, columns + np.arange(k)] = 1.0
+    tableau[:m, -1] = b
+    basis[artificial_rows] = columns + np.arange(k)
+
+    if k:
+        # Phase 1: minimize the sum of the artificial variables
+        tableau[-1] = -tableau[artificial_rows].sum(axis=0)
+        tableau[-1, columns : columns + k] = 0.0
+        if _iterate(tableau, basis, columns + k) is ITERATION_LIMIT:
+            return ITERATION_LIMIT
+        if -tableau[-1, -1] > 1e-7 * max(1.0, b.max()):
+            return None
+
+        # Drive remaining artificials out of the basis, dropping redundant rows
+        keep = np.ones(m, dtype=bool)
+        for row in np.flatnonzero(basis >= columns):
+            candidates = np.flatnonzero(np.abs(tableau[row, :columns]) > TOLERANCE)
+            if candidates.size:
+                _pivot(tableau, basis, row, int(candidates[0]))
+            else:
+                keep[row] = False
+        tableau = np.vstack([tableau[:m][keep], tableau[-1:]])
+        basis = basis[keep]
+        tableau = np.hstack([tableau[:, :columns], tableau[:, -1:]])
+
+    # Phase 2: reduced costs of the original objective in the current basis
+    cost = np.zeros(columns)
+    cost[:n] = c
+    tableau[-1, :columns] = cost - cost[basis] @ tableau[:-1, :columns]
+    tableau[-1, -1] = -cost[basis] @ tableau[:-1, -1]
+    outcome = _iterate(tableau, basis, columns)
+    if outcome != "optimal":
+        return None if outcome == "unbounded" else outcome
+
+    y = np.zeros(columns)
+    y[basis] = tableau[:-1, -1]
+    return y[:n]
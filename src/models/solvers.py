@@ -0,0 +1,53 @@
+import functools
+import importlib.util
+
+from src.models.numpy_solver import NumpyModel
+
+SOLVERS = ["docplex", "numpy"]
+
+
+@functools.lru_cache(maxsize=None)
+def default_solver():
+    """docplex when a CPLEX runtime is installed, the NumPy backend otherwise"""
+    if importlib.util.find_spec("docplex") and importlib.util.find_spec("cplex"):
+        return "docplex"
+    return "numpy"
+
+
+def new_model(name, solver=None, time_limit=None, mip_gap=None):
+    """
+    Empty MIP model for the given backend. Both backends take the same
+    modelling calls (variable dicts, sum, add_constraint, minimize, solve,
+    solution.get_value and solve_details); docplex is only imported when it
+    is used. time_limit (seconds) and mip_gap (relative) bound each solve;
+    on timeout solve() returns the best incumbent found, if any.
+    """
+    solver = solver or default_solver()
+    if solver == "docplex":
+        from docplex.mp.model import Model
+
+        model = Model(name)
+        if time_limit is not None:
+            model.parameters.timelimit = time_limit
+        if mip_gap is not None:
+            model.parameters.mip.tolerances.mipgap = mip_gap
+        return model
+    if solver == "numpy":
+        model = NumpyModel(name, time_limit=time_limit)
+        if mip_gap is not None:
+            model.mip_gap = mip_gap
+        return model
+    raise ValueError(f"Unknown solver {solver!r}, expected one of {SOLVERS}")
+
+
+def add_mip_start(model, values):
+    """
+    Give model a MIP start from a {var: value} assignment, on either backend.
+    Variables left out are completed by the solver.
+    """
+    if isinstance(model, NumpyModel):
+        model.add_mip_start(values)
+        return
+    from docplex.mp.solution import SolveSolution
+
+    model.add_mip_start(SolveSolution(model, values))
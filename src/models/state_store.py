@@ -0,0 +1,164 @@
+import logging
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot(NamedTuple):
+    """Private copy of the store's state and placements at version"""
+
+    version: int
+    state: object
+    placements: dict
+
+
+class Proposal(NamedTuple):
+    """Placement plan computed against the snapshot at version"""
+
+    version: int
+    placement_plan: dict
+    vm_demand: dict
+
+
+def propose(optimizer_class, snapshot, new_vms, vm_demand, **kwargs):
+    """
+    Run optimizer_class on a snapshot and return its Proposal, or None when
+    the optimizer finds no placement. A plain function of picklable
+    arguments, so it can run in a worker process.
+    """
+    optimizer = optimizer_class.from_state(
+        snapshot.state, snapshot.placements, new_vms, vm_demand, **kwargs
+    )
+    placement_plan = optimizer.optimize()[0]
+    if placement_plan is None:
+        return None
+    return Proposal(snapshot.version, placement_plan, vm_demand)
+
+
+class ClusterStateStore:
+    """
+    Versioned, thread-safe owner of a ClusterState and its VM placements.
+
+    Placers take a snapshot(), compute a plan against it without holding any
+    lock, and commit() it with compare-and-swap: if no other commit happened
+    since the snapshot the plan is applied as is; otherwise capacity is
+    re-checked against the current state and the plan is applied only if
+    every cluster stays within 100% and none of its VMs was placed
+    meanwhile. A rejected commit is a conflict; place() then retries from a
+    fresh snapshot. Every successful commit or release bumps the version.
+
+    Usage is updated from the demand deltas of each commit, so the store is
+    the single place where placements are counted.
+    """
+
+    def __init__(self, state, placements=None):
+        self._state = state.copy()
+        self._placements = dict(placements or {})
+        # Demand vectors of the VMs committed through the store, for releases
+        self._demand = {}
+        self._version = 0
+        self._lock = threading.Lock()
+        # Commits applied on an unchanged version, commits applied after a
+        # capacity re-check, rejected commits and retried proposals
+        self.commits = 0
+        self.merged = 0
+        self.conflicts = 0
+        self.retries = 0
+
+    @property
+    def version(self):
+        return self._version
+
+    def snapshot(self):
+        """Consistent copy of the state and placements with their version"""
+        with self._lock:
+            return Snapshot(self._version, self._state.copy(), dict(self._placements))
+
+    def commit(self, proposal):
+        """
+        Apply a Proposal with compare-and-swap; returns the new version, or
+        None on conflict
+        """
+        state = self._state
+        demands = state.demand_matrix(proposal.vm_demand, list(proposal.placement_plan))
+        rows = np.array(
+            [state.cluster_index[c] for c in proposal.placement_plan.values()],
+            dtype=np.int64,
+        ).reshape(-1)
+        added = np.zeros_like(state.usage)
+        np.add.at(added, rows, demands / state.capacity[rows])
+
+        with self._lock:
+            if proposal.version != self._version:
+                placed = any(vm in self._placements for vm in proposal.placement_plan)
+                if placed or np.any(state.usage + added > 1.0 + 1e-9):
+                    self.conflicts += 1
+                    logger.debug(
+                        "Commit at version %d rejected at version %d",
+                        proposal.version,
+                        self._version,
+                    )
+                    return None
+                self.merged += 1
+            else:
+                self.commits += 1
+            state.usage += added
+            for (vm, cluster), demand in zip(proposal.placement_plan.items(), demands):
+                self._placements[vm] = cluster
+                self._demand[vm] = demand
+            self._version += 1
+            return self._version
+
+    def release(self, vms):
+        """Remove VMs committed through the store; returns the released ones"""
+        released = []
+        with self._lock:
+            for vm in vms:
+                demand = self._demand.pop(vm, None)
+                if demand is None:
+                    continue
+                self._state.release(self._placements.pop(vm), demand)
+                released.append(vm)
+            if released:
+                self._version += 1
+        return released
+
+    def place(self, optimizer_class, new_vms, vm_demand, max_retries=10, **kwargs):
+        """
+        Propose and commit a placement of new_vms, retrying from a fresh
+        snapshot on conflict. Returns the committed {vm: cluster} plan, or
+        None if the optimizer found no placement or every retry conflicted.
+        """
+        for attempt in range(max_retries + 1):
+            if attempt:
+                with self._lock:
+                    self.retries += 1
+            proposal = propose(
+                optimizer_class, self.snapshot(), new_vms, vm_demand, **kwargs
+            )
+            if proposal is None:
+                return None
+            if self.commit(proposal) is not None:
+                return proposal.placement_plan
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Gave up placing %s after %d conflicting commits",
+                ", ".join(new_vms),
+                max_retries + 1,
+            )
+        return None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "version": self._version,
+                "placed_vms": len(self._placements),
+                "commits": self.commits,
+                "merged": self.merged,
+                "conflicts": self.conflicts,
+                "retries": self.retries,
+                "peak_utilization": self._state.peak_utilization(),
+            }
@@ -0,0 +1,307 @@
+"""
+Event-driven placement simulation with VM departures.
+
+Usage:
+    python -m src.services.event_simulation [--scenario balanced_clusters]
+        [--vms 1000000] [--arrival-rate 10] [--lifetime exponential 15]
+        [--optimizer MaxMinResidualOptimizer] [--seed 0]
+"""
+
+import argparse
+import heapq
+import json
+import logging
+import time
+
+import numpy as np
+
+from src.models.cluster_state import ClusterState
+from src.models.greedy_engine import GreedyPlacementEngine, peak_after
+from src.services.metrics import latency_summary
+from src.services.utils import configure_logging
+
+logger = logging.getLogger(__name__)
+
+ARRIVAL, DEPARTURE = 0, 1
+
+# Arrivals are drawn in chunks of this many VMs
+CHUNK_SIZE = 65536
+
+# Time series samples per run when no sample_interval is given
+DEFAULT_SAMPLES = 1000
+
+
+def placement_score(optimizer_class):
+    """
+    greedy_engine score function deciding single arrivals for optimizer_class:
+    its heuristic score, else the score of its MIP warm start, else
+    peak_after. For MinUtilizationOptimizer this is its single-VM closed form.
+    """
+    score = getattr(optimizer_class, "score", None)
+    if score is None:
+        score = getattr(optimizer_class, "warm_start_score", None)
+    return score or peak_after
+
+
+def lifetime_sampler(lifetime):
+    """
+    Function (rng, n) -> n lifetimes for a TestConfig.lifetime spec, or None
+    when VMs never depart
+    """
+    if lifetime is None:
+        return None
+    kind, *params = lifetime
+    if kind == "fixed":
+        (value,) = params
+        return lambda rng, n: np.full(n, float(value))
+    if kind == "exponential":
+        (mean,) = params
+        return lambda rng, n: rng.exponential(mean, n)
+    if kind == "lognormal":
+        # Parameterized by the mean lifetime rather than the log mean
+        mean, sigma = params
+        mu = np.log(mean) - sigma**2 / 2
+        return lambda rng, n: rng.lognormal(mu, sigma, n)
+    if kind == "uniform":
+        low, high = params
+        return lambda rng, n: rng.uniform(low, high, n)
+    raise ValueError(f"Unknown lifetime distribution {kind!r}")
+
+
+class EventDrivenSimulation:
+    """
+    Discrete-event simulation of VM arrivals and departures.
+
+    Events live on a heap ordered by simulated time. Only the next arrival
+    is on the heap at any time; placing a VM schedules its departure after a
+    lifetime drawn from config.lifetime, and the departure releases its
+    demand. Arrival times (Poisson at config.arrival_rate, else one per
+    second), demands and lifetimes are drawn in NumPy chunks.
+
+    Every arrival is decided by one GreedyPlacementEngine on a ClusterState
+    built once, scored like config.optimizer_model (see placement_score),
+    so no optimizer is constructed per event. A VM that fits nowhere is
+    rejected and the simulation goes on.
+
+    Utilization is averaged over simulated time after warmup seconds, and
+    sampled every sample_interval simulated seconds into samples.
+    """
+
+    def __init__(self, config, warmup=0.0, sample_interval=None):
+        self.config = config
+        self.clusters = config.clusters
+        self.state = ClusterState.from_dicts(
+            config.clusters, config.initial_usage, config.cluster_capacity
+        )
+        workload_seed, engine_seed = np.random.SeedSequence(config.seed).spawn(2)
+        self.rng = np.random.default_rng(workload_seed)
+        self.engine = GreedyPlacementEngine(
+            self.state,
+            score=placement_score(config.optimizer_model),
+            seed=np.random.default_rng(engine_seed),
+        )
+        self.lifetimes = lifetime_sampler(config.lifetime)
+        self.warmup = warmup
+        rate = config.arrival_rate or 1.0
+        self.sample_interval = sample_interval or (
+            config.num_vms / rate / DEFAULT_SAMPLES
+        )
+
+        self.now = 0.0
+        self.live = 0
+        self.max_live = 0
+        self.arrivals = 0
+        self.placed = 0
+        self.rejected = 0
+        self.departures = 0
+        self.events = 0
+        # Seconds per placement decision
+        self.decision_times = np.empty(config.num_vms, dtype=np.float64)
+        # Time integrals of usage, peak utilization and live VMs after warmup
+        self.usage_area = np.zeros_like(self.state.usage)
+        self.peak_area = 0.0
+        self.live_area = 0.0
+        self.max_peak = self.state.peak_utilization()
+        # (time, live VMs, peak utilization, mean utilization per resource)
+        self.samples = []
+        self.samples_taken = 0
+        self.total_time = 0.0
+
+    def generate_arrivals(self):
+        """Yield (arrival_time, demand vector, lifetime) for every VM"""
+        low, high = np.array(
+            [self.config.vm_demand_ranges[r] for r in self.state.resources]
+        ).T
+        model = self.config.vm_demand_model
+        if model is not None:
+            columns = [model.resources.index(r) for r in self.state.resources]
+        arrival_time = 0.0
+        remaining = self.config.num_vms
+        while remaining:
+            n = min(CHUNK_SIZE, remaining)
+            remaining -= n
+            if self.config.arrival_rate:
+                gaps = self.rng.exponential(1.0 / self.config.arrival_rate, n)
+            else:
+                gaps = np.ones(n)
+            gaps[0] += arrival_time
+            times = np.cumsum(gaps)
+            arrival_time = float(times[-1])
+            if model is not None:
+                demands = model.sample(self.rng, n)[:, columns]
+            else:
+                demands = self.rng.uniform(low, high, (n, len(low)))
+            lifetimes = (
+                self.lifetimes(self.rng, n).tolist()
+                if self.lifetimes is not None
+                else [None] * n
+            )
+            yield from zip(times.tolist(), demands, lifetimes)
+
+    def advance(self, t):
+        """Move the clock to t, integrating utilization over the interval"""
+        start = max(self.now, self.warmup)
+        if t > start:
+            dt = t - start
+            self.usage_area += dt * self.state.usage
+            self.peak_area += dt * self.state.usage.max()
+            self.live_area += dt * self.live
+        while self.samples_taken * self.sample_interval <= t:
+            usage = self.state.usage
+            self.samples.append(
+                (
+                    self.samples_taken * self.sample_interval,
+                    self.live,
+                    float(usage.max()),
+                    usage.mean(axis=0).tolist(),
+                )
+            )
+            self.samples_taken += 1
+        self.now = t
+
+    def run_simulation(self):
+        start_time = time.perf_counter()
+        arrivals = self.generate_arrivals()
+        heap = []
+        seq = 0
+
+        def schedule_arrival():
+            nonlocal seq
+            arrival = next(arrivals, None)
+            if arrival is not None:
+                heapq.heappush(heap, (arrival[0], seq, ARRIVAL, arrival))
+                seq += 1
+
+        schedule_arrival()
+        state, engine = self.state, self.engine
+        while heap:
+            t, _, kind, payload = heapq.heappop(heap)
+            self.advance(t)
+            self.events += 1
+
+            if kind == DEPARTURE:
+                cluster, demand = payload
+                state.release(cluster, demand)
+                self.live -= 1
+                self.departures += 1
+                continue
+
+            _, demand, lifetime = payload
+            decided = time.perf_counter()
+            i = engine.place(demand)
+            self.decision_times[self.arrivals] = time.perf_counter() - decided
+            self.arrivals += 1
+            schedule_arrival()
+
+            if i is None:
+                self.rejected += 1
+            else:
+                self.placed += 1
+                self.live += 1
+                self.max_live = max(self.max_live, self.live)
+                self.max_peak = max(self.max_peak, float(state.usage[i].max()))
+                if lifetime is not None:
+                    heapq.heappush(heap, (t + lifetime, seq, DEPARTURE, (i, demand)))
+                    seq += 1
+
+            # The run ends at the last arrival; VMs still live do not depart
+            if self.arrivals == self.config.num_vms:
+                break
+
+        self.total_time = time.perf_counter() - start_time
+        return self.summarize_results()
+
+    def summarize_results(self):
+        measured = self.now - self.warmup
+        mean_usage = (
+            self.usage_area / measured if measured > 0 else self.state.usage.copy()
+        )
+        return {
+            "total_time": self.total_time,
+            "simulated_time": self.now,
+            "events": self.events,
+            "events_per_second": (
+                self.events / self.total_time if self.total_time > 0 else 0
+            ),
+            "arrivals": self.arrivals,
+            "vms_placed": self.placed,
+            "rejected": self.rejected,
+            "departures": self.departures,
+            "acceptance_rate": self.placed / self.arrivals if self.arrivals else 0,
+            "live_vms": self.live,
+            "mean_live_vms": self.live_area / measured if measured > 0 else self.live,
+            "max_live_vms": self.max_live,
+            # Time-weighted over the simulated time after warmup
+            "mean_utilization": {
+                r: float(mean_usage[:, j].mean())
+                for j, r in enumerate(self.state.resources)
+            },
+            "mean_peak_utilization": (
+                self.peak_area / measured if measured > 0 else self.max_peak
+            ),
+            "max_peak_utilization": self.max_peak,
+            "latency": latency_summary(self.decision_times[: self.arrivals]),
+            "final_utilization": self.state.to_usage_dict(),
+        }
+
+
+def main():
+    from src.services.placement_service import OPTIMIZERS
+    from src.services.test_config import generate_test_scenarios
+
+    parser = argparse.ArgumentParser(description="Event-driven VM churn simulation")
+    parser.add_argument("--scenario", default="balanced_clusters")
+    parser.add_argument("--vms", type=int, default=1_000_000)
+    parser.add_argument("--arrival-rate", type=float, default=10.0)
+    parser.add_argument(
+        "--lifetime",
+        nargs="+",
+        default=["exponential", "15"],
+        help="Distribution and parameters, e.g. lognormal 30 1.0",
+    )
+    parser.add_argument("--optimizer", choices=OPTIMIZERS)
+    parser.add_argument("--warmup", type=float, default=0.0, help="Simulated seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-v", "--verbose", action="count", default=0)
+    args = parser.parse_args()
+    configure_logging(args.verbose)
+
+    scenarios = {s.name: s for s in generate_test_scenarios()}
+    if args.scenario not in scenarios:
+        parser.error(f"Unknown scenario {args.scenario!r}: {sorted(scenarios)}")
+    config = scenarios[args.scenario]
+    config.num_vms = args.vms
+    config.arrival_rate = args.arrival_rate
+    config.lifetime = (args.lifetime[0], *map(float, args.lifetime[1:]))
+    config.seed = args.seed
+    if args.optimizer:
+        config.optimizer_model = OPTIMIZERS[args.optimizer]
+
+    simulation = EventDrivenSimulation(config, warmup=args.warmup)
+    summary = simulation.run_simulation()
+    summary.pop("final_utilization")
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,37 @@
+import heapq
+import logging
+
 import numpy as np
 
+from src.models.base_optimizer import PHASES
+from src.models.cluster_state import ClusterState
+
+logger = logging.getLogger(__name__)
+
+RESOURCE_WEIGHTS = {"cpu": 0.4, "mem": 0.4, "disk": 0.2}
+LATENCY_PERCENTILES = [50, 90, 99]
+
+
+def latency_summary(execution_times):
+    """Count, mean, percentiles and max of a series of solve times"""
+    times = np.asarray(execution_times, dtype=np.float64)
+    if not times.size:
+        return None
+    summary = {"count": int(times.size), "mean": float(times.mean())}
+    for q, value in zip(LATENCY_PERCENTILES, np.percentile(times, LATENCY_PERCENTILES)):
+        summary[f"p{q}"] = float(value)
+    summary["max"] = float(times.max())
+    return summary
+
 
 class ResourceMetrics:
+    __slots__ = (
+        "max_utilization",
+        "avg_utilization",
+        "std_dev",
+        "cluster_distribution",
+    )
+
     def __init__(self):
         self.max_utilization = 0.0
         self.avg_utilization = 0.0
@@ -17,6 +47,18 @@ class ResourceMetrics:
 
 
 class PlacementMetrics:
+    __slots__ = (
+        "resources",
+        "execution_time",
+        "successful",
+        "overall_imbalance",
+        "resource_weights",
+        "mip_gap",
+        "hit_limit",
+        "latency",
+        "phase_times",
+    )
+
     def __init__(self):
         self.resources = {
             "cpu": ResourceMetrics(),
@@ -26,11 +68,16 @@ class PlacementMetrics:
         self.execution_time = 0.0
         self.successful = False
         self.overall_imbalance = 0.0
-        self.resource_weights = {
-            "cpu": 0.4,
-            "mem": 0.4,
-            "disk": 0.2,
-        }  # Customizable weights
+        # Customizable weights; shared by default, assign a new dict to change
+        self.resource_weights = RESOURCE_WEIGHTS
+        # Relative MIP gap of the step's placement (None without a MIP) and
+        # whether its solve stopped at the time limit
+        self.mip_gap = None
+        self.hit_limit = False
+        # latency_summary of the solve times up to this step, when computed
+        self.latency = None
+        # Seconds of the step's solve spent in each optimizer phase (PHASES)
+        self.phase_times = dict.fromkeys(PHASES, 0.0)
 
     def to_dict(self):
         """Convert metrics to dictionary format for JSON serialization"""
@@ -38,6 +85,10 @@ class PlacementMetrics:
             "execution_time": self.execution_time,
             "successful": self.successful,
             "overall_imbalance": self.overall_imbalance,
+            "mip_gap": self.mip_gap,
+            "hit_limit": self.hit_limit,
+            "latency": self.latency,
+            "phase_times": self.phase_times,
             "resources": {},
             "overall_metrics": {
                 "avg_utilization": np.mean(
@@ -62,9 +113,16 @@ class PlacementMetrics:
         return metrics_dict
 
     def calculate_metrics(self, cluster_utilization, execution_time):
-        """Calculate all metrics based on current state"""
+        """
+        Calculate all metrics based on current state, given either as a
+        {cluster: {resource: utilization}} dict or as a ClusterState
+        """
+        if isinstance(cluster_utilization, ClusterState):
+            self._calculate_state_metrics(cluster_utilization, execution_time)
+            return
+
         if not cluster_utilization:
-            print("Warning: Empty cluster utilization data")
+            logger.warning("Empty cluster utilization data")
             return
 
         self.successful = True
@@ -89,9 +147,34 @@ class PlacementMetrics:
             # Calculate overall imbalance score
             self.overall_imbalance = self._calculate_weighted_imbalance()
         except Exception as e:
-            print(f"Error calculating metrics: {e}")
+            logger.error("Error calculating metrics: %s", e)
             self.successful = False
 
+    def _calculate_state_metrics(self, state, execution_time):
+        """Array version of calculate_metrics for a ClusterState"""
+        if not state.clusters:
+            logger.warning("Empty cluster utilization data")
+            return
+
+        self.successful = True
+        self.execution_time = execution_time
+
+        max_utilization = state.usage.max(axis=0)
+        avg_utilization = state.usage.mean(axis=0)
+        std_dev = state.usage.std(axis=0)
+
+        for resource in self.resources.keys():
+            j = state.resource_index[resource]
+            metrics = self.resources[resource]
+            metrics.max_utilization = float(max_utilization[j])
+            metrics.avg_utilization = float(avg_utilization[j])
+            metrics.std_dev = float(std_dev[j])
+            metrics.cluster_distribution = dict(
+                zip(state.clusters, state.usage[:, j].tolist())
+            )
+
+        self.overall_imbalance = self._calculate_weighted_imbalance()
+
     def _calculate_weighted_imbalance(self):
         """
         Calculates a weighted imbalance score considering all resources.
@@ -136,3 +219,207 @@ class PlacementMetrics:
             output.append(f"{resource.upper()}: {metrics}")
 
         return "\n".join(output)
+
+
+class IncrementalMetricsTracker:
+    """
+    Incrementally maintained placement metrics.
+
+    Keeps running sums and sums of squares per resource plus a max-heap per
+    resource (with lazy deletion of stale entries), so a usage change on one
+    cluster costs O(resources * log clusters) instead of a pass over every
+    cluster. The sums are recomputed whenever a heap is compacted, which
+    bounds their rounding drift, and the variance is clamped at 0. record()
+    appends the current max/avg/std/imbalance to preallocated history arrays,
+    which double in size when full.
+
+    The metrics match PlacementMetrics.calculate_metrics (population standard
+    deviation, same weighted imbalance) up to floating point rounding.
+    """
+
+    def __init__(
+        self,
+        clusters,
+        initial_usage,
+        resources=None,
+        resource_weights=None,
+        capacity=1024,
+        keep_usage=False,
+    ):
+        self.clusters = list(clusters)
+        self.resources = list(resources or RESOURCE_WEIGHTS)
+        self.cluster_index = {c: i for i, c in enumerate(self.clusters)}
+        weights = resource_weights or RESOURCE_WEIGHTS
+        self.weights = np.array([weights[r] for r in self.resources])
+
+        self.usage = np.array(
+            [[initial_usage[c][r] for r in self.resources] for c in self.clusters],
+            dtype=np.float64,
+        ).reshape(len(self.clusters), len(self.resources))
+        self.sum = np.zeros(len(self.resources))
+        self.sum_sq = np.zeros(len(self.resources))
+        self.version = np.zeros(self.usage.shape, dtype=np.int64)
+        self._heaps = [None] * len(self.resources)
+        for j in range(len(self.resources)):
+            self._rebuild_heap(j)
+
+        # One structured array holds every step; usage snapshots are only
+        # kept when per-step cluster distributions are needed
+        shape = (len(self.resources),)
+        fields = [
+            ("execution_time", np.float64),
+            ("overall_imbalance", np.float64),
+            ("mip_gap", np.float64),
+            ("hit_limit", np.bool_),
+            ("phase_times", np.float64, (len(PHASES),)),
+            ("max_utilization", np.float64, shape),
+            ("avg_utilization", np.float64, shape),
+            ("std_dev", np.float64, shape),
+        ]
+        self.keep_usage = keep_usage
+        if keep_usage:
+            fields.append(("usage", np.float64, self.usage.shape))
+        self.steps = 0
+        self._history = np.zeros(capacity, dtype=fields)
+
+    def _rebuild_heap(self, j):
+        # The running sums drift as deltas accumulate (sum_sq / n - avg**2
+        # cancels badly): recompute them with the heap
+        self.sum[j] = self.usage[:, j].sum()
+        self.sum_sq[j] = (self.usage[:, j] ** 2).sum()
+        heap = [(-u, 0, i) for i, u in enumerate(self.usage[:, j].tolist())]
+        self.version[:, j] = 0
+        heapq.heapify(heap)
+        self._heaps[j] = heap
+
+    def set_usage(self, cluster, usage):
+        """Set the utilization vector of one cluster, given by name or index"""
+        i = self.cluster_index.get(cluster, cluster)
+        usage = np.asarray(usage, dtype=np.float64)
+        old = self.usage[i]
+        self.sum += usage - old
+        self.sum_sq += usage**2 - old**2
+        self.usage[i] = usage
+        self.version[i] += 1
+
+        for j, value in enumerate(usage.tolist()):
+            heap = self._heaps[j]
+            heapq.heappush(heap, (-value, int(self.version[i, j]), i))
+            # Stale entries are dropped lazily; compact when they dominate
+            if len(heap) > 4 * len(self.clusters) + 64:
+                self._rebuild_heap(j)
+
+    def add_usage(self, cluster, delta):
+        """Add a utilization delta vector to one cluster"""
+        i = self.cluster_index.get(cluster, cluster)
+        self.set_usage(i, self.usage[i] + delta)
+
+    def current_max(self):
+        """Maximum utilization per resource"""
+        peaks = np.empty(len(self.resources))
+        for j, heap in enumerate(self._heaps):
+            while heap[0][1] != self.version[heap[0][2], j]:
+                heapq.heappop(heap)
+            peaks[j] = -heap[0][0]
+        return peaks
+
+    def record(
+        self, execution_time=0.0, mip_gap=None, hit_limit=False, phase_times=None
+    ):
+        """
+        Append the current metrics to the history, return the step index.
+        phase_times is {phase: nanoseconds} of the step's solve, as in
+        BaseVMOptimizer.phase_times.
+        """
+        if self.steps == len(self._history):
+            grown = np.zeros(2 * len(self._history), dtype=self._history.dtype)
+            grown[: self.steps] = self._history
+            self._history = grown
+
+        n = len(self.clusters)
+        peaks = self.current_max()
+        avg = self.sum / n
+        std = np.sqrt(np.maximum(self.sum_sq / n - avg**2, 0.0))
+
+        row = self._history[self.steps]
+        row["execution_time"] = execution_time
+        row["overall_imbalance"] = float(self.weights @ (std + peaks - avg))
+        row["mip_gap"] = np.nan if mip_gap is None else mip_gap
+        row["hit_limit"] = hit_limit
+        phase_times = phase_times or {}
+        row["phase_times"] = [phase_times.get(p, 0) * 1e-9 for p in PHASES]
+        row["max_utilization"] = peaks
+        row["avg_utilization"] = avg
+        row["std_dev"] = std
+        if self.keep_usage:
+            row["usage"] = self.usage
+        self.steps += 1
+        return self.steps - 1
+
+    @property
+    def history(self):
+        """Structured array of the recorded steps (a view, one row per step)"""
+        return self._history[: self.steps]
+
+    def metrics(self, step=-1, latency=False):
+        """
+        PlacementMetrics of a recorded step. Without keep_usage,
+        cluster_distribution is taken from the current usage, so it is exact
+        for the latest step only. With latency, the distribution of the solve
+        times up to the step is included (one pass over the history).
+        """
+        step = range(self.steps)[step]
+        row = self._history[step]
+        usage = row["usage"] if self.keep_usage else self.usage
+        metrics = PlacementMetrics()
+        metrics.successful = True
+        metrics.execution_time = float(row["execution_time"])
+        metrics.overall_imbalance = float(row["overall_imbalance"])
+        if not np.isnan(row["mip_gap"]):
+            metrics.mip_gap = float(row["mip_gap"])
+        metrics.hit_limit = bool(row["hit_limit"])
+        metrics.phase_times = dict(zip(PHASES, row["phase_times"].tolist()))
+        if latency:
+            metrics.latency = latency_summary(
+                self._history["execution_time"][: step + 1]
+            )
+        for j, resource in enumerate(self.resources):
+            resource_metrics = metrics.resources[resource]
+            resource_metrics.max_utilization = float(row["max_utilization"][j])
+            resource_metrics.avg_utilization = float(row["avg_utilization"][j])
+            resource_metrics.std_dev = float(row["std_dev"][j])
+            resource_metrics.cluster_distribution = dict(
+                zip(self.clusters, usage[:, j].tolist())
+            )
+        return metrics
+
+
+class MetricsHistory:
+    """
+    Read-only sequence of the steps recorded by an IncrementalMetricsTracker.
+    Items are PlacementMetrics built on access from the tracker's structured
+    array, so the history costs one array row per step instead of a tree of
+    Python objects.
+    """
+
+    __slots__ = ("tracker",)
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+
+    def __len__(self):
+        return self.tracker.steps
+
+    def __getitem__(self, step):
+        if isinstance(step, slice):
+            return [self.tracker.metrics(k) for k in range(len(self))[step]]
+        return self.tracker.metrics(step)
+
+    def __iter__(self):
+        for step in range(len(self)):
+            yield self.tracker.metrics(step)
+
+    def to_dicts(self):
+        """Lazily yield PlacementMetrics.to_dict() of every step"""
+        for metrics in self:
+            yield metrics.to_dict()
@@ -1,3 +1,4 @@
+import logging
 import time
 
 import matplotlib.pyplot as plt
@@ -6,6 +7,8 @@ import numpy as np
 from src.models.baseline_optimizer import BaselineOptimizer  # noqa
 from src.models.min_max_optimizer import MinUtilizationOptimizer
 
+logger = logging.getLogger(__name__)
+
 
 def measure_time(func):
     def wrapper(*args, **kwargs):
@@ -13,7 +16,9 @@ def measure_time(func):
         result = func(*args, **kwargs)
         end_time = time.time()
         execution_time = end_time - start_time
-        print(f"Function '{func.__name__}' executed in {execution_time:.4f} seconds")
+        logger.info(
+            "Function '%s' executed in %.4f seconds", func.__name__, execution_time
+        )
         return result
 
     return wrapper
@@ -136,6 +141,7 @@ def optimize_vm_placement(
     cluster_capacity,
     vm_demand,
     optimizer_class=MinUtilizationOptimizer,
+    solver=None,
 ):
     """
     Optimize VM placement using the specified optimizer
@@ -147,6 +153,7 @@ def optimize_vm_placement(
         current_usage,
         cluster_capacity,
         vm_demand,
+        solver=solver,
     )
     return optimizer.optimize()
 
@@ -239,4 +246,7 @@ def main():
 
 
 if __name__ == "__main__":
+    from src.services.utils import configure_logging
+
+    configure_logging(1)
     main()
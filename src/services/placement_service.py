@@ -0,0 +1,490 @@
+"""
+Online placement service: live cluster state behind an asyncio request
+queue, with concurrent requests coalesced into micro-batches.
+
+Clients talk JSON lines over a local TCP socket (one request object per
+line, one response per line, matched by the optional "id" echoed back):
+
+    {"id": 1, "op": "place", "vms": {"vm7": {"cpu": 5, "mem": 10, "disk": 8}}}
+    {"id": 1, "placement": {"vm7": "c2"}, "utilization": {...},
+     "batch_size": 3, "latency": 0.0042}
+    {"id": 2, "op": "release", "vms": ["vm7"]}
+    {"id": 3, "op": "stats"}
+
+Usage:
+    python -m src.services.placement_service [--port 8765]
+        [--optimizer MinUtilizationOptimizer] [--scenario balanced_clusters]
+        [--max-batch 64] [--max-wait 0]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import math
+import numbers
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.models.bin_packing_optimizer import (
+    BestFitOptimizer,
+    DotProductOptimizer,
+    FirstFitDecreasingOptimizer,
+    MaxMinResidualOptimizer,
+)
+from src.models.cluster_state import ClusterState
+from src.models.local_search_optimizer import LocalSearchOptimizer
+from src.models.min_max_optimizer import MinUtilizationOptimizer
+from src.models.min_max_per_cluster_optimizer import MinMaxPerClusterOptimizer
+from src.models.solvers import SOLVERS
+from src.services.metrics import latency_summary
+from src.services.test_config import generate_test_scenarios
+from src.services.utils import configure_logging
+
+logger = logging.getLogger(__name__)
+
+OPTIMIZERS = {
+    cls.__name__: cls
+    for cls in [
+        MinUtilizationOptimizer,
+        MinMaxPerClusterOptimizer,
+        LocalSearchOptimizer,
+        FirstFitDecreasingOptimizer,
+        BestFitOptimizer,
+        DotProductOptimizer,
+        MaxMinResidualOptimizer,
+    ]
+}
+
+
+class PlacementError(Exception):
+    """A placement request that was rejected or could not be placed"""
+
+
+def valid_units(value):
+    """Whether value is a finite, non-negative number of resource units"""
+    return (
+        isinstance(value, numbers.Real)
+        and not isinstance(value, bool)
+        and math.isfinite(value)
+        and value >= 0
+    )
+
+
+class PlacementRequest:
+    __slots__ = ("vm_demand", "future", "received")
+
+    def __init__(self, vm_demand, future):
+        self.vm_demand = vm_demand
+        self.future = future
+        self.received = time.perf_counter()
+
+
+class PlacementService:
+    """
+    Holds the live ClusterState and the placements made through it, and
+    places the VMs of queued requests with optimizer_class.
+
+    The batching loop takes the first queued request, then keeps taking
+    requests until max_batch VMs are collected or max_wait seconds have
+    passed, and solves them as one model on a worker thread, so the event
+    loop keeps accepting requests meanwhile; requests arriving during a
+    solve form the next batch. With max_wait=0 (the default) a batch is only
+    what queued up during the previous solve, so a lone request is never
+    delayed. max_batch=1 places every request alone. When
+    a batch has no feasible placement its requests are retried one by one,
+    so only the requests that do not fit fail.
+
+    Solves see a snapshot of the state; releases are applied to the live
+    state at once and placements are added to it as demand deltas, so a
+    release during a solve only makes that solve conservative.
+    """
+
+    def __init__(
+        self,
+        clusters,
+        current_usage,
+        cluster_capacity,
+        existing_placements=None,
+        optimizer_class=MinUtilizationOptimizer,
+        max_batch=64,
+        max_wait=0.0,
+        seed=None,
+        solver=None,
+        time_limit=None,
+        mip_gap=None,
+    ):
+        self.state = ClusterState.from_dicts(clusters, current_usage, cluster_capacity)
+        self.existing_placements = dict(existing_placements or {})
+        # Demand vectors of the VMs placed through the service, for releases
+        self.placed_demand = {}
+        self.optimizer_class = optimizer_class
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.rng = np.random.default_rng(seed)
+        self.solver = solver
+        self.time_limit = time_limit
+        self.mip_gap = mip_gap
+
+        self.queue = None
+        self.executor = None
+        self.batcher = None
+        # VM names queued or being solved, to reject duplicate requests
+        self.pending = set()
+        # Seconds from receipt to response of every answered place request,
+        # and the number of requests of every solved batch
+        self.latencies = []
+        self.batch_sizes = []
+        self.failures = 0
+
+    async def start(self):
+        """Start the batching loop on the running event loop"""
+        self.queue = asyncio.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.batcher = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stop the batching loop; requests still queued are cancelled"""
+        self.batcher.cancel()
+        try:
+            await self.batcher
+        except asyncio.CancelledError:
+            pass
+        while not self.queue.empty():
+            self.queue.get_nowait().future.cancel()
+        self.executor.shutdown(wait=True)
+
+    async def place(self, vm_demand):
+        """
+        Queue the VMs of vm_demand ({vm: {resource: units}}) for placement
+        and wait for the result: ({vm: cluster}, {cluster: {resource:
+        utilization}} after the batch, number of requests in the batch).
+        Raises PlacementError if the request is invalid or does not fit.
+        """
+        if not vm_demand:
+            raise PlacementError("No VMs to place")
+        for vm, demand in vm_demand.items():
+            if vm in self.existing_placements or vm in self.pending:
+                raise PlacementError(f"VM {vm} is already placed or pending")
+            if not isinstance(demand, dict):
+                raise PlacementError(
+                    f"VM {vm} has no demand for {self.state.resources}"
+                )
+            missing = [r for r in self.state.resources if r not in demand]
+            if missing:
+                raise PlacementError(f"VM {vm} has no demand for {missing}")
+            invalid = [r for r in self.state.resources if not valid_units(demand[r])]
+            if invalid:
+                raise PlacementError(
+                    f"VM {vm} demand for {invalid} is not a finite, non-negative number"
+                )
+        self.pending.update(vm_demand)
+
+        request = PlacementRequest(
+            vm_demand, asyncio.get_running_loop().create_future()
+        )
+        await self.queue.put(request)
+        try:
+            return await request.future
+        finally:
+            self.pending.difference_update(vm_demand)
+            self.latencies.append(time.perf_counter() - request.received)
+
+    def release(self, vms):
+        """Remove VMs placed through the service; returns the released ones"""
+        released = []
+        for vm in vms:
+            demand = self.placed_demand.pop(vm, None)
+            if demand is None:
+                continue
+            self.state.release(self.existing_placements.pop(vm), demand)
+            released.append(vm)
+        return released
+
+    def stats(self):
+        """Request counts, batch sizes, latency percentiles and peak utilization"""
+        return {
+            "requests": len(self.latencies),
+            "failures": self.failures,
+            "batches": len(self.batch_sizes),
+            "mean_batch_size": (
+                float(np.mean(self.batch_sizes)) if self.batch_sizes else None
+            ),
+            "latency": latency_summary(self.latencies),
+            "placed_vms": len(self.existing_placements),
+            "peak_utilization": self.state.peak_utilization(),
+        }
+
+    async def run(self):
+        """Batching loop: collect a micro-batch, solve it, answer its requests"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self.next_batch()
+            self.batch_sizes.append(len(batch))
+            try:
+                results = await loop.run_in_executor(
+                    self.executor,
+                    self.solve_batch,
+                    batch,
+                    self.state.copy(),
+                    dict(self.existing_placements),
+                )
+            except Exception as e:
+                logger.exception("Placement batch failed")
+                results = [PlacementError(str(e)) for _ in batch]
+
+            for request, result in zip(batch, results):
+                if request.future.done():
+                    continue
+                if isinstance(result, Exception):
+                    self.failures += 1
+                    request.future.set_exception(result)
+                    continue
+                for vm, cluster in result.items():
+                    demand = self.state.demand_vector(request.vm_demand[vm])
+                    self.state.place(cluster, demand)
+                    self.placed_demand[vm] = demand
+                    self.existing_placements[vm] = cluster
+            utilization = self.state.to_usage_dict()
+            for request, result in zip(batch, results):
+                if not request.future.done():
+                    request.future.set_result((result, utilization, len(batch)))
+
+    async def next_batch(self):
+        """First queued request and those following it within max_wait"""
+        batch = [await self.queue.get()]
+        size = len(batch[0].vm_demand)
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch:
+            if self.queue.empty():
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                request = self.queue.get_nowait()
+            batch.append(request)
+            size += len(request.vm_demand)
+        return batch
+
+    def solve_batch(self, batch, state, existing):
+        """
+        Placement plan per request (or a PlacementError), solving the whole
+        batch at once and falling back to one request at a time. Runs on the
+        worker thread against state and existing, snapshots of the live state.
+        """
+        if len(batch) > 1:
+            vm_demand = {}
+            for request in batch:
+                vm_demand.update(request.vm_demand)
+            plan = self.solve(state, existing, vm_demand)
+            if plan is not None:
+                return [{vm: plan[vm] for vm in r.vm_demand} for r in batch]
+            logger.info(
+                "No feasible placement for a batch of %d requests, "
+                "placing them one by one",
+                len(batch),
+            )
+
+        results = []
+        for request in batch:
+            plan = self.solve(state, existing, request.vm_demand)
+            if plan is None:
+                results.append(PlacementError("No feasible placement"))
+                continue
+            for vm, cluster in plan.items():
+                state.place(cluster, state.demand_vector(request.vm_demand[vm]))
+                existing[vm] = cluster
+            results.append(plan)
+        return results
+
+    def solve(self, state, existing_placements, vm_demand):
+        """{vm: cluster} for vm_demand on state, or None if infeasible"""
+        optimizer = self.optimizer_class.from_state(
+            state,
+            existing_placements,
+            list(vm_demand),
+            vm_demand,
+            seed=self.rng,
+            solver=self.solver,
+            time_limit=self.time_limit,
+            mip_gap=self.mip_gap,
+        )
+        return optimizer.optimize()[0]
+
+    async def handle(self, message):
+        """Response object for one decoded request object"""
+        op = message.get("op", "place")
+        if op == "place":
+            try:
+                placement, utilization, batch_size = await self.place(
+                    message.get("vms") or {}
+                )
+            except PlacementError as e:
+                return {"error": str(e)}
+            return {
+                "placement": placement,
+                "utilization": utilization,
+                "batch_size": batch_size,
+            }
+        if op == "release":
+            return {"released": self.release(message.get("vms") or [])}
+        if op == "stats":
+            return self.stats()
+        return {"error": f"Unknown op {op!r}"}
+
+    async def serve_connection(self, reader, writer):
+        """Answer the JSON-line requests of one client, concurrently"""
+        tasks = set()
+
+        async def respond(line):
+            received = time.perf_counter()
+            try:
+                message = json.loads(line)
+                response = await self.handle(message)
+            except (ValueError, AttributeError) as e:
+                message, response = {}, {"error": f"Bad request: {e}"}
+            if "id" in message:
+                response["id"] = message["id"]
+            response.setdefault("latency", time.perf_counter() - received)
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        """Start the batching loop and a JSON-lines server; returns the server"""
+        await self.start()
+        return await asyncio.start_server(self.serve_connection, host, port)
+
+
+class PlacementClient:
+    """
+    Client for the JSON-lines protocol over one connection; requests may be
+    issued concurrently and are matched to responses by id.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.ids = itertools.count()
+        self.waiting = {}
+        self.receiver = asyncio.create_task(self.receive())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def receive(self):
+        while line := await self.reader.readline():
+            response = json.loads(line)
+            future = self.waiting.pop(response.pop("id"), None)
+            if future is not None and not future.done():
+                future.set_result(response)
+        for future in self.waiting.values():
+            future.set_exception(ConnectionError("Connection closed"))
+
+    async def request(self, message):
+        """Send one request object and wait for its response object"""
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[request_id] = future
+        self.writer.write(json.dumps({**message, "id": request_id}).encode() + b"\n")
+        await self.writer.drain()
+        return await future
+
+    async def place(self, vm_demand):
+        return await self.request({"op": "place", "vms": vm_demand})
+
+    async def release(self, vms):
+        return await self.request({"op": "release", "vms": list(vms)})
+
+    async def stats(self):
+        return await self.request({"op": "stats"})
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        self.receiver.cancel()
+
+
+async def serve_forever(service, host, port):
+    server = await service.serve(host, port)
+    logger.warning(
+        "Placement service (%s) listening on %s:%d",
+        service.optimizer_class.__name__,
+        host,
+        port,
+    )
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+        print(json.dumps(service.stats(), indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Online VM placement service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--optimizer", choices=OPTIMIZERS, default="MinUtilizationOptimizer"
+    )
+    parser.add_argument(
+        "--scenario",
+        default="balanced_clusters",
+        help="Test scenario whose clusters, capacity and usage start the state",
+    )
+    parser.add_argument("--max-batch", type=int, default=64, help="VMs per batch")
+    parser.add_argument(
+        "--max-wait", type=float, default=0.0, help="Milliseconds to fill a batch"
+    )
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--solver", choices=SOLVERS)
+    parser.add_argument("--time-limit", type=float, help="Seconds per solve")
+    parser.add_argument("--mip-gap", type=float, help="Relative MIP gap per solve")
+    parser.add_argument("-v", "--verbose", action="count", default=0)
+    args = parser.parse_args()
+    configure_logging(args.verbose)
+
+    scenarios = {s.name: s for s in generate_test_scenarios()}
+    if args.scenario not in scenarios:
+        parser.error(f"Unknown scenario {args.scenario!r}: {sorted(scenarios)}")
+    scenario = scenarios[args.scenario]
+    service = PlacementService(
+        scenario.clusters,
+        scenario.initial_usage,
+        scenario.cluster_capacity,
+        optimizer_class=OPTIMIZERS[args.optimizer],
+        max_batch=args.max_batch,
+        max_wait=args.max_wait / 1000.0,
+        seed=args.seed,
+        solver=args.solver,
+        time_limit=args.time_limit,
+        mip_gap=args.mip_gap,
+    )
+    try:
+        asyncio.run(serve_forever(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
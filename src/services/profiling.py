@@ -0,0 +1,117 @@
+"""
+Optional per-placement profiling of a simulation: cProfile and tracemalloc
+capture around each optimize() call.
+"""
+
+import cProfile
+import os
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+
+from src.services.metrics import latency_summary
+
+PROFILERS = ["cprofile", "tracemalloc"]
+
+
+class PlacementProfiler:
+    """
+    Captures placements with cProfile and/or tracemalloc (kinds, a subset of
+    PROFILERS).
+
+    cProfile statistics are accumulated over all placements (see top) and,
+    given a directory, dumped per placement as step<k>.prof for pstats or
+    snakeviz. tracemalloc records the peak Python memory of every placement
+    above what was allocated before it; memory allocated inside CPLEX is not
+    seen. Both slow the placements down, so their solve times are not
+    comparable with unprofiled runs.
+
+    tracemalloc tracing already started by the caller is reused, with its
+    peak reset per placement. Python 3.8 cannot reset the peak without
+    discarding the caller's traces, so there capture() raises RuntimeError
+    if tracing is already on; the profiler then traces each placement on
+    its own.
+    """
+
+    def __init__(self, kinds, directory=None):
+        unknown = set(kinds) - set(PROFILERS)
+        if unknown:
+            raise ValueError(f"Unknown profilers {sorted(unknown)}: use {PROFILERS}")
+        self.cprofile = "cprofile" in kinds
+        self.tracemalloc = "tracemalloc" in kinds
+        self.directory = directory
+        if directory is not None and self.cprofile:
+            os.makedirs(directory, exist_ok=True)
+        self.placements = 0
+        # pstats.Stats of every placement so far (None before the first)
+        self.stats = None
+        # Peak bytes of each placement
+        self.peak_memory = []
+
+    @contextmanager
+    def capture(self):
+        """Profile the block as the next placement"""
+        profile = cProfile.Profile() if self.cprofile else None
+        started = False
+        if self.tracemalloc:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started = True
+            elif hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            else:
+                raise RuntimeError(
+                    "tracemalloc is already tracing and this Python cannot "
+                    "reset its peak (3.9+): stop it before profiling"
+                )
+            allocated = tracemalloc.get_traced_memory()[0]
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                if self.directory is not None:
+                    profile.dump_stats(
+                        os.path.join(self.directory, f"step{self.placements}.prof")
+                    )
+                if self.stats is None:
+                    self.stats = pstats.Stats(profile)
+                else:
+                    self.stats.add(profile)
+            if self.tracemalloc:
+                self.peak_memory.append(tracemalloc.get_traced_memory()[1] - allocated)
+                if started:
+                    tracemalloc.stop()
+            self.placements += 1
+
+    def top(self, n=10, sort="cumulative"):
+        """
+        [{function, calls, total, cumulative}] of the n functions with the
+        most sort time over all placements, in seconds
+        """
+        if self.stats is None:
+            return []
+        self.stats.sort_stats(sort)
+        rows = []
+        for func in self.stats.fcn_list[:n]:
+            _, calls, total, cumulative, _ = self.stats.stats[func]
+            rows.append(
+                {
+                    "function": pstats.func_std_string(func),
+                    "calls": calls,
+                    "total": total,
+                    "cumulative": cumulative,
+                }
+            )
+        return rows
+
+    def summary(self, n=10):
+        """Placements profiled, peak memory distribution (bytes), top functions"""
+        return {
+            "placements": self.placements,
+            "peak_memory": latency_summary(self.peak_memory),
+            "top_functions": self.top(n),
+            "directory": self.directory,
+        }
@@ -1,4 +1,5 @@
 # real_time_viz.py
+import logging
 import time
 import tkinter as tk
 from tkinter import ttk
@@ -7,8 +8,7 @@ import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-from src.services.metrics import PlacementMetrics
-from src.services.optimization import optimize_vm_placement
+logger = logging.getLogger(__name__)
 
 
 class RealTimeVisualization:
@@ -139,93 +139,44 @@ class RealTimeVisualization:
         self.canvas.draw()
         self.root.update()
 
-
-def run_visualization(simulation):
-    is_last = (
-        simulation.config.name == "unbalanced_initial_min_max_per_cluster"
-    )  # Or use another way to identify the last scenario
-    viz = RealTimeVisualization(simulation.config, is_last=is_last)
-    overall_start_time = time.time()
-    execution_times = []
+    def finish(self, failed=False):
+        """Enable the continue button and wait for the user to close the window"""
+        if not self.root:
+            return
+        self.continue_button.config(state="normal")
+        if failed:
+            self.progress_label.config(text="Placement Failed")
+        else:
+            self.progress_label.config(text="Progress: 100%")
+            if self.is_last:
+                self.continue_button.config(text="Finish")
+                logger.info("Last scenario completed. Click 'Finish' to exit.")
+        self.root.mainloop()
+
+
+def run_visualization(simulation, window_class=RealTimeVisualization):
+    """
+    Run the simulation (run_simulation, so in the configured batches),
+    showing every placement step in a window_class window
+    """
+    is_last = getattr(simulation.config, "is_last", False)
+    viz = window_class(simulation.config, is_last=is_last)
+    num_vms = simulation.config.num_vms
+
+    def show_step(new_vms, execution_time, vms_seen):
+        viz.update_plot(
+            simulation.current_usage,
+            ", ".join(new_vms),
+            execution_time,
+            vms_seen / num_vms * 100,
+        )
+        time.sleep(0.01)
 
     try:
-        for i in range(simulation.config.num_vms):
-            vm_name = f"vm{i+1}"
-            progress = (i / simulation.config.num_vms) * 100
-
-            vm_demand = {vm_name: simulation.generate_vm_demand()}
-
-            start_time = time.time()
-            result = optimize_vm_placement(
-                simulation.clusters,
-                simulation.existing_placements,
-                [vm_name],
-                simulation.current_usage,
-                simulation.cluster_capacity,
-                vm_demand,
-                optimizer_class=simulation.optimizer_model,
-            )
-            execution_time = time.time() - start_time
-
-            if result[0] is None:
-                print(f"Failed to place {vm_name}")
-                viz.continue_button.config(state="normal")
-                viz.progress_label.config(text="Placement Failed")
-                simulation.total_time = time.time() - overall_start_time
-                simulation.execution_times = execution_times
-                viz.root.mainloop()
-                return
-
-            execution_times.append(execution_time)
-            placement_plan, cluster_utilization, final_utilization, final_placement = (
-                result
-            )
-
-            # Calculate and store metrics for this placement
-            metrics = PlacementMetrics()
-            metrics.calculate_metrics(cluster_utilization, execution_time)
-            simulation.metrics_history.append(metrics)  # Add to metrics history
-
-            placed_cluster = placement_plan[vm_name]
-            simulation.existing_placements[vm_name] = placed_cluster
-            simulation.update_cluster_usage(vm_name, placed_cluster, vm_demand[vm_name])
-
-            # Store placement history with metrics
-            simulation.placement_history.append(
-                {
-                    "vm": vm_name,
-                    "cluster": placed_cluster,
-                    "demand": vm_demand[vm_name],
-                    "utilization": cluster_utilization.copy(),
-                    "execution_time": execution_time,
-                    "metrics": metrics.to_dict(),  # Include metrics in history
-                }
-            )
-
-            viz.update_plot(simulation.current_usage, vm_name, execution_time, progress)
-            time.sleep(0.01)
-
-        # Simulation complete
-        viz.continue_button.config(state="normal")
-        viz.progress_label.config(text="Progress: 100%")
-
-        if viz.is_last:
-            viz.continue_button.config(text="Finish")
-            print("Last scenario completed. Click 'Finish' to exit.")
-
-        # Store final results in simulation object
-        simulation.execution_times = execution_times
-        simulation.total_time = time.time() - overall_start_time
-
-        # Generate plots before waiting for user input
-        if simulation.metrics_history:
-            print("\nGenerating metric evolution plots...")
-            simulation.plot_metrics_evolution(simulation.config.name)
-
-        # Wait for user to close window
-        if viz.root:  # Check if root window exists before calling mainloop
-            viz.root.mainloop()
-
+        simulation.run_simulation(on_step=show_step)
+        placed = simulation.vms_placed + simulation.rejected_vms
+        # Wait for the user to close the window
+        viz.finish(failed=placed < num_vms)
     except tk.TclError:
         pass
     finally:
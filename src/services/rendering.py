@@ -0,0 +1,567 @@
+import argparse
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+
+from src.services.results_store import StepReader
+from src.services.utils import OutputManager, configure_logging
+
+logger = logging.getLogger(__name__)
+
+RESOURCES = ["cpu", "mem", "disk"]
+
+
+def load_results(path):
+    """
+    Load saved scenario results, given a test_results.json file or a run
+    directory containing data/test_results.json
+    """
+    if os.path.isdir(path):
+        path = os.path.join(path, "data", "test_results.json")
+    with open(path) as f:
+        return json.load(f)
+
+
+def _render_scenario(renderer, scenario_name, results):
+    renderer.plot_scenario(scenario_name, results)
+    return scenario_name
+
+
+def _init_worker():
+    matplotlib.use("Agg")
+
+
+class PlotRenderer:
+    """
+    Renders the plots of a run from saved scenario results.
+
+    Results use the format written to data/test_results.json, so plots can be
+    produced right after a run or later from disk, without re-running any
+    simulation. dpi and fmt (any matplotlib output format) apply to every
+    figure.
+    """
+
+    def __init__(self, output_manager, dpi=300, fmt="png"):
+        self.output_manager = output_manager
+        self.dpi = dpi
+        self.fmt = fmt
+
+    def _save(self, get_path, name):
+        plt.savefig(get_path(f"{name}.{self.fmt}"), dpi=self.dpi, bbox_inches="tight")
+        plt.close()
+
+    def render(self, results, jobs=1):
+        """
+        Render per-scenario plots, in a pool of jobs processes if jobs > 1,
+        then the comparative plots across scenarios
+        """
+        if jobs > 1:
+            with ProcessPoolExecutor(
+                max_workers=jobs, initializer=_init_worker
+            ) as executor:
+                list(
+                    executor.map(
+                        _render_scenario,
+                        [self] * len(results),
+                        list(results),
+                        list(results.values()),
+                    )
+                )
+        else:
+            for scenario_name, scenario_results in results.items():
+                self.plot_scenario(scenario_name, scenario_results)
+
+        self.plot_comparative(results)
+
+    def plot_scenario(self, scenario_name, results):
+        """All plots of a single scenario"""
+        if results.get("initial_utilization"):
+            self.plot_results(scenario_name, results)
+        metrics_history = self.load_metrics_history(results)
+        if metrics_history:
+            self.plot_metrics_evolution(scenario_name, metrics_history)
+
+    def load_metrics_history(self, results):
+        """
+        Per-step metrics of a scenario, read from its steps file or, for runs
+        saved before steps were streamed, from the inline metrics_history
+        """
+        if results.get("steps_file"):
+            path = self.output_manager.get_data_path(results["steps_file"])
+            return list(StepReader(path).metrics_history())
+        return results.get("metrics_history") or []
+
+    def plot_results(self, scenario_name, results):
+        """Create visualization showing initial and final states with horizontal bars and averages"""
+        initial_usage = results["initial_utilization"]
+        final_usage = results["final_utilization"]
+        clusters = list(final_usage)
+        y = np.arange(len(RESOURCES))
+        height = 0.35
+
+        # Create figure with 2 rows, 1 column
+        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+
+        # Calculate averages and std for initial and final state
+        initial_avgs = {}
+        initial_stds = {}
+        final_avgs = {}
+        final_stds = {}
+        for resource in RESOURCES:
+            values = [initial_usage[cluster][resource] * 100 for cluster in clusters]
+            initial_avgs[resource] = np.mean(values)
+            initial_stds[resource] = np.std(values)
+            values = [final_usage[cluster][resource] * 100 for cluster in clusters]
+            final_avgs[resource] = np.mean(values)
+            final_stds[resource] = np.std(values)
+
+        for ax, usage, avgs, stds, title in [
+            (ax1, initial_usage, initial_avgs, initial_stds, "Initial Cluster State"),
+            (ax2, final_usage, final_avgs, final_stds, "Final Cluster State"),
+        ]:
+            for i, cluster in enumerate(clusters):
+                values = [usage[cluster][r] * 100 for r in RESOURCES]
+                ax.barh(y + i * height, values, height, label=f"Cluster {cluster}")
+                for idx, v in enumerate(values):
+                    ax.text(v + 1, idx + i * height, f"{v:.1f}%", va="center")
+
+            # Add average lines and std
+            for idx, resource in enumerate(RESOURCES):
+                avg_value = avgs[resource]
+                std_value = stds[resource]
+                ax.axvline(
+                    x=avg_value,
+                    ymin=(idx / len(RESOURCES)),
+                    ymax=((idx + 1) / len(RESOURCES)),
+                    color="red",
+                    linestyle="--",
+                    alpha=0.5,
+                )
+                ax.text(
+                    avg_value,
+                    idx + height,
+                    f"Avg: {avg_value:.1f}% (σ: {std_value:.1f})",
+                    va="bottom",
+                    ha="right",
+                    color="red",
+                )
+
+            ax.set_xlabel("Utilization (%)")
+            ax.set_title(title)
+            ax.set_yticks(y + height)
+            ax.set_yticklabels(["CPU", "Memory", "Disk"])
+            ax.legend()
+            ax.set_xlim(0, 100)
+            ax.grid(True, linestyle="--", alpha=0.7)
+
+        # Add statistics
+        stats_text = (
+            f"Total VMs placed: {results['vms_placed']}\n"
+            f"Avg placement time: {results['avg_placement_time']:.3f}s\n"
+            f"Initial avg utilization: {np.mean(list(initial_avgs.values())):.1f}% "
+            f"(σ: {np.mean([initial_stds[r] for r in RESOURCES]):.1f})\n"
+            f"Final avg utilization: {np.mean(list(final_avgs.values())):.1f}% "
+            f"(σ: {np.mean([final_stds[r] for r in RESOURCES]):.1f})"
+        )
+
+        # Add stats box
+        props = dict(boxstyle="round", facecolor="wheat", alpha=0.5)
+        plt.figtext(
+            0.98,
+            0.98,
+            stats_text,
+            fontsize=10,
+            bbox=props,
+            verticalalignment="top",
+            horizontalalignment="right",
+        )
+
+        plt.suptitle(f"Scenario: {scenario_name}", fontsize=12)
+        plt.tight_layout()
+        self._save(
+            self.output_manager.get_utilization_plot_path,
+            f"sequential_placement_results_{scenario_name}",
+        )
+
+    def plot_metrics_evolution(self, output_prefix, metrics_history):
+        """Create evolution plots for various metrics throughout VM placements."""
+        if not metrics_history:
+            logger.warning("No metrics history available for plotting")
+            return
+
+        # Set style parameters
+        plt.style.use("default")
+        colors = {
+            "imbalance": "#1f77b4",
+            "cpu": "#2ca02c",
+            "mem": "#ff7f0e",
+            "disk": "#d62728",
+            "max": "#7f7f7f",
+            "avg": "#17becf",
+            "std": "#bcbd22",
+        }
+
+        # Prepare data points
+        placements = range(1, len(metrics_history) + 1)
+
+        # Extract metrics evolution
+        imbalance_scores = [m["overall_imbalance"] for m in metrics_history]
+
+        # Resource-specific metrics
+        resource_metrics = {r: {"max": [], "avg": [], "std": []} for r in RESOURCES}
+
+        for metric in metrics_history:
+            for resource in RESOURCES:
+                r_metrics = metric["resources"][resource]
+                resource_metrics[resource]["max"].append(r_metrics["max_utilization"])
+                resource_metrics[resource]["avg"].append(r_metrics["avg_utilization"])
+                resource_metrics[resource]["std"].append(r_metrics["std_dev"])
+
+        # 1. Imbalance Score Evolution
+        plt.figure(figsize=(10, 6))
+        plt.plot(
+            placements,
+            imbalance_scores,
+            marker="o",
+            linestyle="-",
+            color=colors["imbalance"],
+            linewidth=2,
+            markersize=6,
+        )
+        plt.title(f"Imbalance Score Evolution - {output_prefix}")
+        plt.xlabel("Number of VMs Placed")
+        plt.ylabel("Imbalance Score")
+        plt.grid(True, alpha=0.3)
+        plt.tight_layout()
+        self._save(
+            self.output_manager.get_imbalance_plot_path,
+            f"{output_prefix}_imbalance_evolution",
+        )
+
+        # 2. Resource Utilization Evolution (one plot per resource), on the
+        # raw scale and as percentages (0-100% scale)
+        for resource in RESOURCES:
+            for scale, get_path, suffix in [
+                (1, self.output_manager.get_metrics_plot_path, ""),
+                (100, self.output_manager.get_utilization_plot_path, "_percent"),
+            ]:
+                plt.figure(figsize=(12, 6))
+                for key, marker, label in [
+                    ("max", "o", "Max Utilization"),
+                    ("avg", "s", "Avg Utilization"),
+                    ("std", "^", "Standard Deviation"),
+                ]:
+                    plt.plot(
+                        placements,
+                        [x * scale for x in resource_metrics[resource][key]],
+                        marker=marker,
+                        label=label,
+                        color=colors[key],
+                        linewidth=2,
+                    )
+
+                if scale == 1:
+                    plt.title(f"{resource.upper()} Metrics Evolution - {output_prefix}")
+                    plt.ylabel("Metric Value")
+                else:
+                    plt.title(
+                        f"{resource.upper()} Metrics Evolution (%) - {output_prefix}"
+                    )
+                    plt.ylabel("Percentage (%)")
+                    plt.ylim(0, 100)  # Set y-axis from 0 to 100%
+                plt.xlabel("Number of VMs Placed")
+                plt.legend()
+                plt.grid(True, alpha=0.3)
+                plt.tight_layout()
+                self._save(
+                    get_path, f"{output_prefix}_{resource}_metrics_evolution{suffix}"
+                )
+
+        # 3. Combined Resource Max Utilization
+        plt.figure(figsize=(12, 6))
+        for resource in RESOURCES:
+            plt.plot(
+                placements,
+                resource_metrics[resource]["max"],
+                marker="o",
+                label=f"{resource.upper()} Max",
+                color=colors[resource],
+                linewidth=2,
+            )
+
+        plt.title(f"Maximum Utilization Evolution by Resource - {output_prefix}")
+        plt.xlabel("Number of VMs Placed")
+        plt.ylabel("Maximum Utilization")
+        plt.legend()
+        plt.grid(True, alpha=0.3)
+        plt.tight_layout()
+        self._save(
+            self.output_manager.get_resource_evolution_plot_path,
+            f"{output_prefix}_combined_max_utilization",
+        )
+
+        # 4. Heat map of resource utilization over time
+        fig, axes = plt.subplots(3, 1, figsize=(12, 15))
+
+        for ax, resource in zip(axes, RESOURCES):
+            data = np.array(
+                [
+                    resource_metrics[resource]["max"],
+                    resource_metrics[resource]["avg"],
+                    resource_metrics[resource]["std"],
+                ]
+            )
+
+            im = ax.imshow(data, aspect="auto", cmap="YlOrRd")
+            ax.set_yticks(range(3))
+            ax.set_yticklabels(["Max", "Avg", "Std"])
+            ax.set_xlabel("Number of VMs Placed")
+            ax.set_title(f"{resource.upper()} Metrics Heatmap")
+            plt.colorbar(im, ax=ax)
+
+        plt.tight_layout()
+        self._save(
+            self.output_manager.get_heatmap_plot_path,
+            f"{output_prefix}_metrics_heatmap",
+        )
+
+        # 5. Per-cluster utilization evolution
+        plt.figure(figsize=(12, 6))
+
+        clusters = list(metrics_history[0]["resources"]["cpu"]["cluster_distribution"])
+        markers = ["o", "s", "^"]  # Different markers for different resources
+        linestyles = ["-", "--", "-.", ":"]  # Different line styles for clusters
+        cluster_colors = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728"]
+
+        for i, cluster in enumerate(clusters):
+            for j, resource in enumerate(RESOURCES):
+                values = [
+                    m["resources"][resource]["cluster_distribution"][cluster] * 100
+                    for m in metrics_history
+                ]
+                plt.plot(
+                    range(1, len(values) + 1),
+                    values,
+                    label=f"{cluster} - {resource.upper()}",
+                    marker=markers[j],
+                    linestyle=linestyles[i % len(linestyles)],
+                    color=cluster_colors[i % len(cluster_colors)],
+                    linewidth=2,
+                    markersize=6,
+                    alpha=0.7,
+                )
+
+        plt.title(f"Resource Utilization Evolution by Cluster - {output_prefix}")
+        plt.xlabel("Number of VMs Placed")
+        plt.ylabel("Utilization (%)")
+        plt.legend(bbox_to_anchor=(1.05, 1), loc="upper left")
+        plt.grid(True, alpha=0.3)
+        plt.ylim(0, 100)
+
+        # Adjust layout to prevent legend cutoff
+        plt.tight_layout()
+        self._save(
+            self.output_manager.get_utilization_plot_path,
+            f"{output_prefix}_per_cluster_evolution",
+        )
+
+    def plot_comparative(self, results):
+        """
+        Create comparative plots showing initial and final metrics across all scenarios.
+        """
+        if not results:
+            logger.warning("No results available for comparison")
+            return
+
+        plt.style.use("default")
+
+        # Define proper color schemes
+        colors = {
+            "cpu": {"light": "#90EE90", "dark": "#2F4F4F"},
+            "mem": {"light": "#FFB6C1", "dark": "#8B0000"},
+            "disk": {"light": "#87CEEB", "dark": "#00008B"},
+        }
+
+        # Extract initial and final metrics for each valid scenario
+        initial_metrics = {}
+        final_metrics = {}
+        imbalance_scores = {"initial": [], "final": []}
+        scenarios = []
+
+        for scenario, result in results.items():
+            if not result["success"]:
+                logger.warning("Skipping failed scenario: %s", scenario)
+                continue
+            try:
+                initial = result.get("initial_metrics") or result["metrics_history"][0]
+                final = result["final_metrics"]
+                initial_metrics[scenario] = {
+                    r: initial["resources"][r] for r in RESOURCES
+                }
+                final_metrics[scenario] = {r: final["resources"][r] for r in RESOURCES}
+                imbalance_scores["initial"].append(initial["overall_imbalance"])
+                imbalance_scores["final"].append(final["overall_imbalance"])
+            except (KeyError, IndexError, TypeError):
+                logger.warning("Skipping scenario %s due to missing metrics", scenario)
+                continue
+            scenarios.append(scenario)
+
+        if not scenarios:
+            logger.warning("No valid scenarios with complete metrics found")
+            return
+
+        n_scenarios = len(scenarios)
+
+        # 1. Bar plot comparing initial and final imbalance scores
+        plt.figure(figsize=(12, 6))
+        x = np.arange(n_scenarios)
+        width = 0.35
+
+        plt.bar(
+            x - width / 2,
+            imbalance_scores["initial"],
+            width,
+            label="Initial",
+            color="#D3D3D3",
+        )
+        plt.bar(
+            x + width / 2,
+            imbalance_scores["final"],
+            width,
+            label="Final",
+            color="#4169E1",
+        )
+
+        plt.xlabel("Scenarios")
+        plt.ylabel("Imbalance Score")
+        plt.title("Initial vs Final Imbalance Scores Across Scenarios")
+        plt.xticks(x, scenarios, rotation=45)
+        plt.legend()
+        plt.grid(True, alpha=0.3)
+        plt.tight_layout()
+        self._save(
+            self.output_manager.get_comparative_plot_path,
+            "comparative_imbalance_scores",
+        )
+
+        # 2. Resource utilization comparison
+        fig, axes = plt.subplots(3, 1, figsize=(12, 15))
+
+        for ax, resource in zip(axes, RESOURCES):
+            x = np.arange(n_scenarios)
+            width = 0.2
+
+            for offset, metrics, key, label, color in [
+                (-1.5, initial_metrics, "max_utilization", "Initial Max", "#D3D3D3"),
+                (
+                    -0.5,
+                    final_metrics,
+                    "max_utilization",
+                    "Final Max",
+                    colors[resource]["light"],
+                ),
+                (0.5, initial_metrics, "avg_utilization", "Initial Avg", "#A9A9A9"),
+                (
+                    1.5,
+                    final_metrics,
+                    "avg_utilization",
+                    "Final Avg",
+                    colors[resource]["dark"],
+                ),
+            ]:
+                ax.bar(
+                    x + width * offset,
+                    [metrics[s][resource][key] * 100 for s in scenarios],
+                    width,
+                    label=label,
+                    color=color,
+                )
+
+            ax.set_title(f"{resource.upper()} Utilization Comparison")
+            ax.set_xticks(x)
+            ax.set_xticklabels(scenarios, rotation=45)
+            ax.set_ylabel("Utilization (%)")
+            ax.grid(True, alpha=0.3)
+            ax.legend()
+
+        plt.tight_layout()
+        self._save(
+            self.output_manager.get_comparative_plot_path,
+            "comparative_resource_utilization",
+        )
+
+        # 3. Heatmap of improvement percentages
+        improvements = np.zeros((3, n_scenarios))
+
+        for idx, resource in enumerate(RESOURCES):
+            for s_idx, scenario in enumerate(scenarios):
+                initial_imbalance = (
+                    initial_metrics[scenario][resource]["max_utilization"]
+                    - initial_metrics[scenario][resource]["avg_utilization"]
+                )
+                final_imbalance = (
+                    final_metrics[scenario][resource]["max_utilization"]
+                    - final_metrics[scenario][resource]["avg_utilization"]
+                )
+                if initial_imbalance > 0:
+                    improvements[idx, s_idx] = (
+                        (initial_imbalance - final_imbalance) / initial_imbalance * 100
+                    )
+
+        plt.figure(figsize=(12, 6))
+        im = plt.imshow(improvements, aspect="auto", cmap="RdYlGn")
+        plt.colorbar(im, label="Improvement %")
+
+        plt.yticks(range(3), ["CPU", "Memory", "Disk"])
+        plt.xticks(range(n_scenarios), scenarios, rotation=45)
+        plt.title("Resource Balance Improvement by Scenario (%)")
+
+        # Add text annotations to the heatmap
+        for i in range(3):
+            for j in range(n_scenarios):
+                plt.text(
+                    j,
+                    i,
+                    f"{improvements[i, j]:.1f}%",
+                    ha="center",
+                    va="center",
+                    color="black",
+                )
+
+        plt.tight_layout()
+        self._save(
+            self.output_manager.get_comparative_plot_path,
+            "comparative_improvements_heatmap",
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render plots of a saved run")
+    parser.add_argument("run_dir", help="Run directory or test_results.json file")
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--plot-format", default="png", help="png, svg, pdf, ...")
+    parser.add_argument("-j", "--jobs", type=int, default=1)
+    parser.add_argument("-v", "--verbose", action="count", default=0)
+    args = parser.parse_args()
+    configure_logging(args.verbose)
+
+    matplotlib.use("Agg")
+    results = load_results(args.run_dir)
+    output_manager = OutputManager.from_run_dir(
+        args.run_dir
+        if os.path.isdir(args.run_dir)
+        else os.path.dirname(os.path.dirname(os.path.abspath(args.run_dir)))
+    )
+    PlotRenderer(output_manager, dpi=args.dpi, fmt=args.plot_format).render(
+        results, jobs=args.jobs
+    )
+    print(f"Plots saved in: {os.path.join(output_manager.output_dir, 'plots')}")
+
+
+if __name__ == "__main__":
+    main()
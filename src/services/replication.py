@@ -0,0 +1,284 @@
+import argparse
+import copy
+import json
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.models.solvers import SOLVERS
+from src.services.results_store import RESOURCE_FIELDS
+from src.services.sequential_placement import SequentialPlacementSimulation
+from src.services.test_config import generate_test_scenarios
+from src.services.utils import OutputManager, configure_logging, init_worker_logging
+
+logger = logging.getLogger(__name__)
+
+
+class StepStatistics:
+    """
+    Running mean and variance per placement step (Welford's algorithm).
+
+    Replicates may stop after different numbers of steps, so every step keeps
+    its own count. Memory grows with the longest series, not with the number
+    of replicates.
+    """
+
+    def __init__(self):
+        self.count = np.zeros(0, dtype=np.int64)
+        self.mean = np.zeros(0, dtype=np.float64)
+        self.m2 = np.zeros(0, dtype=np.float64)
+
+    def add(self, values):
+        """Add one replicate's series, values[k] being the value at step k"""
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        if n > len(self.count):
+            grow = n - len(self.count)
+            self.count = np.pad(self.count, (0, grow))
+            self.mean = np.pad(self.mean, (0, grow))
+            self.m2 = np.pad(self.m2, (0, grow))
+
+        self.count[:n] += 1
+        delta = values - self.mean[:n]
+        self.mean[:n] += delta / self.count[:n]
+        self.m2[:n] += delta * (values - self.mean[:n])
+
+    def variance(self):
+        """Sample variance per step (0 where fewer than two samples)"""
+        variance = np.zeros_like(self.m2)
+        np.divide(self.m2, self.count - 1, out=variance, where=self.count > 1)
+        return variance
+
+    def confidence_interval(self, z=1.96):
+        """(low, high) bounds of the normal confidence interval of the mean"""
+        half_width = np.zeros_like(self.mean)
+        np.divide(
+            z * np.sqrt(self.variance()),
+            np.sqrt(self.count),
+            out=half_width,
+            where=self.count > 0,
+        )
+        return self.mean - half_width, self.mean + half_width
+
+    def to_dict(self, z=1.96):
+        low, high = self.confidence_interval(z)
+        return {
+            "count": self.count.tolist(),
+            "mean": self.mean.tolist(),
+            "ci_low": low.tolist(),
+            "ci_high": high.tolist(),
+        }
+
+
+def step_series(tracker):
+    """Per-step metric series of one replicate, keyed by metric name"""
+    history = tracker.history
+    series = {
+        "overall_imbalance": history["overall_imbalance"].tolist(),
+        "execution_time": history["execution_time"].tolist(),
+    }
+    for j, resource in enumerate(tracker.resources):
+        for field in RESOURCE_FIELDS:
+            series[f"{resource}_{field}"] = history[field][:, j].tolist()
+    return series
+
+
+def run_replicate(config, replicate, seed):
+    """Run one seeded replicate of a scenario"""
+    config = copy.copy(config)
+    config.seed = seed
+    simulation = SequentialPlacementSimulation(config, None, keep_history=False)
+    summary = simulation.run_simulation()
+
+    return {
+        "scenario": config.name,
+        "replicate": replicate,
+        "seed": seed,
+        "success": summary["success"],
+        "vms_placed": summary["vms_placed"],
+        "total_time": summary["total_time"],
+        "amortized_placement_time": summary["amortized_placement_time"],
+        "final_imbalance": summary["final_metrics"]["overall_imbalance"]
+        if summary["final_metrics"]
+        else None,
+        "steps": step_series(simulation.metrics_tracker),
+    }
+
+
+class ReplicationEngine:
+    """
+    Monte Carlo replication of placement scenarios.
+
+    Every scenario is run `replicates` times with distinct seeds derived from
+    base_seed, in a pool of `jobs` processes. Per-replicate records are
+    streamed to data/replicates.jsonl as they complete and folded into
+    per-step StepStatistics, so only a bounded number of results is held in
+    memory at any time. Records are consumed in submission order, which keeps
+    the output identical for any number of workers.
+    """
+
+    def __init__(
+        self,
+        scenarios,
+        output_manager,
+        replicates=10,
+        jobs=1,
+        base_seed=0,
+        z=1.96,
+    ):
+        self.scenarios = scenarios
+        self.output_manager = output_manager
+        self.replicates = replicates
+        self.jobs = jobs
+        self.base_seed = base_seed
+        self.z = z
+        self.step_stats = {}
+        self.scalar_stats = {}
+
+    def seeds(self, scenario_index):
+        """Independent replicate seeds for one scenario"""
+        sequence = np.random.SeedSequence([self.base_seed, scenario_index])
+        return sequence.generate_state(self.replicates).tolist()
+
+    def tasks(self):
+        for i, config in enumerate(self.scenarios):
+            for replicate, seed in enumerate(self.seeds(i)):
+                yield config, replicate, seed
+
+    def _results(self):
+        """Yield replicate records in task order"""
+        if self.jobs <= 1:
+            for task in self.tasks():
+                yield run_replicate(*task)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.jobs,
+            initializer=init_worker_logging,
+            initargs=(logging.getLogger("src").getEffectiveLevel(),),
+        ) as executor:
+            # Keep a bounded window of tasks in flight
+            pending = deque()
+            for task in self.tasks():
+                pending.append(executor.submit(run_replicate, *task))
+                if len(pending) >= 2 * self.jobs:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def add(self, record):
+        """Fold one replicate record into the running statistics"""
+        scenario = record["scenario"]
+        steps = self.step_stats.setdefault(scenario, {})
+        for metric, values in record["steps"].items():
+            steps.setdefault(metric, StepStatistics()).add(values)
+
+        scalars = self.scalar_stats.setdefault(scenario, {})
+        for metric in [
+            "vms_placed",
+            "total_time",
+            "amortized_placement_time",
+            "final_imbalance",
+        ]:
+            if record[metric] is not None:
+                scalars.setdefault(metric, StepStatistics()).add([record[metric]])
+
+    def run(self):
+        replicates_path = self.output_manager.get_data_path("replicates.jsonl")
+        with open(replicates_path, "w") as f:
+            for record in self._results():
+                f.write(json.dumps(record) + "\n")
+                self.add(record)
+                logger.info(
+                    "%s replicate %d: %d VMs placed",
+                    record["scenario"],
+                    record["replicate"],
+                    record["vms_placed"],
+                )
+
+        summary = self.summary()
+        with open(self.output_manager.get_data_path("replication.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+    def summary(self):
+        """Mean and confidence interval of every metric, per scenario"""
+        summary = {}
+        for scenario, steps in self.step_stats.items():
+            scalars = {}
+            for metric, stats in self.scalar_stats[scenario].items():
+                low, high = stats.confidence_interval(self.z)
+                scalars[metric] = {
+                    "count": int(stats.count[0]),
+                    "mean": float(stats.mean[0]),
+                    "ci_low": float(low[0]),
+                    "ci_high": float(high[0]),
+                }
+            summary[scenario] = {
+                "replicates": self.replicates,
+                "z": self.z,
+                "summary": scalars,
+                "steps": {
+                    metric: stats.to_dict(self.z) for metric, stats in steps.items()
+                },
+            }
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replicate VM placement scenarios")
+    parser.add_argument("-k", "--replicates", type=int, default=10)
+    parser.add_argument("-j", "--jobs", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0, help="Base seed")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        help="Only replicate this scenario (repeatable)",
+    )
+    parser.add_argument(
+        "--solver",
+        choices=SOLVERS,
+        help="MIP backend (default: docplex when CPLEX is installed, else numpy)",
+    )
+    parser.add_argument("--time-limit", type=float, help="Seconds per solve")
+    parser.add_argument("--mip-gap", type=float, help="Relative MIP gap per solve")
+    parser.add_argument("-v", "--verbose", action="count", default=0)
+    args = parser.parse_args()
+    configure_logging(args.verbose)
+
+    scenarios = [
+        s
+        for s in generate_test_scenarios()
+        if not args.scenario or s.name in args.scenario
+    ]
+    for scenario in scenarios:
+        if args.solver:
+            scenario.solver = args.solver
+        if args.time_limit is not None:
+            scenario.time_limit = args.time_limit
+        if args.mip_gap is not None:
+            scenario.mip_gap = args.mip_gap
+    output_manager = OutputManager()
+    engine = ReplicationEngine(
+        scenarios,
+        output_manager,
+        replicates=args.replicates,
+        jobs=args.jobs,
+        base_seed=args.seed,
+    )
+    summary = engine.run()
+
+    for scenario, results in summary.items():
+        print(f"\n{scenario} ({results['replicates']} replicates)")
+        for metric, stats in results["summary"].items():
+            print(
+                f"  {metric}: {stats['mean']:.4f} "
+                f"[{stats['ci_low']:.4f}, {stats['ci_high']:.4f}]"
+            )
+    print(f"\nResults saved in: {output_manager.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import json
+import os
+
+import numpy as np
+
+from src.models.base_optimizer import PHASES
+
+RESOURCES = ["cpu", "mem", "disk"]
+RESOURCE_FIELDS = ["max_utilization", "avg_utilization", "std_dev"]
+FORMAT_VERSION = 1
+
+
+def step_schema(clusters, resources=None):
+    """Column names of a step row for the given clusters"""
+    resources = resources or RESOURCES
+    columns = [
+        "step",
+        "batch_size",
+        "execution_time",
+        "overall_imbalance",
+        "mip_gap",  # null for steps placed without a MIP
+        "hit_limit",
+        *(f"{phase}_time" for phase in PHASES),
+    ]
+    for resource in resources:
+        columns += [f"{resource}_{field}" for field in RESOURCE_FIELDS]
+        columns += [f"{resource}_{cluster}" for cluster in clusters]
+    # Not numeric: [[vm, cluster], ...] for the VMs placed in the step
+    columns.append("placements")
+    return columns
+
+
+class StepWriter:
+    """
+    Appends one row per placement step to a JSON Lines file.
+
+    The first line is a header with the schema (ordered column names), the
+    clusters and the resources; every following line is a JSON array with one
+    value per column. Rows are written as steps happen, so nothing but the
+    open file is kept in memory.
+    """
+
+    def __init__(self, path, scenario, clusters, resources=None):
+        self.path = path
+        self.clusters = list(clusters)
+        self.resources = list(resources or RESOURCES)
+        self.schema = step_schema(self.clusters, self.resources)
+        self.steps = 0
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, "w")
+        header = {
+            "version": FORMAT_VERSION,
+            "scenario": scenario,
+            "clusters": self.clusters,
+            "resources": self.resources,
+            "schema": self.schema,
+        }
+        self._file.write(json.dumps(header) + "\n")
+
+    @classmethod
+    def for_scenario(cls, output_manager, scenario, clusters, resources=None):
+        """Writer for data/steps/<scenario>.jsonl of a run"""
+        path = output_manager.get_data_path(os.path.join("steps", f"{scenario}.jsonl"))
+        return cls(path, scenario, clusters, resources)
+
+    def write(self, metrics, placements, batch_size):
+        """Append the PlacementMetrics of one step and its {vm: cluster} plan"""
+        row = [
+            self.steps,
+            batch_size,
+            metrics.execution_time,
+            metrics.overall_imbalance,
+            metrics.mip_gap,
+            metrics.hit_limit,
+            *(metrics.phase_times[phase] for phase in PHASES),
+        ]
+        for resource in self.resources:
+            resource_metrics = metrics.resources[resource]
+            row += [getattr(resource_metrics, field) for field in RESOURCE_FIELDS]
+            row += [
+                resource_metrics.cluster_distribution.get(cluster, 0.0)
+                for cluster in self.clusters
+            ]
+        row.append(list(placements.items()))
+
+        self._file.write(json.dumps(row, separators=(",", ":")) + "\n")
+        self.steps += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class StepReader:
+    """
+    Lazy reader for files written by StepWriter. Iterating yields one
+    {column: value} dict per step without loading the whole file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path) as f:
+            header = json.loads(f.readline())
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported steps file version in {path}")
+        self.scenario = header["scenario"]
+        self.clusters = header["clusters"]
+        self.resources = header["resources"]
+        self.schema = header["schema"]
+
+    def rows(self):
+        """Yield every step as a list of values in schema order"""
+        with open(self.path) as f:
+            f.readline()  # Skip the header
+            for line in f:
+                yield json.loads(line)
+
+    def __iter__(self):
+        for row in self.rows():
+            yield dict(zip(self.schema, row))
+
+    def columns(self, names=None):
+        """
+        Numeric columns as float64 arrays, {name: array}. Only the requested
+        columns are kept while streaming through the file.
+        """
+        names = [n for n in (names or self.schema) if n != "placements"]
+        indices = [self.schema.index(n) for n in names]
+        values = [[] for _ in names]
+        for row in self.rows():
+            for column, index in zip(values, indices):
+                column.append(row[index])
+        return {n: np.array(v, dtype=np.float64) for n, v in zip(names, values)}
+
+    def metrics_history(self):
+        """Yield every step in the PlacementMetrics.to_dict() layout"""
+        for step in self:
+            resources = {}
+            for resource in self.resources:
+                resources[resource] = {
+                    field: step[f"{resource}_{field}"] for field in RESOURCE_FIELDS
+                }
+                resources[resource]["imbalance_score"] = (
+                    resources[resource]["max_utilization"]
+                    - resources[resource]["avg_utilization"]
+                )
+                resources[resource]["cluster_distribution"] = {
+                    cluster: step[f"{resource}_{cluster}"] for cluster in self.clusters
+                }
+            yield {
+                "execution_time": step["execution_time"],
+                "overall_imbalance": step["overall_imbalance"],
+                "mip_gap": step.get("mip_gap"),
+                "hit_limit": step.get("hit_limit", False),
+                "phase_times": {
+                    phase: step.get(f"{phase}_time", 0.0) for phase in PHASES
+                },
+                "resources": resources,
+            }
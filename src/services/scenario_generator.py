@@ -0,0 +1,218 @@
+"""
+Parametric large-scale scenarios: TestConfigs with any number of clusters of
+heterogeneous capacity, skewed initial utilization and correlated
+multi-resource VM demands, drawn vectorized from a seed.
+
+Usage:
+    python -m src.services.scenario_generator [--clusters 10 100 1000 10000]
+        [--vms-per-cluster 10] [--utilization 0.3] [--skew 0.5] [--seed 0]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.models.min_max_optimizer import MinUtilizationOptimizer
+from src.services.sequential_placement import RESOURCES
+from src.services.test_config import TestConfig
+
+# Cluster counts of the default scaling sweep
+SCALING_SIZES = [10, 100, 1000, 10000]
+
+# Initial utilization of a resource never exceeds this
+MAX_INITIAL_UTILIZATION = 0.95
+
+
+class CorrelatedDemand:
+    """
+    Lognormal VM demands whose resources are correlated: the log demand of
+    resource r is log(median[r]) + sigma[r] * z[r], with z standard normal
+    of the given correlation (one coefficient for every pair of resources,
+    or a full matrix). Picklable, so configs using it can be replicated in
+    worker processes.
+    """
+
+    def __init__(self, median, sigma=0.5, correlation=0.6, resources=None):
+        self.resources = list(resources or RESOURCES)
+        n = len(self.resources)
+        self.median = np.array([median[r] for r in self.resources], dtype=float)
+        self.sigma = (
+            np.array([sigma[r] for r in self.resources], dtype=float)
+            if isinstance(sigma, dict)
+            else np.full(n, float(sigma))
+        )
+        correlation = np.asarray(correlation, dtype=float)
+        if correlation.ndim == 0:
+            correlation = np.full((n, n), float(correlation))
+            np.fill_diagonal(correlation, 1.0)
+        self.correlation = correlation
+        try:
+            self.cholesky = np.linalg.cholesky(correlation)
+        except np.linalg.LinAlgError as e:
+            raise ValueError(
+                f"Demand correlation is not positive definite: {correlation.tolist()}"
+            ) from e
+
+    def sample(self, rng, n):
+        """(n, resources) array of demands, columns in self.resources order"""
+        z = rng.standard_normal((n, len(self.resources))) @ self.cholesky.T
+        return self.median * np.exp(self.sigma * z)
+
+    def mean(self):
+        return {
+            r: float(m * np.exp(s**2 / 2))
+            for r, m, s in zip(self.resources, self.median, self.sigma)
+        }
+
+    def ranges(self, z=2.326):
+        """{resource: (low, high)} spanning the 1st to 99th percentiles"""
+        return {
+            r: (float(m * np.exp(-z * s)), float(m * np.exp(z * s)))
+            for r, m, s in zip(self.resources, self.median, self.sigma)
+        }
+
+
+def skewed_utilization(rng, n, mean, skew):
+    """
+    n cluster load levels with the given mean and coefficient of variation
+    skew, from a Beta distribution; skew=0 gives every cluster the mean.
+    The skew is capped at the largest a Beta of that mean allows.
+    """
+    if skew <= 0 or mean <= 0:
+        return np.full(n, float(mean))
+    variance = min((skew * mean) ** 2, 0.99 * mean * (1 - mean))
+    concentration = mean * (1 - mean) / variance - 1
+    return rng.beta(mean * concentration, (1 - mean) * concentration, n)
+
+
+def generate_scenario(
+    num_clusters,
+    num_vms=None,
+    seed=0,
+    name=None,
+    capacity=100.0,
+    capacity_sigma=0.5,
+    resource_sigma=0.1,
+    utilization=0.3,
+    utilization_skew=0.5,
+    demand=None,
+    optimizer_model=MinUtilizationOptimizer,
+    **config_kwargs,
+):
+    """
+    TestConfig of num_clusters clusters "c1".."cN" and num_vms VMs (default
+    10 per cluster).
+
+    Capacities are capacity times a lognormal cluster size (log-std
+    capacity_sigma) times a lognormal per-resource shape (log-std
+    resource_sigma). Each cluster's initial utilization is a Beta-distributed
+    load level of mean utilization and coefficient of variation
+    utilization_skew, varied per resource by resource_sigma and capped at
+    MAX_INITIAL_UTILIZATION. VM demands follow demand, a CorrelatedDemand
+    (default: medians of 1, 2 and 3 for cpu, mem and disk, sigma 0.5,
+    correlation 0.6) over RESOURCES, else ValueError; vm_demand_ranges is set
+    to its 1st-99th percentiles. Remaining keyword arguments are passed on to
+    TestConfig.
+    """
+    rng = np.random.default_rng(seed)
+    n, k = num_clusters, len(RESOURCES)
+    clusters = [f"c{i + 1}" for i in range(n)]
+
+    size = rng.lognormal(0.0, capacity_sigma, (n, 1))
+    shape = rng.lognormal(0.0, resource_sigma, (n, k))
+    capacities = capacity * size * shape
+
+    load = skewed_utilization(rng, n, utilization, utilization_skew)
+    usage = load[:, None] * rng.lognormal(0.0, resource_sigma, (n, k))
+    usage = np.clip(usage, 0.0, MAX_INITIAL_UTILIZATION)
+
+    if demand is None:
+        demand = CorrelatedDemand({"cpu": 1.0, "mem": 2.0, "disk": 3.0})
+    # The simulations and their metrics only know RESOURCES, in that order
+    if list(demand.resources) != RESOURCES:
+        raise ValueError(
+            f"Demand resources {demand.resources} must be {RESOURCES}, in order"
+        )
+
+    return TestConfig(
+        name=name or f"scale_{num_clusters}",
+        num_vms=10 * num_clusters if num_vms is None else num_vms,
+        clusters=clusters,
+        cluster_capacity={
+            c: dict(zip(RESOURCES, row))
+            for c, row in zip(clusters, capacities.tolist())
+        },
+        initial_usage={
+            c: dict(zip(RESOURCES, row)) for c, row in zip(clusters, usage.tolist())
+        },
+        vm_demand_ranges=demand.ranges(),
+        vm_demand_model=demand,
+        optimizer_model=optimizer_model,
+        seed=seed,
+        **config_kwargs,
+    )
+
+
+def scaling_scenarios(sizes=None, vms_per_cluster=10, seed=0, **kwargs):
+    """generate_scenario for every cluster count in sizes (default SCALING_SIZES)"""
+    return [
+        generate_scenario(n, num_vms=vms_per_cluster * n, seed=seed, **kwargs)
+        for n in sizes or SCALING_SIZES
+    ]
+
+
+def describe(config):
+    """Summary statistics of a generated scenario"""
+    capacity = np.array(
+        [[config.cluster_capacity[c][r] for r in RESOURCES] for c in config.clusters]
+    )
+    usage = np.array(
+        [[config.initial_usage[c][r] for r in RESOURCES] for c in config.clusters]
+    )
+    peak = usage.max(axis=1)
+    return {
+        "clusters": len(config.clusters),
+        "vms": config.num_vms,
+        "capacity_min": float(capacity.min()),
+        "capacity_max": float(capacity.max()),
+        "mean_utilization": float(usage.mean()),
+        "utilization_cv": float(peak.std() / peak.mean()) if peak.mean() else 0.0,
+        "max_utilization": float(peak.max()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate large-scale scenarios")
+    parser.add_argument("--clusters", type=int, nargs="+", default=SCALING_SIZES)
+    parser.add_argument("--vms-per-cluster", type=int, default=10)
+    parser.add_argument("--utilization", type=float, default=0.3)
+    parser.add_argument("--skew", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"{'clusters':>8} {'vms':>8} {'gen ms':>8} {'cap min':>8} {'cap max':>8} "
+        f"{'mean u':>7} {'cv':>6} {'max u':>6}"
+    )
+    for n in args.clusters:
+        start = time.perf_counter()
+        config = generate_scenario(
+            n,
+            num_vms=args.vms_per_cluster * n,
+            seed=args.seed,
+            utilization=args.utilization,
+            utilization_skew=args.skew,
+        )
+        elapsed = time.perf_counter() - start
+        stats = describe(config)
+        print(
+            f"{n:>8} {stats['vms']:>8} {elapsed * 1000:8.1f} "
+            f"{stats['capacity_min']:8.1f} {stats['capacity_max']:8.1f} "
+            f"{stats['mean_utilization']:7.1%} {stats['utilization_cv']:6.2f} "
+            f"{stats['max_utilization']:6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
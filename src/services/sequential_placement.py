@@ -1,16 +1,108 @@
 # sequential_placement.py
 
+import contextlib
+import heapq
+import logging
+import os
 import random
 import time
+from typing import NamedTuple
 
-import matplotlib.pyplot as plt
 import numpy as np
 
-from src.services.metrics import PlacementMetrics
+from src.models.base_optimizer import PHASES
+from src.services.metrics import (
+    IncrementalMetricsTracker,
+    MetricsHistory,
+    latency_summary,
+)
+from src.services.profiling import PlacementProfiler
+
+RESOURCES = ["cpu", "mem", "disk"]
+
+logger = logging.getLogger(__name__)
+
+
+class PlacementRecord(NamedTuple):
+    """One placed VM; its metrics are metrics_history[step]"""
+
+    vm: str
+    cluster: str
+    demand: dict
+    step: int
+    execution_time: float
+    batch_size: int
+
+
+class PlacementHistory:
+    """
+    Append-only log of placed VMs backed by a structured array. Items are
+    PlacementRecords built on access; VM names are kept in a list, sharing
+    the strings used as existing_placements keys.
+    """
+
+    def __init__(self, clusters, resources=None, capacity=1024):
+        self.clusters = list(clusters)
+        self.resources = list(resources or RESOURCES)
+        self.cluster_index = {c: i for i, c in enumerate(self.clusters)}
+        self.vms = []
+        self._rows = np.zeros(
+            capacity,
+            dtype=[
+                ("cluster", np.int32),
+                ("step", np.int64),
+                ("execution_time", np.float64),
+                ("batch_size", np.int32),
+                ("demand", np.float64, (len(self.resources),)),
+            ],
+        )
+
+    def append(self, vm, cluster, demand, step, execution_time, batch_size):
+        k = len(self.vms)
+        if k == len(self._rows):
+            grown = np.zeros(2 * k, dtype=self._rows.dtype)
+            grown[:k] = self._rows
+            self._rows = grown
+
+        self._rows[k] = (
+            self.cluster_index[cluster],
+            step,
+            execution_time,
+            batch_size,
+            [demand[r] for r in self.resources],
+        )
+        self.vms.append(vm)
+
+    def __len__(self):
+        return len(self.vms)
+
+    def __getitem__(self, k):
+        row = self._rows[range(len(self.vms))[k]]
+        return PlacementRecord(
+            self.vms[k],
+            self.clusters[row["cluster"]],
+            dict(zip(self.resources, row["demand"].tolist())),
+            int(row["step"]),
+            float(row["execution_time"]),
+            int(row["batch_size"]),
+        )
+
+    def __iter__(self):
+        for k in range(len(self)):
+            yield self[k]
 
 
 class SequentialPlacementSimulation:
-    def __init__(self, config, output_manager):
+    def __init__(
+        self,
+        config,
+        output_manager,
+        step_writer=None,
+        keep_history=True,
+        trace=None,
+        speed=None,
+        stop_on_failure=True,
+    ):
         self.config = config
         self.output_manager = output_manager  # Add output manager
         self.clusters = config.clusters
@@ -22,15 +114,70 @@ class SequentialPlacementSimulation:
             for cluster, usage in config.initial_usage.items()
         }
         self.existing_placements = {}
-        self.placement_history = []
-        self.metrics_history = []
+        # Steps are streamed to step_writer when given; keep_history=False
+        # drops the in-memory histories, keeping only the first and last metrics
+        self.step_writer = step_writer
+        self.keep_history = keep_history
+        self.first_metrics = None
+        self.metrics_tracker = IncrementalMetricsTracker(
+            self.clusters, self.current_usage, RESOURCES, keep_usage=keep_history
+        )
+        self.metrics_history = (
+            MetricsHistory(self.metrics_tracker) if keep_history else []
+        )
+        self.placement_history = (
+            PlacementHistory(self.clusters, RESOURCES) if keep_history else []
+        )
         # Add these attributes
         self.total_time = 0
         self.execution_times = []
+        self.batch_sizes = []
+        self.optimizer = None
+        # Per-simulation generators, so that scenarios are reproducible and
+        # independent of each other (and of the process they run in)
+        self.rng = random.Random(config.seed)
+        # Independent streams for optimizer tie-breaks and demand sampling
+        optimizer_seed, self.demand_seed = np.random.SeedSequence(config.seed).spawn(2)
+        self.optimizer_rng = np.random.default_rng(optimizer_seed)
+        # Generator of config.vm_demand_model, created on first use
+        self.demand_rng = None
+        # Replay mode: arrivals come from trace, an iterable of (vm, arrival,
+        # demand, departure or None) such as trace_replay.read_trace, instead
+        # of being drawn from the config. speed paces the replay at that many
+        # simulated seconds per wall-clock second (None = full speed).
+        self.trace = trace
+        self.speed = speed
+        # Stop at the first batch that cannot be placed, or reject it and go on
+        self.stop_on_failure = stop_on_failure
+        # Departure time of every arrived VM that will leave, and a heap of
+        # (departure, vm) for the placed ones with their demands
+        self.departure_times = {}
+        self.departures = []
+        self.departing_demand = {}
+        self.vms_placed = 0
+        self.rejected_vms = 0
+        self.departed_vms = 0
+        # cProfile/tracemalloc capture of every placement (config.profile);
+        # cProfile files go to data/profiles/<scenario>/ of the output
+        self.profiler = None
+        if config.profile:
+            directory = None
+            if output_manager is not None:
+                directory = output_manager.get_data_path(
+                    os.path.join("profiles", config.name)
+                )
+            self.profiler = PlacementProfiler(config.profile, directory)
 
     def generate_vm_demand(self):
+        model = self.config.vm_demand_model
+        if model is not None:
+            if self.demand_rng is None:
+                self.demand_rng = np.random.default_rng(self.demand_seed)
+            return dict(
+                zip(model.resources, model.sample(self.demand_rng, 1)[0].tolist())
+            )
         return {
-            resource: random.uniform(ranges[0], ranges[1])
+            resource: self.rng.uniform(ranges[0], ranges[1])
             for resource, ranges in self.config.vm_demand_ranges.items()
         }
 
@@ -40,101 +187,310 @@ class SequentialPlacementSimulation:
                 vm_demand[resource] / self.cluster_capacity[cluster][resource]
             )
             self.current_usage[cluster][resource] += usage_increase
+        # Only the cluster that changed is updated in the metrics
+        self.metrics_tracker.set_usage(
+            cluster, [self.current_usage[cluster][r] for r in RESOURCES]
+        )
 
-    def run_simulation(self):
-        overall_start_time = time.time()
+    def release_departures(self, now):
+        """Remove the VMs whose departure time is not after now"""
+        while self.departures and self.departures[0][0] <= now:
+            _, vm_name = heapq.heappop(self.departures)
+            cluster = self.existing_placements.pop(vm_name)
+            vm_demand = self.departing_demand.pop(vm_name)
+            for resource in RESOURCES:
+                self.current_usage[cluster][resource] -= (
+                    vm_demand[resource] / self.cluster_capacity[cluster][resource]
+                )
+            self.metrics_tracker.set_usage(
+                cluster, [self.current_usage[cluster][r] for r in RESOURCES]
+            )
+            self.departed_vms += 1
+
+    def generate_arrivals(self):
+        """Yield (vm_name, arrival_time, demand) for every VM of the scenario"""
+        if self.trace is not None:
+            for vm_name, arrival_time, demand, departure in self.trace:
+                if departure is not None:
+                    self.departure_times[vm_name] = departure
+                yield vm_name, arrival_time, demand
+            return
 
+        arrival_time = 0.0
         for i in range(self.config.num_vms):
-            vm_name = f"vm{i+1}"
-            print(f"\nPlacing {vm_name} ({i+1}/{self.config.num_vms})...")
-
-            vm_demand = {vm_name: self.generate_vm_demand()}
-
-            # Create optimizer instance
-            optimizer = self.optimizer_model(
-                self.clusters,
-                self.existing_placements,
-                [vm_name],
-                self.current_usage,
-                self.cluster_capacity,
-                vm_demand,
+            if self.config.arrival_rate:
+                arrival_time += self.rng.expovariate(self.config.arrival_rate)
+            else:
+                arrival_time = float(i)
+            yield f"vm{i + 1}", arrival_time, self.generate_vm_demand()
+
+    def batch_arrivals(self, arrivals):
+        """
+        Group arrivals into placement batches. A batch is closed once it holds
+        batch_size VMs or once an arrival falls outside the batch_window opened
+        by the first VM of the batch.
+        """
+        batch_size = self.config.batch_size
+        batch_window = self.config.batch_window
+        batch = []
+
+        for vm_name, arrival_time, demand in arrivals:
+            if (
+                batch
+                and batch_window is not None
+                and arrival_time - batch[0][1] > batch_window
+            ):
+                yield batch
+                batch = []
+
+            batch.append((vm_name, arrival_time, demand))
+
+            if batch_size is not None and len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    def create_optimizer(self, new_vms, vm_demand):
+        """
+        Create the optimizer for the next batch. Incremental optimizers keep
+        their model alive for the whole simulation and are only updated.
+        """
+        if self.optimizer is not None and getattr(self.optimizer, "incremental", False):
+            self.optimizer.update(
+                self.existing_placements, new_vms, self.current_usage, vm_demand
+            )
+            return self.optimizer
+
+        self.optimizer = self.optimizer_model(
+            self.clusters,
+            self.existing_placements,
+            new_vms,
+            self.current_usage,
+            self.cluster_capacity,
+            vm_demand,
+            seed=self.optimizer_rng,
+            solver=self.config.solver,
+            time_limit=self.config.time_limit,
+            mip_gap=self.config.mip_gap,
+        )
+        return self.optimizer
+
+    def timed_optimize(self, optimizer):
+        """
+        optimizer.optimize() and its wall-clock seconds, with the optimizer
+        timing its phases and the placement profiled if configured
+        """
+        optimizer.reset_phases()
+        capture = (
+            self.profiler.capture()
+            if self.profiler is not None
+            else contextlib.nullcontext()
+        )
+        with capture:
+            start_time = time.perf_counter()
+            result = optimizer.optimize()
+            execution_time = time.perf_counter() - start_time
+        return result, execution_time
+
+    def record_step(
+        self,
+        execution_time,
+        placement_plan,
+        batch_size,
+        mip_gap=None,
+        hit_limit=False,
+        phase_times=None,
+    ):
+        """
+        Record the metrics of one placement step, once its placements have
+        been applied with update_cluster_usage, and return the step index.
+        phase_times is the optimizer's {phase: nanoseconds} of the step.
+        PlacementMetrics objects are only built when they are streamed.
+        """
+        step = self.metrics_tracker.record(
+            execution_time, mip_gap, hit_limit, phase_times
+        )
+        if self.first_metrics is None:
+            self.first_metrics = self.metrics_tracker.metrics(step)
+        if self.step_writer is not None:
+            self.step_writer.write(
+                self.metrics_tracker.metrics(step), placement_plan, batch_size
             )
+        return step
+
+    def pace(self, batches):
+        """Hold each batch until its last arrival is due on the scaled clock"""
+        start = first_arrival = None
+        for batch in batches:
+            if start is None:
+                start, first_arrival = time.perf_counter(), batch[0][1]
+            due = start + (batch[-1][1] - first_arrival) / self.speed
+            wait = due - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            yield batch
+
+    def run_simulation(self, on_step=None):
+        """
+        Place the scenario's arrivals batch by batch and summarize the run.
+        on_step(new_vms, execution_time, vms_seen) is called after every
+        recorded placement step, as by the real-time visualization.
+        """
+        overall_start_time = time.perf_counter()
+        vms_seen = 0
+        total = "?" if self.trace is not None else self.config.num_vms
+
+        batches = self.batch_arrivals(self.generate_arrivals())
+        if self.speed:
+            batches = self.pace(batches)
+        for batch in batches:
+            new_vms = [vm_name for vm_name, _, _ in batch]
+            vm_demand = {vm_name: demand for vm_name, _, demand in batch}
+            vms_seen += len(new_vms)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Placing %s (%d/%s)...",
+                    ", ".join(new_vms),
+                    vms_seen,
+                    total,
+                )
+            if self.departures:
+                self.release_departures(batch[0][1])
 
-            # Time the optimization
-            start_time = time.time()
-            result = (
-                optimizer.optimize()
-            )  # Use optimizer instance directly instead of optimize_vm_placement
-            execution_time = time.time() - start_time
+            optimizer = self.create_optimizer(new_vms, vm_demand)
+            result, execution_time = self.timed_optimize(optimizer)
             self.execution_times.append(execution_time)  # Store execution time
+            self.batch_sizes.append(len(new_vms))
 
             if result[0] is None:
-                print(f"Failed to place {vm_name}")
-                break
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Failed to place %s", ", ".join(new_vms))
+                if self.stop_on_failure:
+                    break
+                self.rejected_vms += len(new_vms)
+                for vm_name in new_vms:
+                    self.departure_times.pop(vm_name, None)
+                continue
 
             placement_plan, cluster_utilization, final_utilization, final_placement = (
                 result
             )
 
-            # Calculate metrics for this placement
-            metrics = PlacementMetrics()
-            metrics.execution_time = execution_time
-            metrics.calculate_metrics(cluster_utilization, execution_time)
-            self.metrics_history.append(metrics)
-
-            placed_cluster = placement_plan[vm_name]
-            self.existing_placements[vm_name] = placed_cluster
-            self.update_cluster_usage(vm_name, placed_cluster, vm_demand[vm_name])
-
-            self.placement_history.append(
-                {
-                    "vm": vm_name,
-                    "cluster": placed_cluster,
-                    "demand": vm_demand[vm_name],
-                    "utilization": cluster_utilization.copy(),
-                    "execution_time": execution_time,
-                    "metrics": metrics.to_dict(),
-                }
+            for vm_name in new_vms:
+                placed_cluster = placement_plan[vm_name]
+                self.existing_placements[vm_name] = placed_cluster
+                self.update_cluster_usage(vm_name, placed_cluster, vm_demand[vm_name])
+                departure = self.departure_times.pop(vm_name, None)
+                if departure is not None:
+                    heapq.heappush(self.departures, (departure, vm_name))
+                    self.departing_demand[vm_name] = vm_demand[vm_name]
+            self.vms_placed += len(new_vms)
+
+            # Record metrics for this placement
+            step = self.record_step(
+                execution_time,
+                placement_plan,
+                len(new_vms),
+                optimizer.gap,
+                optimizer.hit_limit,
+                optimizer.phase_times,
             )
 
-        self.total_time = time.time() - overall_start_time  # Store total time
+            if self.keep_history:
+                # The solve cost is shared by every VM of the batch
+                amortized_time = execution_time / len(new_vms)
+                for vm_name in new_vms:
+                    self.placement_history.append(
+                        vm_name,
+                        placement_plan[vm_name],
+                        vm_demand[vm_name],
+                        step,
+                        amortized_time,
+                        len(new_vms),
+                    )
+            if on_step is not None:
+                on_step(new_vms, execution_time, vms_seen)
 
-        # After simulation completes
-        if self.metrics_history:  # Only create plots if we have metrics
-            self.plot_metrics_evolution(self.config.name)
+        self.total_time = time.perf_counter() - overall_start_time
 
         return self.summarize_results(self.total_time, self.execution_times)
 
+    def phase_summary(self):
+        """
+        Seconds of the recorded steps' solves per optimizer phase, and
+        "other": solve time spent outside every phase
+        """
+        history = self.metrics_tracker.history
+        totals = history["phase_times"].sum(axis=0)
+        summary = dict(zip(PHASES, totals.tolist()))
+        summary["other"] = float(history["execution_time"].sum() - totals.sum())
+        return summary
+
     def summarize_results(self, total_time, execution_times):
         """Summarize the simulation results with error handling"""
         if not execution_times:  # If no VMs were placed
             summary = {
                 "total_time": total_time,
                 "vms_placed": 0,
+                "rejected_vms": self.rejected_vms,
+                "departed_vms": self.departed_vms,
                 "avg_placement_time": 0,
                 "min_placement_time": 0,
                 "max_placement_time": 0,
+                "amortized_placement_time": 0,
+                "throughput": 0,
+                "batches": 0,
+                "latency": None,
+                "limit_hits": 0,
+                "phase_times": None,
+                "profile": self.profiler.summary() if self.profiler else None,
+                "initial_metrics": None,
                 "final_metrics": None,
                 "cluster_distribution": {c: [] for c in self.clusters},
+                "initial_utilization": self.config.initial_usage,
                 "final_utilization": self.current_usage,
                 "metrics_history": [],  # Empty metrics history
                 "success": False,
                 "error": "No VMs were successfully placed",
             }
         else:
+            vms_placed = self.vms_placed
             summary = {
                 "total_time": total_time,
-                "vms_placed": len(self.existing_placements),
+                "vms_placed": vms_placed,
+                # VMs of batches that could not be placed (stop_on_failure
+                # off) and placed VMs that have since departed
+                "rejected_vms": self.rejected_vms,
+                "departed_vms": self.departed_vms,
                 "avg_placement_time": np.mean(execution_times),
                 "min_placement_time": min(execution_times),
                 "max_placement_time": max(execution_times),
+                # Solve time per placed VM, amortized over batches
+                "amortized_placement_time": sum(execution_times) / vms_placed
+                if vms_placed
+                else 0,
+                # Placed VMs per second of wall-clock simulation time
+                "throughput": vms_placed / total_time if total_time > 0 else 0,
+                "batches": len(execution_times),
+                # Solve time distribution and solves stopped by the time limit
+                "latency": latency_summary(execution_times),
+                "limit_hits": int(self.metrics_tracker.history["hit_limit"].sum()),
+                # Solve time by optimizer phase, and the optional profile
+                "phase_times": self.phase_summary(),
+                "profile": self.profiler.summary() if self.profiler else None,
                 "cluster_distribution": {c: [] for c in self.clusters},
+                "initial_utilization": self.config.initial_usage,
                 "final_utilization": self.current_usage,
                 "metrics_history": [
                     metrics.to_dict() for metrics in self.metrics_history
                 ],
-                "final_metrics": self.metrics_history[-1].to_dict()
-                if self.metrics_history
+                "initial_metrics": self.first_metrics.to_dict()
+                if self.first_metrics
+                else None,
+                "final_metrics": self.metrics_tracker.metrics(latency=True).to_dict()
+                if self.metrics_tracker.steps
                 else None,
                 "success": True,
                 "error": None,
@@ -145,404 +501,3 @@ class SequentialPlacementSimulation:
                 summary["cluster_distribution"][cluster].append(vm)
 
         return summary
-
-    def plot_results(self):
-        """Create visualization showing initial and final states with horizontal bars and averages"""
-        resources = ["cpu", "mem", "disk"]
-        y = np.arange(len(resources))
-        height = 0.35
-
-        # Create figure with 2 rows, 1 column
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
-
-        # Calculate averages and std for initial state
-        initial_avgs = {}
-        initial_stds = {}
-        for resource in resources:
-            values = [
-                self.config.initial_usage[cluster][resource] * 100
-                for cluster in self.clusters
-            ]
-            initial_avgs[resource] = np.mean(values)
-            initial_stds[resource] = np.std(values)
-
-        # Calculate averages and std for final state
-        final_avgs = {}
-        final_stds = {}
-        for resource in resources:
-            values = [
-                self.current_usage[cluster][resource] * 100 for cluster in self.clusters
-            ]
-            final_avgs[resource] = np.mean(values)
-            final_stds[resource] = np.std(values)
-
-        # Plot initial state
-        for i, cluster in enumerate(self.clusters):
-            values = [self.config.initial_usage[cluster][r] * 100 for r in resources]
-            bars = ax1.barh(y + i * height, values, height, label=f"Cluster {cluster}")
-            for idx, v in enumerate(values):
-                ax1.text(v + 1, idx + i * height, f"{v:.1f}%", va="center")
-
-        # Add average lines and std for initial state
-        for idx, resource in enumerate(resources):
-            avg_value = initial_avgs[resource]
-            std_value = initial_stds[resource]
-            ax1.axvline(
-                x=avg_value,
-                ymin=(idx / len(resources)),
-                ymax=((idx + 1) / len(resources)),
-                color="red",
-                linestyle="--",
-                alpha=0.5,
-            )
-            ax1.text(
-                avg_value,
-                idx + height,
-                f"Avg: {avg_value:.1f}% (σ: {std_value:.1f})",
-                va="bottom",
-                ha="right",
-                color="red",
-            )
-
-        ax1.set_xlabel("Utilization (%)")
-        ax1.set_title("Initial Cluster State")
-        ax1.set_yticks(y + height)
-        ax1.set_yticklabels(["CPU", "Memory", "Disk"])
-        ax1.legend()
-        ax1.set_xlim(0, 100)
-        ax1.grid(True, linestyle="--", alpha=0.7)
-
-        # Plot final state
-        for i, cluster in enumerate(self.clusters):
-            values = [self.current_usage[cluster][r] * 100 for r in resources]
-            bars = ax2.barh(y + i * height, values, height, label=f"Cluster {cluster}")  # noqa
-            for idx, v in enumerate(values):
-                ax2.text(v + 1, idx + i * height, f"{v:.1f}%", va="center")
-
-        # Add average lines and std for final state
-        for idx, resource in enumerate(resources):
-            avg_value = final_avgs[resource]
-            std_value = final_stds[resource]
-            ax2.axvline(
-                x=avg_value,
-                ymin=(idx / len(resources)),
-                ymax=((idx + 1) / len(resources)),
-                color="red",
-                linestyle="--",
-                alpha=0.5,
-            )
-            ax2.text(
-                avg_value,
-                idx + height,
-                f"Avg: {avg_value:.1f}% (σ: {std_value:.1f})",
-                va="bottom",
-                ha="right",
-                color="red",
-            )
-
-        ax2.set_xlabel("Utilization (%)")
-        ax2.set_title("Final Cluster State")
-        ax2.set_yticks(y + height)
-        ax2.set_yticklabels(["CPU", "Memory", "Disk"])
-        ax2.legend()
-        ax2.set_xlim(0, 100)
-        ax2.grid(True, linestyle="--", alpha=0.7)
-
-        # Calculate and add statistics
-        avg_placement_time = (
-            np.mean([m.execution_time for m in self.metrics_history])
-            if self.metrics_history
-            else 0
-        )
-        stats_text = (
-            f"Total VMs placed: {len(self.existing_placements)}\n"
-            f"Avg placement time: {avg_placement_time:.3f}s\n"
-            f"Initial avg utilization: {np.mean(list(initial_avgs.values())):.1f}% "
-            f"(σ: {np.mean([initial_stds[r] for r in resources]):.1f})\n"
-            f"Final avg utilization: {np.mean(list(final_avgs.values())):.1f}% "
-            f"(σ: {np.mean([final_stds[r] for r in resources]):.1f})"
-        )
-
-        # Add stats box
-        props = dict(boxstyle="round", facecolor="wheat", alpha=0.5)
-        plt.figtext(
-            0.98,
-            0.98,
-            stats_text,
-            fontsize=10,
-            bbox=props,
-            verticalalignment="top",
-            horizontalalignment="right",
-        )
-
-        plt.suptitle(f"Scenario: {self.config.name}", fontsize=12)
-        plt.tight_layout()
-
-        # Save with scenario name in filename
-        # get_utilization_plot_path
-
-        util_path = self.output_manager.get_utilization_plot_path(
-            f"sequential_placement_results_{self.config.name}.png"
-        )
-        plt.savefig(util_path, dpi=300, bbox_inches="tight")
-        plt.close()
-
-    def plot_metrics_evolution(self, output_prefix):
-        """Create evolution plots for various metrics throughout VM placements."""
-        if not self.metrics_history:
-            print("No metrics history available for plotting")
-            return
-
-        # Set style parameters
-        plt.style.use("default")
-        colors = {
-            "imbalance": "#1f77b4",
-            "cpu": "#2ca02c",
-            "mem": "#ff7f0e",
-            "disk": "#d62728",
-            "max": "#7f7f7f",
-            "avg": "#17becf",
-            "std": "#bcbd22",
-        }
-
-        # Prepare data points
-        placements = range(1, len(self.metrics_history) + 1)
-
-        # Extract metrics evolution
-        imbalance_scores = [m.overall_imbalance for m in self.metrics_history]
-
-        # Resource-specific metrics
-        resource_metrics = {
-            "cpu": {"max": [], "avg": [], "std": []},
-            "mem": {"max": [], "avg": [], "std": []},
-            "disk": {"max": [], "avg": [], "std": []},
-        }
-
-        for metric in self.metrics_history:
-            for resource in ["cpu", "mem", "disk"]:
-                r_metrics = metric.resources[resource]
-                resource_metrics[resource]["max"].append(r_metrics.max_utilization)
-                resource_metrics[resource]["avg"].append(r_metrics.avg_utilization)
-                resource_metrics[resource]["std"].append(r_metrics.std_dev)
-
-        # 1. Imbalance Score Evolution
-        plt.figure(figsize=(10, 6))
-        plt.plot(
-            placements,
-            imbalance_scores,
-            marker="o",
-            linestyle="-",
-            color=colors["imbalance"],
-            linewidth=2,
-            markersize=6,
-        )
-        plt.title(f"Imbalance Score Evolution - {output_prefix}")
-        plt.xlabel("Number of VMs Placed")
-        plt.ylabel("Imbalance Score")
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        imbalance_path = self.output_manager.get_imbalance_plot_path(
-            f"{output_prefix}_imbalance_evolution.png"
-        )
-        plt.savefig(imbalance_path, dpi=300, bbox_inches="tight")
-        plt.close()
-
-        # 2. Resource Utilization Evolution (one plot per resource)
-        for resource in ["cpu", "mem", "disk"]:
-            plt.figure(figsize=(12, 6))
-
-            plt.plot(
-                placements,
-                resource_metrics[resource]["max"],
-                marker="o",
-                label="Max Utilization",
-                color=colors["max"],
-                linewidth=2,
-            )
-            plt.plot(
-                placements,
-                resource_metrics[resource]["avg"],
-                marker="s",
-                label="Avg Utilization",
-                color=colors["avg"],
-                linewidth=2,
-            )
-            plt.plot(
-                placements,
-                resource_metrics[resource]["std"],
-                marker="^",
-                label="Standard Deviation",
-                color=colors["std"],
-                linewidth=2,
-            )
-
-            plt.title(f"{resource.upper()} Metrics Evolution - {output_prefix}")
-            plt.xlabel("Number of VMs Placed")
-            plt.ylabel("Metric Value")
-            plt.legend()
-            plt.grid(True, alpha=0.3)
-            plt.tight_layout()
-            metrics_path = self.output_manager.get_metrics_plot_path(
-                f"{output_prefix}_{resource}_metrics_evolution.png"
-            )
-            plt.savefig(metrics_path, dpi=300, bbox_inches="tight")
-            plt.close()
-
-        # 3. Combined Resource Max Utilization
-        plt.figure(figsize=(12, 6))
-        for resource in ["cpu", "mem", "disk"]:
-            plt.plot(
-                placements,
-                resource_metrics[resource]["max"],
-                marker="o",
-                label=f"{resource.upper()} Max",
-                color=colors[resource],
-                linewidth=2,
-            )
-
-        plt.title(f"Maximum Utilization Evolution by Resource - {output_prefix}")
-        plt.xlabel("Number of VMs Placed")
-        plt.ylabel("Maximum Utilization")
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        combined_path = self.output_manager.get_resource_evolution_plot_path(
-            f"{output_prefix}_combined_max_utilization.png"
-        )
-        plt.savefig(combined_path, dpi=300, bbox_inches="tight")
-        plt.close()
-
-        # 4. Heat map of resource utilization over time
-        fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 15))
-
-        for ax, resource in zip([ax1, ax2, ax3], ["cpu", "mem", "disk"]):
-            data = np.array(
-                [
-                    resource_metrics[resource]["max"],
-                    resource_metrics[resource]["avg"],
-                    resource_metrics[resource]["std"],
-                ]
-            )
-
-            im = ax.imshow(data, aspect="auto", cmap="YlOrRd")
-            ax.set_yticks(range(3))
-            ax.set_yticklabels(["Max", "Avg", "Std"])
-            ax.set_xlabel("Number of VMs Placed")
-            ax.set_title(f"{resource.upper()} Metrics Heatmap")
-            plt.colorbar(im, ax=ax)
-
-        plt.tight_layout()
-        heatmap_path = self.output_manager.get_heatmap_plot_path(
-            f"{output_prefix}_metrics_heatmap.png"
-        )
-        plt.savefig(heatmap_path, dpi=300, bbox_inches="tight")
-        plt.close()
-
-        # 5. Percentage-based plots (0-100% scale)
-        for resource in ["cpu", "mem", "disk"]:
-            plt.figure(figsize=(12, 6))
-
-            # Convert to percentages
-            max_util = [x * 100 for x in resource_metrics[resource]["max"]]
-            avg_util = [x * 100 for x in resource_metrics[resource]["avg"]]
-            std_util = [x * 100 for x in resource_metrics[resource]["std"]]
-
-            plt.plot(
-                placements,
-                max_util,
-                marker="o",
-                label="Max Utilization",
-                color=colors["max"],
-                linewidth=2,
-            )
-            plt.plot(
-                placements,
-                avg_util,
-                marker="s",
-                label="Avg Utilization",
-                color=colors["avg"],
-                linewidth=2,
-            )
-            plt.plot(
-                placements,
-                std_util,
-                marker="^",
-                label="Standard Deviation",
-                color=colors["std"],
-                linewidth=2,
-            )
-
-            plt.title(f"{resource.upper()} Metrics Evolution (%) - {output_prefix}")
-            plt.xlabel("Number of VMs Placed")
-            plt.ylabel("Percentage (%)")
-            plt.legend()
-            plt.grid(True, alpha=0.3)
-            plt.ylim(0, 100)  # Set y-axis from 0 to 100%
-            plt.tight_layout()
-            util_path = self.output_manager.get_utilization_plot_path(
-                f"{output_prefix}_{resource}_metrics_evolution_percent.png"
-            )
-            plt.savefig(util_path, dpi=300, bbox_inches="tight")
-            plt.close()
-
-        # Add new plot for per-cluster utilization evolution
-        plt.figure(figsize=(12, 6))
-
-        # Extract utilization data per cluster
-        cluster_utils = {
-            cluster: {"cpu": [], "mem": [], "disk": []} for cluster in self.clusters
-        }
-
-        # Collect data points
-        for metric in self.metrics_history:
-            for cluster in self.clusters:
-                for resource in ["cpu", "mem", "disk"]:
-                    cluster_utils[cluster][resource].append(
-                        metric.resources[resource].cluster_distribution[cluster] * 100
-                    )
-
-        # Plot lines for each cluster and resource
-        markers = ["o", "s", "^"]  # Different markers for different resources
-        linestyles = [
-            "-",
-            "--",
-            "-.",
-            ":",
-        ]  # Different line styles for different clusters
-        colors = [
-            "#1f77b4",
-            "#ff7f0e",
-            "#2ca02c",
-            "#d62728",
-        ]  # Different colors for clusters
-
-        for i, (cluster, utils) in enumerate(cluster_utils.items()):
-            for j, (resource, values) in enumerate(utils.items()):
-                plt.plot(
-                    range(1, len(values) + 1),
-                    values,
-                    label=f"{cluster} - {resource.upper()}",
-                    marker=markers[j],
-                    linestyle=linestyles[i % len(linestyles)],
-                    color=colors[i % len(colors)],
-                    linewidth=2,
-                    markersize=6,
-                    alpha=0.7,
-                )
-
-        plt.title(f"Resource Utilization Evolution by Cluster - {output_prefix}")
-        plt.xlabel("Number of VMs Placed")
-        plt.ylabel("Utilization (%)")
-        plt.legend(bbox_to_anchor=(1.05, 1), loc="upper left")
-        plt.grid(True, alpha=0.3)
-        plt.ylim(0, 100)
-
-        # Adjust layout to prevent legend cutoff
-        plt.tight_layout()
-
-        # Save the new plot
-        per_cluster_path = self.output_manager.get_utilization_plot_path(
-            f"{output_prefix}_per_cluster_evolution.png"
-        )
-        plt.savefig(per_cluster_path, dpi=300, bbox_inches="tight")
-        plt.close()
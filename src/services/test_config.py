@@ -14,6 +14,16 @@ class TestConfig:
         initial_usage=None,
         vm_demand_ranges=None,
         optimizer_model=None,
+        batch_size=1,
+        batch_window=None,
+        arrival_rate=None,
+        seed=None,
+        solver=None,
+        time_limit=None,
+        mip_gap=None,
+        lifetime=None,
+        vm_demand_model=None,
+        profile=None,
     ):
         self.name = name
         self.num_vms = num_vms
@@ -30,6 +40,30 @@ class TestConfig:
             "mem": (10.0, 25.0),
             "disk": (8.0, 20.0),
         }
+        # Batch placement: solve up to batch_size arrivals (None = unbounded) or
+        # all arrivals within batch_window simulated seconds as one model
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        # Mean arrivals per simulated second (None = one arrival per second)
+        self.arrival_rate = arrival_rate
+        # Seed for the scenario's VM demands, arrivals and optimizer tie-breaks
+        self.seed = seed
+        # MIP backend of the optimizer, "docplex" or "numpy" (None = default)
+        self.solver = solver
+        # Per-solve budget: seconds and relative MIP gap (None = solver default)
+        self.time_limit = time_limit
+        self.mip_gap = mip_gap
+        # VM lifetime distribution of the event-driven simulation, in simulated
+        # seconds: ("fixed", t), ("exponential", mean), ("lognormal", mean,
+        # sigma) or ("uniform", low, high); None = VMs never depart
+        self.lifetime = lifetime
+        # VM demand distribution with sample(rng, n) -> (n, resources) array,
+        # such as scenario_generator.CorrelatedDemand; None = independent
+        # uniform draws from vm_demand_ranges
+        self.vm_demand_model = vm_demand_model
+        # Per-placement profilers of the simulation, a subset of
+        # profiling.PROFILERS ("cprofile", "tracemalloc"); None = off
+        self.profile = profile
 
 
 def generate_test_scenarios():
@@ -171,6 +205,28 @@ def generate_test_scenarios():
         )
     )
 
+    # Scenario 8: Unbalanced initial, arrivals solved in batches of 10 VMs
+    scenarios.append(
+        TestConfig(
+            name="unbalanced_initial_batched",
+            num_vms=100,
+            clusters=["c1", "c2", "c3"],
+            cluster_capacity={
+                "c1": {"cpu": 100.0, "mem": 100.0, "disk": 100.0},
+                "c2": {"cpu": 100.0, "mem": 100.0, "disk": 100.0},
+                "c3": {"cpu": 100.0, "mem": 100.0, "disk": 100.0},
+            },
+            initial_usage={
+                "c1": {"cpu": 0.4, "mem": 0.3, "disk": 0.2},
+                "c2": {"cpu": 0.2, "mem": 0.5, "disk": 0.3},
+                "c3": {"cpu": 0.1, "mem": 0.2, "disk": 0.4},
+            },
+            vm_demand_ranges={"cpu": (0.01, 1), "mem": (0.05, 2), "disk": (0.1, 3)},
+            optimizer_model=MinUtilizationOptimizer,
+            batch_size=10,
+        )
+    )
+
     scenarios[-1].is_last = True
     for scenario in scenarios[:-1]:
         scenario.is_last = False
@@ -0,0 +1,198 @@
+"""
+Replay recorded VM workloads through SequentialPlacementSimulation.
+
+A trace is a CSV file (optionally gzip-compressed, .csv.gz) or a Parquet
+file (needs pyarrow) with one VM per row, sorted by arrival time:
+
+    vm,arrival,cpu,mem,disk,departure
+    vm1,0.0,2.0,4.0,10.0,3600.0
+    vm2,0.4,1.0,2.0,5.0,
+
+departure (absolute) or lifetime (relative to arrival) is optional; an
+empty value means the VM never leaves. Rows are streamed, so traces larger
+than memory can be replayed.
+
+Usage:
+    python -m src.services.trace_replay trace.csv.gz
+        [--optimizer MinUtilizationOptimizer --optimizer MaxMinResidualOptimizer]
+        [--scenario balanced_clusters] [--batch-size 1] [--speed 60]
+"""
+
+import argparse
+import copy
+import csv
+import gzip
+import logging
+
+from src.services.sequential_placement import RESOURCES, SequentialPlacementSimulation
+from src.services.utils import configure_logging
+
+logger = logging.getLogger(__name__)
+
+TRACE_COLUMNS = ["vm", "arrival", *RESOURCES]
+
+# Parquet rows are read in record batches of this many rows
+PARQUET_BATCH_SIZE = 65536
+
+
+def read_trace(path, resources=None):
+    """
+    Yield (vm, arrival, {resource: demand}, departure or None) for every row
+    of a trace file, in file order. Raises ValueError on a missing column or
+    an arrival earlier than the previous one.
+    """
+    resources = list(resources or RESOURCES)
+    rows = read_parquet_rows(path) if path.endswith(".parquet") else read_csv_rows(path)
+    header = next(rows)
+    missing = [c for c in ["vm", "arrival", *resources] if c not in header]
+    if missing:
+        raise ValueError(f"{path}: trace has no {', '.join(missing)} column")
+    index = {c: j for j, c in enumerate(header)}
+    vm_col, arrival_col = index["vm"], index["arrival"]
+    demand_cols = [(r, index[r]) for r in resources]
+    departure_col = index.get("departure")
+    lifetime_col = index.get("lifetime")
+
+    last = float("-inf")
+    for line, row in enumerate(rows, 2):
+        arrival = float(row[arrival_col])
+        if arrival < last:
+            raise ValueError(
+                f"{path}:{line}: arrival {arrival} is before the previous one {last}"
+            )
+        last = arrival
+        departure = None
+        if departure_col is not None and row[departure_col] not in ("", None):
+            departure = float(row[departure_col])
+        elif lifetime_col is not None and row[lifetime_col] not in ("", None):
+            departure = arrival + float(row[lifetime_col])
+        yield (
+            str(row[vm_col]),
+            arrival,
+            {r: float(row[j]) for r, j in demand_cols},
+            departure,
+        )
+
+
+def read_csv_rows(path):
+    """Header, then every row of a CSV or gzip-compressed CSV file"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", newline="") as f:
+        yield from csv.reader(f)
+
+
+def read_parquet_rows(path):
+    """Header, then every row of a Parquet file, one record batch at a time"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Reading Parquet traces requires pyarrow") from e
+
+    parquet = pq.ParquetFile(path)
+    yield parquet.schema_arrow.names
+    for batch in parquet.iter_batches(batch_size=PARQUET_BATCH_SIZE):
+        yield from zip(*(column.to_pylist() for column in batch.columns))
+
+
+def write_trace(path, rows):
+    """
+    Write (vm, arrival, {resource: demand}, departure or None) rows as a CSV
+    trace (gzip-compressed for a .gz path)
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([*TRACE_COLUMNS, "departure"])
+        for vm, arrival, demand, departure in rows:
+            writer.writerow(
+                [
+                    vm,
+                    repr(arrival),
+                    *(repr(demand[r]) for r in RESOURCES),
+                    "" if departure is None else repr(departure),
+                ]
+            )
+
+
+def replay(config, path, speed=None):
+    """
+    Replay the trace at path with config's clusters, optimizer and batching;
+    returns the simulation summary. speed=None replays at full speed,
+    otherwise one simulated second takes 1/speed wall-clock seconds.
+    """
+    simulation = SequentialPlacementSimulation(
+        config,
+        None,
+        keep_history=False,
+        trace=read_trace(path),
+        speed=speed,
+        stop_on_failure=False,
+    )
+    return simulation.run_simulation()
+
+
+def main():
+    from src.services.placement_service import OPTIMIZERS
+    from src.services.test_config import generate_test_scenarios
+
+    parser = argparse.ArgumentParser(description="Replay a VM workload trace")
+    parser.add_argument("trace", help="CSV, .csv.gz or .parquet trace file")
+    parser.add_argument(
+        "--optimizer",
+        action="append",
+        choices=OPTIMIZERS,
+        help="Optimizer to replay with (repeatable; default: the scenario's)",
+    )
+    parser.add_argument(
+        "--scenario",
+        default="balanced_clusters",
+        help="Test scenario providing clusters, capacity and initial usage",
+    )
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--batch-window", type=float, help="Simulated seconds")
+    parser.add_argument(
+        "--speed", type=float, help="Simulated seconds per wall-clock second"
+    )
+    parser.add_argument("--time-limit", type=float, help="Seconds per solve")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-v", "--verbose", action="count", default=0)
+    args = parser.parse_args()
+    configure_logging(args.verbose)
+
+    scenarios = {s.name: s for s in generate_test_scenarios()}
+    if args.scenario not in scenarios:
+        parser.error(f"Unknown scenario {args.scenario!r}: {sorted(scenarios)}")
+    base = scenarios[args.scenario]
+    base.batch_size = args.batch_size
+    base.batch_window = args.batch_window
+    base.time_limit = args.time_limit
+    base.seed = args.seed
+    optimizers = [OPTIMIZERS[name] for name in args.optimizer or []] or [
+        base.optimizer_model
+    ]
+
+    print(
+        f"{'optimizer':<28} {'placed':>8} {'rejected':>8} {'vms/s':>8} "
+        f"{'p50 ms':>8} {'p99 ms':>8} {'peak':>6}"
+    )
+    for optimizer_class in optimizers:
+        config = copy.copy(base)
+        config.optimizer_model = optimizer_class
+        summary = replay(config, args.trace, speed=args.speed)
+        latency = summary["latency"] or {"p50": 0.0, "p99": 0.0}
+        final_metrics = summary["final_metrics"]
+        peak = (
+            final_metrics["overall_metrics"]["max_utilization"]
+            if final_metrics
+            else 0.0
+        )
+        print(
+            f"{optimizer_class.__name__:<28} {summary['vms_placed']:>8} "
+            f"{summary['rejected_vms']:>8} {summary['throughput']:8.0f} "
+            f"{latency['p50'] * 1000:8.3f} {latency['p99'] * 1000:8.3f} "
+            f"{peak:6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,30 @@
+import logging
 import os
 import uuid
 from datetime import datetime
 
+LOG_LEVELS = [logging.WARNING, logging.INFO, logging.DEBUG]
+
+
+def configure_logging(verbosity=0):
+    """
+    Configure logging for the src package. 0 (default) only reports warnings,
+    1 adds one line per placement (INFO) and 2 dumps model and state details
+    (DEBUG).
+    """
+    level = LOG_LEVELS[max(0, min(verbosity, len(LOG_LEVELS) - 1))]
+    init_worker_logging(level)
+    return level
+
+
+def init_worker_logging(log_level):
+    """
+    Log the src package at log_level; also the process pool initializer that
+    gives workers their parent's level
+    """
+    logging.basicConfig(format="%(message)s", level=logging.WARNING)
+    logging.getLogger("src").setLevel(log_level)
+
 
 class OutputManager:
     def __init__(self):
@@ -9,6 +32,14 @@ class OutputManager:
         self.run_id = self._generate_run_id()
         self.output_dir = self._create_output_dir()
 
+    @classmethod
+    def from_run_dir(cls, run_dir):
+        """Output manager writing into an existing run directory"""
+        manager = cls.__new__(cls)
+        manager.base_dir, manager.run_id = os.path.split(os.path.normpath(run_dir))
+        manager.output_dir = manager._create_output_dir()
+        return manager
+
     def _generate_run_id(self):
         """Generate a unique run ID using timestamp and UUID"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
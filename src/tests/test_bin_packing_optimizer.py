@@ -0,0 +1,115 @@
+import copy
+
+import numpy as np
+import pytest
+
+from src.models.bin_packing_optimizer import (
+    BestFitOptimizer,
+    DotProductOptimizer,
+    FirstFitDecreasingOptimizer,
+    MaxMinResidualOptimizer,
+)
+from src.models.min_max_optimizer import MinUtilizationOptimizer
+
+RESOURCES = ["cpu", "mem", "disk"]
+HEURISTICS = [
+    FirstFitDecreasingOptimizer,
+    BestFitOptimizer,
+    DotProductOptimizer,
+    MaxMinResidualOptimizer,
+]
+
+
+def usage(cpu, mem, disk):
+    return {"cpu": cpu, "mem": mem, "disk": disk}
+
+
+@pytest.mark.parametrize(
+    "optimizer_class, expected",
+    [
+        # cA is the first cluster that fits
+        (FirstFitDecreasingOptimizer, "cA"),
+        # cB is left with the smallest free shares (0.2, 0.45, 0.45)
+        (BestFitOptimizer, "cB"),
+        # cC has the most free CPU, which the VM mostly needs
+        (DotProductOptimizer, "cC"),
+        # cD ends with the lowest peak, 40%
+        (MaxMinResidualOptimizer, "cD"),
+    ],
+)
+def test_each_heuristic_picks_its_cluster(optimizer_class, expected):
+    clusters = ["cA", "cB", "cC", "cD"]
+    optimizer = optimizer_class(
+        clusters,
+        {},
+        ["vm1"],
+        {
+            "cA": usage(0.65, 0.1, 0.1),
+            "cB": usage(0.5, 0.5, 0.5),
+            "cC": usage(0.0, 0.9, 0.0),
+            "cD": usage(0.1, 0.3, 0.3),
+        },
+        {c: dict.fromkeys(RESOURCES, 100.0) for c in clusters},
+        {"vm1": usage(30.0, 5.0, 5.0)},
+        seed=0,
+    )
+
+    placement_plan, _, _, final_placement = optimizer.optimize()
+
+    assert placement_plan == {"vm1": expected}
+    assert final_placement[expected] == ["vm1"]
+
+
+@pytest.mark.parametrize("optimizer_class", HEURISTICS)
+def test_batch_placement_is_feasible_and_leaves_inputs_alone(
+    basic_config, optimizer_class
+):
+    rng = np.random.default_rng(0)
+    vm_demand = {
+        f"vm{k}": dict(zip(RESOURCES, rng.uniform(2.0, 12.0, 3).tolist()))
+        for k in range(8)
+    }
+    initial_usage = copy.deepcopy(basic_config.initial_usage)
+    optimizer = optimizer_class(
+        basic_config.clusters,
+        {"old": "c1"},
+        list(vm_demand),
+        basic_config.initial_usage,
+        basic_config.cluster_capacity,
+        vm_demand,
+        seed=0,
+    )
+
+    placement_plan, cluster_utilization, z, final_placement = optimizer.optimize()
+
+    assert set(placement_plan) == set(vm_demand)
+    assert "old" in final_placement["c1"]
+    expected = optimizer.calculate_utilization(None, placement_plan)
+    for c in basic_config.clusters:
+        assert cluster_utilization[c] == pytest.approx(expected[c])
+    assert z == pytest.approx(max(max(u.values()) for u in expected.values()))
+    assert basic_config.initial_usage == initial_usage
+
+    # No heuristic beats the exact min-max placement
+    mip_z = MinUtilizationOptimizer(
+        basic_config.clusters,
+        {},
+        list(vm_demand),
+        basic_config.initial_usage,
+        basic_config.cluster_capacity,
+        vm_demand,
+    ).optimize()[2]
+    assert z >= mip_z - 1e-6
+
+
+@pytest.mark.parametrize("optimizer_class", HEURISTICS)
+def test_unplaceable_vm_fails_the_batch(basic_config, optimizer_class):
+    optimizer = optimizer_class(
+        basic_config.clusters,
+        {},
+        ["vm1", "vm2"],
+        basic_config.initial_usage,
+        basic_config.cluster_capacity,
+        {"vm1": usage(5.0, 5.0, 5.0), "vm2": usage(95.0, 5.0, 5.0)},
+    )
+    assert optimizer.optimize() == (None, None, None, None)
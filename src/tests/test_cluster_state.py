@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from src.models.baseline_optimizer import BaselineOptimizer
+from src.models.cluster_state import ClusterState
+from src.services.metrics import PlacementMetrics
+
+
+@pytest.fixture
+def state(basic_config):
+    return ClusterState.from_dicts(
+        basic_config.clusters,
+        basic_config.initial_usage,
+        basic_config.cluster_capacity,
+    )
+
+
+def test_cluster_state_round_trip_is_lossless(basic_config, state):
+    assert state.usage.dtype == np.float64
+    assert state.usage.shape == (2, 3)
+    assert state.to_usage_dict() == basic_config.initial_usage
+    assert state.to_capacity_dict() == basic_config.cluster_capacity
+    assert state.cluster_index == {"c1": 0, "c2": 1}
+    assert state.resource_index == {"cpu": 0, "mem": 1, "disk": 2}
+
+
+def test_cluster_state_feasibility_and_place(state):
+    vm_demand = {"vm1": {"cpu": 75.0, "mem": 10.0, "disk": 10.0}}
+    demand = state.demand_matrix(vm_demand)[0]
+
+    # c1 is at 20% CPU, c2 at 30%: only c1 can take 75 more CPU units
+    assert state.feasible_mask(demand).tolist() == [True, False]
+
+    state.place("c1", demand)
+    assert state.usage[0].tolist() == pytest.approx([0.95, 0.4, 0.3])
+    state.release(0, demand)
+    assert state.usage[0].tolist() == pytest.approx([0.2, 0.3, 0.2])
+
+
+def test_metrics_from_cluster_state_match_dicts(basic_config, state):
+    from_dicts = PlacementMetrics()
+    from_dicts.calculate_metrics(basic_config.initial_usage, 1.0)
+    from_state = PlacementMetrics()
+    from_state.calculate_metrics(state, 1.0)
+
+    assert from_state.overall_imbalance == pytest.approx(from_dicts.overall_imbalance)
+    for resource, metrics in from_dicts.resources.items():
+        state_metrics = from_state.resources[resource]
+        assert state_metrics.max_utilization == metrics.max_utilization
+        assert state_metrics.avg_utilization == pytest.approx(metrics.avg_utilization)
+        assert state_metrics.std_dev == pytest.approx(metrics.std_dev)
+        assert state_metrics.cluster_distribution == metrics.cluster_distribution
+
+
+def test_baseline_optimizer_from_state(basic_config, state):
+    vm_demand = {"vm1": {"cpu": 10.0, "mem": 20.0, "disk": 15.0}}
+    optimizer = BaselineOptimizer.from_state(state, {}, ["vm1"], vm_demand)
+
+    placement_plan, cluster_utilization, _, _ = optimizer.solve()
+
+    assert placement_plan == {"vm1": "c1"}
+    assert cluster_utilization["c1"]["cpu"] == pytest.approx(0.3)
+    # The optimizer works on a copy of the caller's state
+    assert state.usage[0, 0] == pytest.approx(0.2)
+    assert optimizer.state.usage[0, 0] == pytest.approx(0.3)
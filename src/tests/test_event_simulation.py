@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from src.models.baseline_optimizer import BaselineOptimizer
+from src.models.bin_packing_optimizer import FirstFitDecreasingOptimizer
+from src.models.greedy_engine import cpu_utilization, first_fit, peak_after
+from src.models.min_max_optimizer import MinUtilizationOptimizer
+from src.services.event_simulation import (
+    EventDrivenSimulation,
+    lifetime_sampler,
+    placement_score,
+)
+
+
+def test_placement_score_follows_the_optimizer():
+    assert placement_score(MinUtilizationOptimizer) is peak_after
+    assert placement_score(BaselineOptimizer) is cpu_utilization
+    assert placement_score(FirstFitDecreasingOptimizer) is first_fit
+
+
+def test_lifetime_samplers():
+    rng = np.random.default_rng(0)
+    assert lifetime_sampler(None) is None
+    assert lifetime_sampler(("fixed", 2))(rng, 3).tolist() == [2.0, 2.0, 2.0]
+    for spec in [("exponential", 4.0), ("lognormal", 4.0, 0.5), ("uniform", 2, 6)]:
+        assert lifetime_sampler(spec)(rng, 100_000).mean() == pytest.approx(
+            4.0, rel=0.02
+        )
+    with pytest.raises(ValueError):
+        lifetime_sampler(("weibull", 1.0))
+
+
+def test_without_lifetimes_usage_only_grows(basic_config):
+    basic_config.seed = 0
+    simulation = EventDrivenSimulation(basic_config)
+    summary = simulation.run_simulation()
+
+    assert summary["departures"] == 0
+    assert summary["arrivals"] == basic_config.num_vms
+    assert summary["vms_placed"] + summary["rejected"] == basic_config.num_vms
+    assert summary["live_vms"] == summary["vms_placed"]
+    assert summary["events"] == basic_config.num_vms
+
+
+def test_departures_release_their_usage(basic_config):
+    # One arrival per second, each leaving half a second later
+    basic_config.seed = 0
+    basic_config.lifetime = ("fixed", 0.5)
+    simulation = EventDrivenSimulation(basic_config)
+    initial = simulation.state.usage.copy()
+    summary = simulation.run_simulation()
+
+    assert summary["max_live_vms"] == 1
+    assert summary["departures"] == basic_config.num_vms - 1
+    assert summary["events"] == 2 * basic_config.num_vms - 1
+    # Only the last VM, which has not departed yet, is still counted
+    assert summary["live_vms"] == 1
+    assert np.all(simulation.state.usage >= initial - 1e-12)
+    assert simulation.state.usage.sum() > initial.sum()
+    # Arrivals at t = 1..10, nine of them live for half a second by t = 10
+    assert summary["simulated_time"] == pytest.approx(basic_config.num_vms)
+    assert summary["mean_live_vms"] == pytest.approx(0.45)
+
+
+def test_steady_state_follows_littles_law(basic_config):
+    basic_config.seed = 0
+    basic_config.num_vms = 20_000
+    basic_config.arrival_rate = 10.0
+    basic_config.lifetime = ("exponential", 5.0)
+    basic_config.cluster_capacity = {
+        c: dict.fromkeys(["cpu", "mem", "disk"], 1e4) for c in basic_config.clusters
+    }
+    simulation = EventDrivenSimulation(basic_config, warmup=100.0)
+    summary = simulation.run_simulation()
+
+    assert summary["rejected"] == 0
+    assert summary["mean_live_vms"] == pytest.approx(50.0, rel=0.1)
+    assert summary["latency"]["count"] == basic_config.num_vms
+    assert len(simulation.samples) == pytest.approx(1000, rel=0.05)
+
+
+def test_full_clusters_reject_and_keep_going(basic_config):
+    basic_config.seed = 0
+    basic_config.num_vms = 200
+    basic_config.lifetime = ("exponential", 20.0)
+    summary = EventDrivenSimulation(basic_config).run_simulation()
+
+    assert summary["rejected"] > 0
+    assert summary["departures"] > 0
+    assert summary["arrivals"] == 200
+    assert summary["max_peak_utilization"] <= 1.0 + 1e-9
+
+
+def test_seeded_runs_are_reproducible(basic_config):
+    basic_config.seed = 3
+    basic_config.lifetime = ("lognormal", 5.0, 1.0)
+    first = EventDrivenSimulation(basic_config).run_simulation()
+    second = EventDrivenSimulation(basic_config).run_simulation()
+
+    for key in ["events", "vms_placed", "departures", "final_utilization"]:
+        assert first[key] == second[key]
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from src.models.baseline_optimizer import BaselineOptimizer
+from src.models.baseline_optimizer_inv import BaselineOptimizerInv
+from src.models.cluster_state import ClusterState
+from src.models.greedy_engine import (
+    GreedyPlacementEngine,
+    cpu_available,
+    peak_after,
+    utilization_added,
+)
+
+
+def make_state(num_clusters, usage=0.5):
+    return ClusterState(
+        [f"c{i + 1}" for i in range(num_clusters)],
+        np.full((num_clusters, 3), 100.0),
+        np.full((num_clusters, 3), usage),
+    )
+
+
+def test_engine_selects_lowest_cpu_feasible_cluster():
+    state = ClusterState(
+        ["c1", "c2", "c3"],
+        np.full((3, 3), 100.0),
+        [[0.1, 0.95, 0.1], [0.3, 0.2, 0.2], [0.2, 0.2, 0.2]],
+    )
+    engine = GreedyPlacementEngine(state, seed=0)
+
+    # c1 has the lowest CPU but no memory left for 10 units
+    assert engine.select(np.array([10.0, 10.0, 10.0])) == 2
+    assert engine.select(np.array([10.0, 90.0, 10.0])) is None
+
+
+def test_engine_tie_break_is_seeded():
+    demands = np.full((50, 3), 1.0)
+
+    def assignments(seed):
+        return GreedyPlacementEngine(make_state(8), seed=seed).place_batch(demands)
+
+    assert np.array_equal(assignments(42), assignments(42))
+    # Ties are spread over all the equally loaded clusters
+    assert len(set(assignments(42).tolist())) == 8
+
+
+def test_engine_place_batch_marks_unplaceable_vms():
+    state = make_state(2, usage=0.9)
+    engine = GreedyPlacementEngine(state, score=cpu_available, seed=0)
+
+    assignments = engine.place_batch([[5.0, 5.0, 5.0], [50.0, 1.0, 1.0]])
+
+    assert assignments[0] in (0, 1)
+    assert assignments[1] == -1
+    assert state.usage[assignments[0], 0] == np.float64(0.9) + 5.0 / 100.0
+
+
+def test_baseline_optimizers_use_engine(basic_config):
+    vm_demand = {
+        "vm1": {"cpu": 10.0, "mem": 20.0, "disk": 15.0},
+        "vm2": {"cpu": 5.0, "mem": 5.0, "disk": 5.0},
+    }
+
+    for optimizer_class in (BaselineOptimizer, BaselineOptimizerInv):
+        usage = {c: dict(u) for c, u in basic_config.initial_usage.items()}
+        optimizer = optimizer_class(
+            basic_config.clusters,
+            {},
+            ["vm1", "vm2"],
+            usage,
+            basic_config.cluster_capacity,
+            vm_demand,
+            seed=0,
+        )
+        placement_plan, cluster_utilization, final_utilization, _ = optimizer.solve()
+
+        assert set(placement_plan) == {"vm1", "vm2"}
+        assert cluster_utilization == optimizer.state.to_usage_dict()
+        assert final_utilization == max(
+            max(u.values()) for u in cluster_utilization.values()
+        )
+        # The caller's usage is not updated; the caller applies the plan
+        assert usage == basic_config.initial_usage
+
+    # c1 has the lowest CPU utilization (20%)
+    optimizer = BaselineOptimizer(
+        basic_config.clusters,
+        {},
+        ["vm1"],
+        basic_config.initial_usage,
+        basic_config.cluster_capacity,
+        vm_demand,
+    )
+    assert optimizer.select_best_cluster("vm1") == "c1"
+
+
+def test_demand_aware_scores():
+    state = ClusterState(
+        ["c1", "c2"],
+        [[100.0, 100.0, 100.0], [400.0, 400.0, 400.0]],
+        [[0.1, 0.1, 0.1], [0.2, 0.2, 0.2]],
+    )
+    demand = np.array([40.0, 0.0, 0.0])
+
+    # 40 units take c1 to 50% CPU but c2 only to 30%
+    assert peak_after(state, demand) == pytest.approx([0.5, 0.3])
+    assert GreedyPlacementEngine(state, score=peak_after).select(demand) == 1
+    assert utilization_added(state, demand) == pytest.approx([0.4, 0.1])
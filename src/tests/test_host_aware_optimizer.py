@@ -0,0 +1,158 @@
+import numpy as np
+import pytest
+
+from src.models.host_aware_optimizer import HostAwareOptimizer
+
+RESOURCES = ["cpu", "mem", "disk"]
+
+
+class FlatHostAwareOptimizer(HostAwareOptimizer):
+    decompose = False
+
+
+def units(value):
+    return dict.fromkeys(RESOURCES, value)
+
+
+def make_fleet(num_clusters, hosts_per_cluster, seed=0):
+    rng = np.random.default_rng(seed)
+    clusters = [f"c{i + 1}" for i in range(num_clusters)]
+    hosts = [f"{c}h{j + 1}" for c in clusters for j in range(hosts_per_cluster)]
+    host_cluster = {h: h.split("h")[0] for h in hosts}
+    host_capacity = {h: units(100.0) for h in hosts}
+    vm_demand = {}
+    existing_placements = {}
+    for k, h in enumerate(hosts):
+        vm = f"old{k}"
+        vm_demand[vm] = dict(zip(RESOURCES, rng.uniform(10.0, 60.0, 3).tolist()))
+        existing_placements[vm] = h
+    new_vms = [f"vm{k}" for k in range(8)]
+    for vm in new_vms:
+        vm_demand[vm] = dict(zip(RESOURCES, rng.uniform(5.0, 25.0, 3).tolist()))
+    return clusters, hosts, host_cluster, host_capacity, existing_placements, vm_demand
+
+
+def host_loads(optimizer, placement_plan):
+    loads = {h: np.zeros(3) for h in optimizer.hosts}
+    placements = {**optimizer.existing_placements, **placement_plan}
+    for vm, h in placements.items():
+        loads[h] += [optimizer.vm_demand[vm][r] for r in RESOURCES]
+    return loads
+
+
+def test_host_aggregates_and_cluster_defaults():
+    optimizer = HostAwareOptimizer(
+        ["c1", "c2"],
+        {"old1": "h1", "old2": "h1", "old3": "h3"},
+        [],
+        None,
+        None,
+        {"old1": units(10.0), "old2": units(20.0), "old3": units(5.0)},
+        ["h1", "h2", "h3"],
+        {"h1": units(100.0), "h2": units(100.0), "h3": units(50.0)},
+        {"h1": "c1", "h2": "c1", "h3": "c2"},
+    )
+
+    assert optimizer.host_used[:, 0].tolist() == [30.0, 0.0, 5.0]
+    assert optimizer.cluster_capacity["c1"]["cpu"] == 200.0
+    assert optimizer.current_usage["c1"]["mem"] == pytest.approx(0.15)
+    assert optimizer.current_usage["c2"]["disk"] == pytest.approx(0.1)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_decomposition_matches_flat_model(seed):
+    clusters, hosts, host_cluster, host_capacity, existing, vm_demand = make_fleet(
+        3, 4, seed
+    )
+    new_vms = [vm for vm in vm_demand if vm.startswith("vm")]
+    results = {}
+    for optimizer_class in (HostAwareOptimizer, FlatHostAwareOptimizer):
+        optimizer = optimizer_class(
+            clusters,
+            existing,
+            new_vms,
+            None,
+            None,
+            vm_demand,
+            hosts,
+            host_capacity,
+            host_cluster,
+            seed=0,
+        )
+        placement_plan, cluster_utilization, z, final_placement = optimizer.optimize()
+
+        assert set(placement_plan) == set(new_vms)
+        for load in host_loads(optimizer, placement_plan).values():
+            assert np.all(load <= 100.0 + 1e-9)
+        assert max(max(u.values()) for u in cluster_utilization.values()) == (
+            pytest.approx(z, abs=1e-6)
+        )
+        assert sum(len(vms) for vms in final_placement.values()) == len(existing) + 8
+        results[optimizer_class] = z
+
+    assert results[HostAwareOptimizer] == pytest.approx(
+        results[FlatHostAwareOptimizer], rel=1e-3
+    )
+
+
+def test_fragmented_cluster_is_excluded_after_failed_packing():
+    # c1 is the least loaded cluster overall, but after vm1 and vm2 every host
+    # of c1 has only 10 units free: vm3 must go to the busier c2
+    optimizer = HostAwareOptimizer(
+        ["c1", "c2"],
+        {"old1": "h3", "old2": "h4"},
+        ["vm1", "vm2", "vm3"],
+        None,
+        None,
+        {
+            "old1": units(50.0),
+            "old2": units(75.0),
+            "vm1": units(50.0),
+            "vm2": units(50.0),
+            "vm3": units(20.0),
+        },
+        ["h1", "h2", "h3", "h4"],
+        {"h1": units(60.0), "h2": units(60.0), "h3": units(60.0), "h4": units(100.0)},
+        {"h1": "c1", "h2": "c1", "h3": "c1", "h4": "c2"},
+        time_limit=5.0,
+        mip_gap=0.01,
+    )
+
+    placement_plan, cluster_utilization, z, _ = optimizer.optimize()
+
+    assert placement_plan["vm3"] == "h4"
+    assert {placement_plan["vm1"], placement_plan["vm2"]} == {"h1", "h2"}
+    assert z == pytest.approx(0.95)
+    assert optimizer.x["vm3", "c1"].ub == 0
+    assert optimizer.time_limit == 5.0 and optimizer.hit_limit is False
+
+
+def test_vm_larger_than_every_host_is_infeasible():
+    optimizer = HostAwareOptimizer(
+        ["c1"],
+        {},
+        ["vm1"],
+        None,
+        None,
+        {"vm1": units(80.0)},
+        ["h1", "h2"],
+        {"h1": units(50.0), "h2": units(50.0)},
+        {"h1": "c1", "h2": "c1"},
+    )
+
+    assert optimizer.optimize() == (None, None, None, None)
+
+
+def test_placed_vms_need_a_demand():
+    with pytest.raises(ValueError, match="old1"):
+        HostAwareOptimizer(
+            ["c1"],
+            {"old1": "h1"},
+            ["vm1"],
+            None,
+            None,
+            {"vm1": units(10.0)},
+            ["h1"],
+            {"h1": units(50.0)},
+            {"h1": "c1"},
+        )
@@ -0,0 +1,159 @@
+import time
+
+import numpy as np
+import pytest
+
+from src.models.local_search_optimizer import LocalSearchOptimizer
+from src.models.min_max_optimizer import MinUtilizationOptimizer
+
+RESOURCES = ["cpu", "mem", "disk"]
+
+
+class BoundlessLocalSearchOptimizer(LocalSearchOptimizer):
+    mip_bound_variables = 0
+
+
+class GreedyLocalSearchOptimizer(LocalSearchOptimizer):
+    stall_limit = 0
+
+
+def make_batch(num_vms, num_clusters, seed=0):
+    rng = np.random.default_rng(seed)
+    clusters = [f"c{i + 1}" for i in range(num_clusters)]
+    new_vms = [f"vm{k}" for k in range(num_vms)]
+    vm_demand = {
+        vm: dict(zip(RESOURCES, rng.uniform(5.0, 20.0, 3).tolist())) for vm in new_vms
+    }
+    usage = rng.uniform(0.1, 0.4, (num_clusters, 3))
+    capacity = 25.0 * num_vms * rng.uniform(0.5, 1.5, (num_clusters, 3))
+    capacity /= num_clusters * (1.0 - usage)
+    return (
+        clusters,
+        {},
+        new_vms,
+        {c: dict(zip(RESOURCES, row)) for c, row in zip(clusters, usage.tolist())},
+        {c: dict(zip(RESOURCES, row)) for c, row in zip(clusters, capacity.tolist())},
+        vm_demand,
+    )
+
+
+def check_placement(optimizer, result):
+    placement_plan, cluster_utilization, z, final_placement = result
+    assert set(placement_plan) == set(optimizer.new_vms)
+    assert sum(len(vms) for vms in final_placement.values()) == len(placement_plan)
+
+    # Utilizations are recomputed from the plan, not taken from the search
+    expected = optimizer.calculate_utilization(None, placement_plan)
+    for c in optimizer.clusters:
+        assert cluster_utilization[c] == pytest.approx(expected[c])
+        assert max(expected[c].values()) <= 1.0 + 1e-9
+    assert z == pytest.approx(max(max(u.values()) for u in expected.values()))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_small_batch_matches_the_mip(seed):
+    batch = make_batch(30, 3, seed)
+    optimizer = LocalSearchOptimizer(*batch, seed=0, solver="docplex")
+    result = optimizer.optimize()
+    check_placement(optimizer, result)
+
+    mip_z = MinUtilizationOptimizer(*batch, solver="docplex").optimize()[2]
+    assert result[2] == pytest.approx(mip_z, rel=1e-2)
+    # The MIP bound is solved from the local search result
+    assert optimizer.mip_bound is not None
+    assert optimizer.bound <= mip_z + 1e-6
+    assert optimizer.gap == pytest.approx((result[2] - optimizer.bound) / result[2])
+
+
+@pytest.mark.parametrize("solver", ["docplex", "numpy"])
+def test_better_mip_incumbent_replaces_the_search(solver):
+    # Largest first gives peaks 7% / 5%; the optimum splits 3+3 / 2+2+2
+    clusters = ["c1", "c2"]
+    vm_demand = {
+        f"vm{k}": dict.fromkeys(RESOURCES, units)
+        for k, units in enumerate([3.0, 3.0, 2.0, 2.0, 2.0])
+    }
+    optimizer = GreedyLocalSearchOptimizer(
+        clusters,
+        {},
+        list(vm_demand),
+        {c: dict.fromkeys(RESOURCES, 0.0) for c in clusters},
+        {c: dict.fromkeys(RESOURCES, 100.0) for c in clusters},
+        vm_demand,
+        seed=0,
+        solver=solver,
+    )
+    result = optimizer.optimize()
+
+    check_placement(optimizer, result)
+    assert result[2] == pytest.approx(0.06)
+    assert optimizer.gap == pytest.approx(0.0, abs=1e-6)
+
+
+def test_mip_time_limit_is_reported():
+    # The search ends at once; the MIP cannot be proven within the budget
+    batch = make_batch(30, 3)
+    optimizer = GreedyLocalSearchOptimizer(
+        *batch, seed=0, solver="numpy", time_limit=0.05
+    )
+    check_placement(optimizer, optimizer.optimize())
+    assert optimizer.mip_hit_limit
+    assert optimizer.hit_limit
+
+    optimizer = GreedyLocalSearchOptimizer(
+        *batch, seed=0, solver="docplex", time_limit=5.0
+    )
+    optimizer.optimize()
+    assert not optimizer.mip_hit_limit
+    assert not optimizer.hit_limit
+
+
+def test_large_batch_within_budget_and_above_bound():
+    batch = make_batch(3000, 12)
+    optimizer = BoundlessLocalSearchOptimizer(*batch, seed=0, time_limit=0.5)
+
+    start = time.perf_counter()
+    result = optimizer.optimize()
+    elapsed = time.perf_counter() - start
+
+    check_placement(optimizer, result)
+    greedy = BoundlessLocalSearchOptimizer(*batch, seed=0)
+    greedy.create_model()
+    greedy.initial_assignment()
+    assert result[2] <= greedy.work.peak_utilization()
+    assert optimizer.mip_bound is None
+    assert optimizer.bound <= result[2]
+    assert optimizer.moves + optimizer.swaps > 0
+    assert elapsed < 0.5 + 1.0
+
+
+def test_lower_bounds_on_a_known_instance():
+    # Two equal clusters at 50%/10%/10% and one VM of 20 CPU units: the VM
+    # alone forces z >= 0.7, the aggregate bound is only 0.6
+    optimizer = LocalSearchOptimizer(
+        ["c1", "c2"],
+        {},
+        ["vm1"],
+        {c: {"cpu": 0.5, "mem": 0.1, "disk": 0.1} for c in ["c1", "c2"]},
+        {c: dict.fromkeys(RESOURCES, 100.0) for c in ["c1", "c2"]},
+        {"vm1": {"cpu": 20.0, "mem": 1.0, "disk": 1.0}},
+    )
+    optimizer.create_model()
+    assert optimizer.lower_bound() == pytest.approx(0.7)
+
+    _, _, z, _ = optimizer.optimize()
+    assert z == pytest.approx(0.7)
+    assert optimizer.gap == pytest.approx(0.0, abs=1e-9)
+
+
+def test_vm_that_fits_nowhere_is_infeasible():
+    optimizer = LocalSearchOptimizer(
+        ["c1"],
+        {},
+        ["vm1"],
+        {"c1": dict.fromkeys(RESOURCES, 0.5)},
+        {"c1": dict.fromkeys(RESOURCES, 100.0)},
+        {"vm1": dict.fromkeys(RESOURCES, 60.0)},
+    )
+    assert optimizer.optimize() == (None, None, None, None)
+    assert optimizer.gap is None
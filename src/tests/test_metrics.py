@@ -1,4 +1,13 @@
-from src.services.metrics import PlacementMetrics, ResourceMetrics
+import numpy as np
+import pytest
+
+from src.services.metrics import (
+    IncrementalMetricsTracker,
+    MetricsHistory,
+    PlacementMetrics,
+    ResourceMetrics,
+    latency_summary,
+)
 
 
 def test_resource_metrics_initialization():
@@ -48,3 +57,94 @@ def test_metrics_to_dict():
     assert "resources" in result
     assert "execution_time" in result
     assert "successful" in result
+
+
+def test_incremental_tracker_matches_full_recomputation():
+    rng = np.random.default_rng(0)
+    clusters = ["c1", "c2", "c3", "c4"]
+    usage = {
+        c: dict(zip(["cpu", "mem", "disk"], rng.uniform(size=3))) for c in clusters
+    }
+    # A small history capacity and many updates exercise growth and heap compaction
+    tracker = IncrementalMetricsTracker(clusters, usage, capacity=2)
+
+    for step in range(200):
+        cluster = clusters[rng.integers(len(clusters))]
+        usage[cluster] = dict(zip(["cpu", "mem", "disk"], rng.uniform(size=3)))
+        tracker.set_usage(cluster, list(usage[cluster].values()))
+        assert tracker.record(execution_time=0.5) == step
+
+        expected = PlacementMetrics()
+        expected.calculate_metrics(usage, 0.5)
+        actual = tracker.metrics()
+        assert actual.overall_imbalance == pytest.approx(expected.overall_imbalance)
+        for resource, metrics in expected.resources.items():
+            tracked = actual.resources[resource]
+            assert tracked.max_utilization == metrics.max_utilization
+            assert tracked.avg_utilization == pytest.approx(metrics.avg_utilization)
+            assert tracked.std_dev == pytest.approx(metrics.std_dev, abs=1e-9)
+            assert tracked.cluster_distribution == metrics.cluster_distribution
+
+    assert tracker.history["overall_imbalance"].shape == (200,)
+    assert len(tracker._heaps[0]) <= 4 * len(clusters) + 64
+
+
+def test_incremental_std_dev_does_not_drift():
+    clusters = ["c1", "c2", "c3", "c4"]
+    usage = {c: dict.fromkeys(["cpu", "mem", "disk"], 0.5) for c in clusters}
+    tracker = IncrementalMetricsTracker(clusters, usage)
+
+    # A huge transient value leaves the running sum of squares off by ~1
+    tracker.set_usage("c1", [1e8] * 3)
+    tracker.set_usage("c1", [0.5] * 3)
+    tracker.record()
+    assert np.all(np.isfinite(tracker.history["std_dev"]))
+    assert np.all(tracker.history["std_dev"] >= 0.0)
+
+    # Enough updates to compact the heaps recompute the sums exactly
+    rng = np.random.default_rng(0)
+    for _ in range(4 * len(clusters) + 64):
+        tracker.set_usage(clusters[rng.integers(len(clusters))], rng.uniform(size=3))
+    tracker.record()
+    assert tracker.history["std_dev"][-1] == pytest.approx(
+        tracker.usage.std(axis=0), abs=1e-12
+    )
+
+
+def test_metrics_history_is_a_compact_lazy_view():
+    usage = {
+        "c1": {"cpu": 0.1, "mem": 0.2, "disk": 0.3},
+        "c2": dict.fromkeys(["cpu", "mem", "disk"], 0.5),
+    }
+    tracker = IncrementalMetricsTracker(["c1", "c2"], usage, keep_usage=True)
+    history = MetricsHistory(tracker)
+    for step in range(3):
+        tracker.add_usage("c1", [0.1, 0.1, 0.1])
+        tracker.record(execution_time=step)
+
+    assert not hasattr(PlacementMetrics(), "__dict__")
+    assert not hasattr(ResourceMetrics(), "__dict__")
+    assert len(history) == 3
+    assert [m.execution_time for m in history[1:]] == [1.0, 2.0]
+    # Per-step usage snapshots keep earlier cluster distributions exact
+    first = history[0].to_dict()["resources"]["cpu"]["cluster_distribution"]
+    assert first == pytest.approx({"c1": 0.2, "c2": 0.5})
+    assert list(history.to_dicts())[-1] == history[-1].to_dict()
+
+
+def test_tracker_records_gap_and_latency():
+    usage = {c: dict.fromkeys(["cpu", "mem", "disk"], 0.1) for c in ["c1", "c2"]}
+    tracker = IncrementalMetricsTracker(["c1", "c2"], usage)
+    for step in range(100):
+        tracker.record(execution_time=step / 100, mip_gap=None if step else 0.25)
+    tracker.record(execution_time=5.0, mip_gap=0.01, hit_limit=True)
+
+    assert tracker.metrics(0).mip_gap == 0.25
+    assert tracker.metrics(1).mip_gap is None
+    assert tracker.metrics(1).latency is None
+    last = tracker.metrics(latency=True).to_dict()
+    assert last["hit_limit"] is True
+    assert last["latency"]["count"] == 101
+    assert last["latency"]["max"] == 5.0
+    assert last["latency"]["p50"] == pytest.approx(0.5)
+    assert latency_summary([]) is None
@@ -1,4 +1,9 @@
+import logging
+
+import pytest
+
 from src.models.baseline_optimizer import BaselineOptimizer
+from src.models.incremental_optimizer import IncrementalMinUtilizationOptimizer
 from src.models.min_max_optimizer import MinUtilizationOptimizer
 
 
@@ -46,3 +51,57 @@ def test_optimizer_placement_success(basic_config):
     placement_plan, cluster_utilization, final_utilization, final_placement = result
     assert isinstance(placement_plan, dict)
     assert "vm1" in placement_plan
+
+
+def test_incremental_optimizer_matches_fresh_model(basic_config):
+    vm_demand = {
+        "vm1": {"cpu": 10.0, "mem": 20.0, "disk": 15.0},
+        "vm2": {"cpu": 30.0, "mem": 5.0, "disk": 15.0},
+        "vm3": {"cpu": 12.0, "mem": 8.0, "disk": 25.0},
+    }
+    batches = [["vm1"], ["vm2", "vm3"], ["vm1"]]
+    incremental = IncrementalMinUtilizationOptimizer(
+        basic_config.clusters,
+        {},
+        batches[0],
+        basic_config.initial_usage,
+        basic_config.cluster_capacity,
+        vm_demand,
+    )
+
+    for batch in batches:
+        incremental.update({}, batch, basic_config.initial_usage, vm_demand)
+        fresh = MinUtilizationOptimizer(
+            basic_config.clusters,
+            {},
+            batch,
+            basic_config.initial_usage,
+            basic_config.cluster_capacity,
+            vm_demand,
+        )
+        _, _, incremental_z, _ = incremental.optimize()
+        _, _, fresh_z, _ = fresh.optimize()
+        assert incremental_z == pytest.approx(fresh_z, abs=1e-6)
+
+    # The model grew to two slots and was reused throughout
+    assert incremental.num_slots == 2
+
+
+def test_optimizers_are_quiet_by_default(basic_config, capsys, caplog):
+    def make_optimizer():
+        return BaselineOptimizer(
+            basic_config.clusters,
+            {},
+            ["vm1"],
+            {c: dict(u) for c, u in basic_config.initial_usage.items()},
+            basic_config.cluster_capacity,
+            {"vm1": {"cpu": 10.0, "mem": 20.0, "disk": 15.0}},
+        )
+
+    make_optimizer().optimize()
+    assert capsys.readouterr().out == ""
+
+    with caplog.at_level(logging.DEBUG, logger="src"):
+        make_optimizer().optimize()
+    assert "Placement Summary:" in caplog.messages
+    assert "VM vm1 → Cluster c1" in caplog.messages
@@ -1,6 +1,11 @@
+import copy
+
 import pytest
 
+from src.models.baseline_optimizer import BaselineOptimizer
+from src.models.incremental_optimizer import IncrementalMinUtilizationOptimizer
 from src.services.sequential_placement import SequentialPlacementSimulation
+from test_runner import TestRunner
 
 
 def test_simulation_initialization(basic_config, output_manager):
@@ -42,3 +47,106 @@ def test_full_simulation_run(basic_config, output_manager):
     assert len(simulation.metrics_history) > 0
     assert len(simulation.placement_history) > 0
     assert simulation.total_time > 0
+
+
+def test_batch_arrivals_by_size(basic_config, output_manager):
+    basic_config.batch_size = 4
+    simulation = SequentialPlacementSimulation(basic_config, output_manager)
+    batches = list(simulation.batch_arrivals(simulation.generate_arrivals()))
+
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert [vm for vm, _, _ in batches[0]] == ["vm1", "vm2", "vm3", "vm4"]
+
+
+def test_batch_arrivals_by_window(basic_config, output_manager):
+    basic_config.batch_size = None
+    basic_config.batch_window = 2.5
+    simulation = SequentialPlacementSimulation(basic_config, output_manager)
+    batches = list(simulation.batch_arrivals(simulation.generate_arrivals()))
+
+    # One arrival per simulated second: each window holds arrivals t, t+1, t+2
+    assert [len(batch) for batch in batches] == [3, 3, 3, 1]
+
+
+@pytest.mark.integration
+def test_batched_simulation_run(basic_config, output_manager):
+    basic_config.num_vms = 4
+    basic_config.batch_size = 2
+    simulation = SequentialPlacementSimulation(basic_config, output_manager)
+    summary = simulation.run_simulation()
+
+    assert simulation.batch_sizes == [2, 2]
+    assert summary["vms_placed"] == basic_config.num_vms
+    assert summary["batches"] == 2
+    assert summary["amortized_placement_time"] == pytest.approx(
+        sum(simulation.execution_times) / basic_config.num_vms
+    )
+    assert summary["throughput"] > 0
+
+
+def test_solve_budget_reaches_optimizer_and_summary(basic_config, output_manager):
+    basic_config.num_vms = 4
+    basic_config.batch_size = 2
+    basic_config.time_limit = 5.0
+    basic_config.mip_gap = 0.01
+    simulation = SequentialPlacementSimulation(basic_config, output_manager)
+    summary = simulation.run_simulation()
+
+    assert simulation.optimizer.time_limit == 5.0
+    assert simulation.optimizer.mip_gap == 0.01
+    assert summary["limit_hits"] == 0
+    assert summary["latency"]["count"] == 2
+    assert summary["final_metrics"]["latency"] == summary["latency"]
+    gaps = [m.mip_gap for m in simulation.metrics_history]
+    assert all(0.0 <= gap <= 0.01 + 1e-9 for gap in gaps)
+
+
+@pytest.mark.integration
+def test_incremental_optimizer_reused_across_placements(basic_config, output_manager):
+    basic_config.num_vms = 3
+    basic_config.optimizer_model = IncrementalMinUtilizationOptimizer
+    simulation = SequentialPlacementSimulation(basic_config, output_manager)
+    simulation.run_simulation()
+
+    optimizer = simulation.optimizer
+    assert isinstance(optimizer, IncrementalMinUtilizationOptimizer)
+    assert len(simulation.existing_placements) == 3
+    assert simulation.create_optimizer(["vm4"], {}) is optimizer
+
+
+def test_seeded_simulations_are_reproducible(basic_config, output_manager):
+    basic_config.seed = 7
+    first = SequentialPlacementSimulation(basic_config, output_manager)
+    second = SequentialPlacementSimulation(basic_config, output_manager)
+
+    assert list(first.generate_arrivals()) == list(second.generate_arrivals())
+
+
+@pytest.mark.integration
+def test_parallel_runner_matches_sequential(basic_config):
+    basic_config.num_vms = 4
+    baseline_config = copy.deepcopy(basic_config)
+    baseline_config.name = "test_scenario_baseline"
+    baseline_config.optimizer_model = BaselineOptimizer
+    baseline_config.seed = 4
+
+    results = {}
+    for jobs in (1, 2):
+        runner = TestRunner(jobs=jobs)
+        runner.scenarios = [copy.deepcopy(basic_config), baseline_config]
+        runner.scenarios[0].seed = 3
+        if jobs > 1:
+            runner._run_parallel()
+        else:
+            runner._run_sequential()
+        results[jobs] = runner.results
+
+    assert list(results[2]) == ["test_scenario", "test_scenario_baseline"]
+    for name, sequential in results[1].items():
+        parallel = results[2][name]
+        assert parallel["cluster_distribution"] == sequential["cluster_distribution"]
+        assert parallel["final_utilization"] == sequential["final_utilization"]
+        assert (
+            parallel["final_metrics"]["resources"]
+            == sequential["final_metrics"]["resources"]
+        )
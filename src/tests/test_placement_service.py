@@ -0,0 +1,189 @@
+import asyncio
+
+import pytest
+
+from src.models.bin_packing_optimizer import MaxMinResidualOptimizer
+from src.models.min_max_optimizer import MinUtilizationOptimizer
+from src.services.placement_service import (
+    PlacementClient,
+    PlacementError,
+    PlacementService,
+)
+
+
+def vm(cpu, mem=5.0, disk=5.0):
+    return {"cpu": cpu, "mem": mem, "disk": disk}
+
+
+def make_service(basic_config, **kwargs):
+    return PlacementService(
+        basic_config.clusters,
+        basic_config.initial_usage,
+        basic_config.cluster_capacity,
+        **kwargs,
+    )
+
+
+def test_concurrent_requests_share_a_batch(basic_config):
+    service = make_service(basic_config, max_batch=8, max_wait=0.05, solver="numpy")
+
+    async def scenario():
+        await service.start()
+        results = await asyncio.gather(
+            *(service.place({f"vm{k}": vm(5.0 + k)}) for k in range(4))
+        )
+        await service.stop()
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert [batch_size for _, _, batch_size in results] == [4] * 4
+    placed = {}
+    for placement, _, _ in results:
+        placed.update(placement)
+    assert set(placed) == {f"vm{k}" for k in range(4)}
+    # The live state is the initial usage plus the placed demands
+    assert service.existing_placements == placed
+    expected = MinUtilizationOptimizer(
+        basic_config.clusters,
+        {},
+        list(placed),
+        basic_config.initial_usage,
+        basic_config.cluster_capacity,
+        {f"vm{k}": vm(5.0 + k) for k in range(4)},
+    ).calculate_utilization(None, placed)
+    for c, usage in service.state.to_usage_dict().items():
+        assert usage == pytest.approx(expected[c])
+    assert results[0][1] == service.state.to_usage_dict()
+
+    stats = service.stats()
+    assert stats["requests"] == 4
+    assert stats["batches"] == 1
+    assert stats["latency"]["count"] == 4
+    assert stats["latency"]["p50"] <= stats["latency"]["p99"]
+
+
+def test_unbatched_and_infeasible_requests(basic_config):
+    service = make_service(
+        basic_config, optimizer_class=MaxMinResidualOptimizer, max_batch=1
+    )
+
+    async def scenario():
+        await service.start()
+        ok, too_large = await asyncio.gather(
+            service.place({"vm1": vm(10.0)}),
+            service.place({"vm2": vm(90.0)}),
+            return_exceptions=True,
+        )
+        with pytest.raises(PlacementError):
+            await service.place({"vm1": vm(1.0)})
+        await service.stop()
+        return ok, too_large
+
+    ok, too_large = asyncio.run(scenario())
+
+    assert ok[0] == {"vm1": "c1"}
+    assert ok[2] == 1
+    assert isinstance(too_large, PlacementError)
+    assert service.stats()["batches"] == 2
+    assert service.stats()["failures"] == 1
+
+
+def test_batch_falls_back_to_single_requests(basic_config):
+    service = make_service(
+        basic_config,
+        optimizer_class=MaxMinResidualOptimizer,
+        max_batch=8,
+        max_wait=0.05,
+    )
+
+    async def scenario():
+        await service.start()
+        results = await asyncio.gather(
+            service.place({"vm1": vm(10.0)}),
+            service.place({"vm2": vm(90.0)}),
+            return_exceptions=True,
+        )
+        await service.stop()
+        return results
+
+    ok, too_large = asyncio.run(scenario())
+
+    # The unplaceable request does not fail the one sharing its batch
+    assert ok[0] == {"vm1": "c1"}
+    assert ok[2] == 2
+    assert isinstance(too_large, PlacementError)
+    assert service.existing_placements == {"vm1": "c1"}
+
+
+@pytest.mark.parametrize(
+    "demand",
+    [{"cpu": 5.0}, vm(-1000.0), vm(float("nan")), vm("5"), vm(True), ["cpu"]],
+)
+def test_invalid_demands_are_rejected(basic_config, demand):
+    service = make_service(basic_config, optimizer_class=MaxMinResidualOptimizer)
+
+    async def scenario():
+        await service.start()
+        with pytest.raises(PlacementError):
+            await service.place({"vm1": demand})
+        await service.stop()
+
+    asyncio.run(scenario())
+
+    assert service.stats()["batches"] == 0
+    assert service.existing_placements == {}
+
+
+def test_batch_window_times_out(basic_config):
+    service = make_service(
+        basic_config,
+        optimizer_class=MaxMinResidualOptimizer,
+        max_batch=8,
+        max_wait=0.02,
+    )
+
+    async def scenario():
+        await service.start()
+        # Each request waits out its batch window alone
+        first = await service.place({"vm1": vm(10.0)})
+        second = await service.place({"vm2": vm(10.0)})
+        await service.stop()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first[2] == second[2] == 1
+    assert set(service.existing_placements) == {"vm1", "vm2"}
+    assert service.stats()["batches"] == 2
+
+
+def test_client_server_round_trip(basic_config):
+    service = make_service(basic_config, optimizer_class=MaxMinResidualOptimizer)
+    initial = service.state.usage.copy()
+
+    async def scenario():
+        server = await service.serve(port=0)
+        port = server.sockets[0].getsockname()[1]
+        client = await PlacementClient.connect(port=port)
+        placed = await asyncio.gather(
+            *(client.place({f"vm{k}": vm(5.0)}) for k in range(3))
+        )
+        bad = await client.request({"op": "resize"})
+        released = await client.release(["vm0", "vm1", "vm2", "unknown"])
+        stats = await client.stats()
+        await client.close()
+        server.close()
+        await server.wait_closed()
+        await service.stop()
+        return placed, bad, released, stats
+
+    placed, bad, released, stats = asyncio.run(scenario())
+
+    for response in placed:
+        assert set(response) == {"placement", "utilization", "batch_size", "latency"}
+    assert "error" in bad
+    assert released["released"] == ["vm0", "vm1", "vm2"]
+    assert stats["requests"] == 3
+    assert stats["placed_vms"] == 0
+    assert service.state.usage == pytest.approx(initial)
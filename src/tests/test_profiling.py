@@ -0,0 +1,123 @@
+import os
+import time
+import tracemalloc
+
+import pytest
+
+from src.models.base_optimizer import PHASES
+from src.models.bin_packing_optimizer import BestFitOptimizer
+from src.models.min_max_optimizer import MinUtilizationOptimizer
+from src.services.profiling import PlacementProfiler
+from src.services.sequential_placement import SequentialPlacementSimulation
+
+
+def make_optimizer(optimizer_class, basic_config, num_vms=4):
+    new_vms = [f"vm{k}" for k in range(num_vms)]
+    return optimizer_class(
+        basic_config.clusters,
+        {},
+        new_vms,
+        basic_config.initial_usage,
+        basic_config.cluster_capacity,
+        {vm: {"cpu": 5.0, "mem": 8.0, "disk": 10.0} for vm in new_vms},
+        seed=0,
+    )
+
+
+def test_nested_phases_are_exclusive(basic_config):
+    optimizer = make_optimizer(BestFitOptimizer, basic_config)
+    with optimizer.phase("extract"):
+        with optimizer.phase("solve"):
+            time.sleep(0.02)
+    with optimizer.phase("solve"):
+        time.sleep(0.01)
+
+    assert optimizer.phase_times["solve"] >= 30_000_000
+    assert optimizer.phase_times["extract"] < 10_000_000
+    optimizer.reset_phases()
+    assert optimizer.phase_times == {}
+
+
+@pytest.mark.parametrize("optimizer_class", [MinUtilizationOptimizer, BestFitOptimizer])
+def test_optimize_records_its_phases(basic_config, optimizer_class):
+    optimizer = make_optimizer(optimizer_class, basic_config)
+    start = time.perf_counter_ns()
+    assert optimizer.optimize()[0] is not None
+    elapsed = time.perf_counter_ns() - start
+
+    assert {"build", "solve", "extract"} <= set(optimizer.phase_times)
+    assert set(optimizer.phase_times) <= set(PHASES)
+    assert all(t > 0 for t in optimizer.phase_times.values())
+    assert sum(optimizer.phase_times.values()) <= elapsed
+
+
+def test_simulation_reports_phases_and_profiles(basic_config, output_manager):
+    # Three batches of two VMs, all of which fit
+    basic_config.seed = 0
+    basic_config.num_vms = 6
+    basic_config.batch_size = 2
+    basic_config.profile = ["cprofile", "tracemalloc"]
+    simulation = SequentialPlacementSimulation(basic_config, output_manager)
+    summary = simulation.run_simulation()
+
+    phases = summary["phase_times"]
+    assert list(phases) == [*PHASES, "other"]
+    assert phases["solve"] > 0
+    assert phases["other"] >= 0
+    assert sum(phases.values()) == pytest.approx(sum(simulation.execution_times))
+    step = simulation.metrics_history[0].to_dict()
+    assert step["phase_times"]["build"] > 0
+
+    profile = summary["profile"]
+    assert profile["placements"] == summary["batches"] == 3
+    assert profile["peak_memory"]["count"] == 3
+    assert profile["peak_memory"]["max"] > 0
+    assert any("optimize" in row["function"] for row in profile["top_functions"])
+    assert sorted(os.listdir(profile["directory"])) == [
+        f"step{k}.prof" for k in range(3)
+    ]
+
+
+def profile_two_blocks(profiler):
+    with profiler.capture():
+        block = bytearray(4_000_000)
+        del block
+    with profiler.capture():
+        block = bytearray(1_000_000)
+        del block
+    first, second = profiler.peak_memory
+    assert first >= 4_000_000
+    assert 1_000_000 <= second < 4_000_000
+
+
+def test_tracemalloc_peak_per_placement():
+    # Tracing started by the caller is reused
+    tracemalloc.start()
+    try:
+        profile_two_blocks(PlacementProfiler(["tracemalloc"]))
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_tracemalloc_without_reset_peak(monkeypatch):
+    # As on Python 3.8: each placement is traced on its own
+    monkeypatch.delattr(tracemalloc, "reset_peak", raising=False)
+    profile_two_blocks(PlacementProfiler(["tracemalloc"]))
+    assert not tracemalloc.is_tracing()
+
+    # The caller's traces are not discarded to reset the peak
+    tracemalloc.start()
+    try:
+        kept = bytearray(2_000_000)
+        with pytest.raises(RuntimeError, match="already tracing"):
+            with PlacementProfiler(["tracemalloc"]).capture():
+                pass
+        assert tracemalloc.get_traced_memory()[0] >= len(kept)
+    finally:
+        tracemalloc.stop()
+
+
+def test_unknown_profiler():
+    with pytest.raises(ValueError, match="perf"):
+        PlacementProfiler(["perf"])
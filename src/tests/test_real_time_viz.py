@@ -0,0 +1,88 @@
+import copy
+
+import pytest
+
+from src.services.real_time_viz import run_visualization
+from src.services.sequential_placement import SequentialPlacementSimulation
+
+
+class HeadlessWindow:
+    """Records what the visualization window would show, without a display"""
+
+    root = None
+
+    def __init__(self, config, is_last=False):
+        self.is_last = is_last
+        self.steps = []
+        self.failed = None
+
+    def update_plot(self, current_usage, vm_name, execution_time, progress):
+        self.steps.append((vm_name, progress))
+
+    def finish(self, failed=False):
+        self.failed = failed
+
+    def close_window(self):
+        pass
+
+
+def visualize(config):
+    simulation = SequentialPlacementSimulation(config, None)
+    window = HeadlessWindow(config)
+    run_visualization(simulation, lambda config, is_last: window)
+    summary = simulation.summarize_results(
+        simulation.total_time, simulation.execution_times
+    )
+    return simulation, window, summary
+
+
+def test_visualized_run_matches_the_simulation(basic_config):
+    basic_config.num_vms = 6
+    basic_config.seed = 0
+    simulation, window, summary = visualize(copy.copy(basic_config))
+    expected = SequentialPlacementSimulation(
+        copy.copy(basic_config), None
+    ).run_simulation()
+
+    assert window.failed is False
+    assert len(window.steps) == 6
+    assert window.steps[-1] == ("vm6", 100.0)
+    assert summary["vms_placed"] == expected["vms_placed"] == 6
+    assert summary["batches"] == expected["batches"]
+    assert summary["amortized_placement_time"] > 0
+    assert summary["throughput"] > 0
+    assert simulation.existing_placements == expected_placements(basic_config)
+    # Steps are timed by optimizer phase, as in run_simulation
+    phases = summary["phase_times"]
+    assert phases["solve"] > 0
+    assert sum(phases.values()) == pytest.approx(sum(simulation.execution_times))
+
+
+def expected_placements(config):
+    simulation = SequentialPlacementSimulation(copy.copy(config), None)
+    simulation.run_simulation()
+    return simulation.existing_placements
+
+
+def test_visualized_run_places_in_batches(basic_config):
+    basic_config.num_vms = 6
+    basic_config.batch_size = 4
+    simulation, window, summary = visualize(basic_config)
+
+    assert simulation.batch_sizes == [4, 2]
+    assert [vms for vms, _ in window.steps] == ["vm1, vm2, vm3, vm4", "vm5, vm6"]
+    assert summary["batches"] == 2
+    assert summary["vms_placed"] == 6
+
+
+def test_visualized_run_applies_the_solve_limits(basic_config):
+    basic_config.num_vms = 4
+    basic_config.time_limit = 5.0
+    basic_config.mip_gap = 0.01
+    simulation, _, summary = visualize(basic_config)
+
+    assert simulation.optimizer.time_limit == 5.0
+    assert simulation.optimizer.mip_gap == 0.01
+    assert summary["limit_hits"] == 0
+    # The optimizer's gap is recorded with every step
+    assert simulation.metrics_tracker.history["mip_gap"].tolist() == [0.0] * 4
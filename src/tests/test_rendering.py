@@ -0,0 +1,37 @@
+import os
+
+from src.models.baseline_optimizer import BaselineOptimizer
+from src.services.rendering import PlotRenderer, load_results
+from test_runner import TestRunner
+
+
+def plot_files(output_dir):
+    return sorted(
+        name
+        for _, _, files in os.walk(os.path.join(output_dir, "plots"))
+        for name in files
+    )
+
+
+def test_plots_render_from_saved_results(basic_config):
+    basic_config.num_vms = 5
+    basic_config.optimizer_model = BaselineOptimizer
+    runner = TestRunner(plots=False)
+    runner.scenarios = [basic_config]
+    runner.run_all_tests()
+
+    output_dir = runner.output_manager.output_dir
+    # The run itself only saves data
+    assert plot_files(output_dir) == []
+
+    results = load_results(output_dir)
+    assert results["test_scenario"]["initial_utilization"] == (
+        basic_config.initial_usage
+    )
+
+    PlotRenderer(runner.output_manager, dpi=20, fmt="svg").render(results)
+    files = plot_files(output_dir)
+    assert "sequential_placement_results_test_scenario.svg" in files
+    assert "test_scenario_imbalance_evolution.svg" in files
+    assert "comparative_imbalance_scores.svg" in files
+    assert all(name.endswith(".svg") for name in files)
@@ -0,0 +1,50 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.models.baseline_optimizer import BaselineOptimizer
+from src.services.replication import ReplicationEngine, StepStatistics
+
+
+def test_step_statistics_match_numpy_on_ragged_series():
+    rng = np.random.default_rng(0)
+    series = [rng.uniform(size=n) for n in (5, 3, 5, 4)]
+    stats = StepStatistics()
+    for values in series:
+        stats.add(values)
+
+    for k in range(5):
+        samples = [values[k] for values in series if len(values) > k]
+        assert stats.count[k] == len(samples)
+        assert stats.mean[k] == pytest.approx(np.mean(samples))
+        assert stats.variance()[k] == pytest.approx(np.var(samples, ddof=1))
+
+    low, high = stats.confidence_interval()
+    assert np.all(low <= stats.mean) and np.all(stats.mean <= high)
+
+
+@pytest.mark.integration
+def test_replication_is_independent_of_worker_count(basic_config, output_manager):
+    basic_config.num_vms = 5
+    basic_config.optimizer_model = BaselineOptimizer
+
+    summaries = []
+    for jobs in (1, 2):
+        engine = ReplicationEngine(
+            [basic_config], output_manager, replicates=3, jobs=jobs
+        )
+        summaries.append(engine.run())
+
+    sequential, parallel = summaries
+    steps = sequential["test_scenario"]["steps"]
+    assert (
+        steps["overall_imbalance"]
+        == parallel["test_scenario"]["steps"]["overall_imbalance"]
+    )
+    assert steps["cpu_max_utilization"]["count"] == [3] * 5
+
+    with open(output_manager.get_data_path("replicates.jsonl")) as f:
+        records = [json.loads(line) for line in f]
+    assert [r["replicate"] for r in records] == [0, 1, 2]
+    assert len({r["seed"] for r in records}) == 3
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from src.models.baseline_optimizer import BaselineOptimizer
+from src.services.results_store import StepReader, StepWriter
+from src.services.sequential_placement import SequentialPlacementSimulation
+
+
+@pytest.fixture
+def streamed_simulation(basic_config, output_manager):
+    basic_config.num_vms = 6
+    basic_config.seed = 0
+    basic_config.vm_demand_ranges = dict.fromkeys(["cpu", "mem", "disk"], (1.0, 5.0))
+    basic_config.optimizer_model = BaselineOptimizer
+    writer = StepWriter.for_scenario(
+        output_manager, basic_config.name, basic_config.clusters
+    )
+    simulation = SequentialPlacementSimulation(
+        basic_config, output_manager, step_writer=writer
+    )
+    with writer:
+        simulation.run_simulation()
+    return simulation
+
+
+def test_steps_round_trip(streamed_simulation):
+    reader = StepReader(streamed_simulation.step_writer.path)
+
+    assert reader.clusters == ["c1", "c2"]
+    assert reader.schema[-1] == "placements"
+    history = list(reader.metrics_history())
+    assert history == [
+        {
+            "execution_time": m["execution_time"],
+            "overall_imbalance": m["overall_imbalance"],
+            "mip_gap": m["mip_gap"],
+            "hit_limit": m["hit_limit"],
+            "phase_times": m["phase_times"],
+            "resources": m["resources"],
+        }
+        for m in (metrics.to_dict() for metrics in streamed_simulation.metrics_history)
+    ]
+
+    placements = {vm: cluster for step in reader for vm, cluster in step["placements"]}
+    assert placements == streamed_simulation.existing_placements
+
+    columns = reader.columns(["step", "cpu_max_utilization"])
+    assert columns["step"].tolist() == list(range(6))
+    assert columns["cpu_max_utilization"].dtype == np.float64
+
+
+def test_simulation_without_history_keeps_summary(basic_config, output_manager):
+    basic_config.num_vms = 6
+    basic_config.seed = 0
+    basic_config.vm_demand_ranges = dict.fromkeys(["cpu", "mem", "disk"], (1.0, 5.0))
+    basic_config.optimizer_model = BaselineOptimizer
+    simulation = SequentialPlacementSimulation(
+        basic_config, output_manager, keep_history=False
+    )
+    summary = simulation.run_simulation()
+
+    assert simulation.metrics_history == []
+    assert simulation.placement_history == []
+    assert summary["vms_placed"] == 6
+    assert summary["initial_metrics"] is not None
+    assert summary["final_metrics"]["overall_imbalance"] >= 0
@@ -0,0 +1,80 @@
+import copy
+
+import numpy as np
+import pytest
+
+from src.models.bin_packing_optimizer import MaxMinResidualOptimizer
+from src.services.event_simulation import EventDrivenSimulation
+from src.services.scenario_generator import (
+    CorrelatedDemand,
+    generate_scenario,
+    scaling_scenarios,
+)
+from src.services.sequential_placement import SequentialPlacementSimulation
+
+
+def test_scenarios_are_reproducible_from_the_seed():
+    first = generate_scenario(1000, seed=7)
+    second = generate_scenario(1000, seed=7)
+    other = generate_scenario(1000, seed=8)
+
+    assert len(first.clusters) == 1000
+    assert first.num_vms == 10_000
+    assert first.cluster_capacity == second.cluster_capacity
+    assert first.initial_usage == second.initial_usage
+    assert first.cluster_capacity != other.cluster_capacity
+
+    sizes = [len(c.clusters) for c in scaling_scenarios([10, 100], vms_per_cluster=2)]
+    assert sizes == [10, 100]
+
+
+def test_correlated_demand():
+    demand = CorrelatedDemand({"cpu": 1.0, "mem": 2.0, "disk": 3.0}, 0.5, 0.8)
+    samples = demand.sample(np.random.default_rng(0), 100_000)
+
+    assert samples.shape == (100_000, 3)
+    assert np.all(samples > 0)
+    assert np.corrcoef(np.log(samples).T)[0, 1] == pytest.approx(0.8, abs=0.01)
+    assert np.median(samples, axis=0) == pytest.approx([1.0, 2.0, 3.0], rel=0.02)
+    assert samples.mean(axis=0) == pytest.approx(list(demand.mean().values()), rel=0.02)
+    # Pairwise correlations of -0.9 between three resources are impossible
+    with pytest.raises(ValueError, match="positive definite"):
+        CorrelatedDemand({"cpu": 1.0, "mem": 1.0, "disk": 1.0}, correlation=-0.9)
+    # The simulations place cpu, mem and disk only
+    gpu = CorrelatedDemand({"cpu": 1.0, "gpu": 1.0}, resources=["cpu", "gpu"])
+    with pytest.raises(ValueError, match="gpu"):
+        generate_scenario(10, demand=gpu)
+
+
+def test_initial_utilization_skew():
+    even = generate_scenario(100, utilization_skew=0.0, resource_sigma=0.0)
+    usage = np.array([list(u.values()) for u in even.initial_usage.values()])
+    assert usage == pytest.approx(0.3)
+
+    skewed = generate_scenario(10_000, utilization_skew=0.5, resource_sigma=0.0)
+    usage = np.array([u["cpu"] for u in skewed.initial_usage.values()])
+    assert usage.mean() == pytest.approx(0.3, rel=0.02)
+    assert usage.std() / usage.mean() == pytest.approx(0.5, rel=0.05)
+    assert usage.max() <= 0.95
+
+
+def test_simulations_draw_from_the_demand_model():
+    config = generate_scenario(
+        20, num_vms=200, seed=1, optimizer_model=MaxMinResidualOptimizer
+    )
+    summary = EventDrivenSimulation(config).run_simulation()
+    assert summary["vms_placed"] == 200
+    again = EventDrivenSimulation(config).run_simulation()
+    assert summary["final_utilization"] == again["final_utilization"]
+
+    simulation = SequentialPlacementSimulation(config, None, keep_history=False)
+    demands = [simulation.generate_vm_demand() for _ in range(2000)]
+    cpu = np.log([d["cpu"] for d in demands])
+    mem = np.log([d["mem"] for d in demands])
+    # Outside vm_demand_ranges' independent uniforms: correlated lognormals
+    assert np.corrcoef(cpu, mem)[0, 1] == pytest.approx(0.6, abs=0.05)
+    # Demands and optimizer tie-breaks come from distinct streams of the seed
+    fresh = SequentialPlacementSimulation(config, None, keep_history=False)
+    tie_breaks = copy.deepcopy(fresh.optimizer_rng)
+    first = list(fresh.generate_vm_demand().values())
+    assert first != config.vm_demand_model.sample(tie_breaks, 1)[0].tolist()
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from src.models.min_max_optimizer import MinUtilizationOptimizer
+
+RESOURCES = ["cpu", "mem", "disk"]
+
+
+def random_instance(seed):
+    """Random single-VM instance with heterogeneous capacities and usage"""
+    rng = np.random.default_rng(seed)
+    num_clusters = int(rng.integers(1, 7))
+    clusters = [f"c{i + 1}" for i in range(num_clusters)]
+    cluster_capacity = {
+        c: {r: float(rng.uniform(50.0, 200.0)) for r in RESOURCES} for c in clusters
+    }
+    current_usage = {
+        c: {r: float(rng.uniform(0.0, 0.9)) for r in RESOURCES} for c in clusters
+    }
+    vm_demand = {"vm1": {r: float(rng.uniform(1.0, 40.0)) for r in RESOURCES}}
+    return clusters, current_usage, cluster_capacity, vm_demand
+
+
+def solve_both(clusters, current_usage, cluster_capacity, vm_demand):
+    args = (clusters, {}, ["vm1"], current_usage, cluster_capacity, vm_demand)
+
+    mip = MinUtilizationOptimizer(*args)
+    mip.create_model()
+    mip.add_objective()
+    mip_result = mip.solve()
+
+    analytical_result = MinUtilizationOptimizer(*args).solve_single_vm()
+    return mip_result, analytical_result
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_single_vm_fast_path_matches_cplex(seed):
+    instance = random_instance(seed)
+    mip_result, analytical_result = solve_both(*instance)
+
+    if mip_result[0] is None:
+        assert analytical_result == (None, None, None, None)
+        return
+
+    mip_plan, _, mip_z, _ = mip_result
+    plan, cluster_utilization, z, final_placement = analytical_result
+
+    assert z == pytest.approx(mip_z, abs=1e-6)
+    # The chosen cluster attains the same objective as CPLEX's choice
+    assert max(max(usage.values()) for usage in cluster_utilization.values()) == (
+        pytest.approx(z)
+    )
+    assert final_placement[plan["vm1"]] == ["vm1"]
+
+
+def test_single_vm_fast_path_picks_unique_optimum():
+    clusters = ["c1", "c2", "c3"]
+    current_usage = {
+        "c1": {"cpu": 0.4, "mem": 0.3, "disk": 0.2},
+        "c2": {"cpu": 0.2, "mem": 0.5, "disk": 0.3},
+        "c3": {"cpu": 0.1, "mem": 0.2, "disk": 0.4},
+    }
+    cluster_capacity = {c: dict.fromkeys(RESOURCES, 100.0) for c in clusters}
+    vm_demand = {"vm1": {"cpu": 35.0, "mem": 10.0, "disk": 5.0}}
+
+    mip_result, analytical_result = solve_both(
+        clusters, current_usage, cluster_capacity, vm_demand
+    )
+
+    assert analytical_result[0] == mip_result[0] == {"vm1": "c3"}
+    assert analytical_result[2] == pytest.approx(0.5)
+
+
+def test_single_vm_fast_path_infeasible():
+    clusters = ["c1", "c2"]
+    current_usage = {c: dict.fromkeys(RESOURCES, 0.9) for c in clusters}
+    cluster_capacity = {c: dict.fromkeys(RESOURCES, 100.0) for c in clusters}
+    vm_demand = {"vm1": {"cpu": 20.0, "mem": 1.0, "disk": 1.0}}
+
+    optimizer = MinUtilizationOptimizer(
+        clusters, {}, ["vm1"], current_usage, cluster_capacity, vm_demand
+    )
+    assert optimizer.optimize() == (None, None, None, None)
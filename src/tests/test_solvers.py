@@ -0,0 +1,311 @@
+import functools
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+from src.models import numpy_solver
+from src.models.incremental_optimizer import IncrementalMinUtilizationOptimizer
+from src.models.min_max_optimizer import MinUtilizationOptimizer
+from src.models.min_max_per_cluster_optimizer import MinMaxPerClusterOptimizer
+from src.models.numpy_solver import ITERATION_LIMIT, NumpyModel, solve_lp
+from src.models.solvers import add_mip_start, new_model
+
+
+class ColdMinUtilizationOptimizer(MinUtilizationOptimizer):
+    analytical_single_vm = False
+
+
+def objective(optimizer_class, result):
+    """Objective of an optimize() result: the peak, or the sum of the z[c, r]"""
+    _, cluster_utilization, final_utilization, _ = result
+    if issubclass(optimizer_class, MinMaxPerClusterOptimizer):
+        return sum(sum(u.values()) for u in cluster_utilization.values())
+    return final_utilization
+
+
+def random_demand(num_vms, seed):
+    rng = np.random.default_rng(seed)
+    return {
+        f"vm{k}": dict(zip(["cpu", "mem", "disk"], rng.uniform(2.0, 12.0, 3)))
+        for k in range(num_vms)
+    }
+
+
+def test_solve_lp_with_bounds_and_equalities():
+    # min -x - 2y  s.t.  x + y <= 4, x - y == 1, 0 <= x <= 3, y >= 0.5
+    objective, x = solve_lp(
+        np.array([-1.0, -2.0]),
+        np.array([[1.0, 1.0]]),
+        np.array([4.0]),
+        np.array([[1.0, -1.0]]),
+        np.array([1.0]),
+        np.array([0.0, 0.5]),
+        np.array([3.0, np.inf]),
+    )
+    assert objective == pytest.approx(-5.5)
+    assert x == pytest.approx([2.5, 1.5])
+
+    # Infeasible: x + y <= 4 with x >= 3 and y >= 2
+    assert (
+        solve_lp(
+            np.array([1.0, 1.0]),
+            np.array([[1.0, 1.0]]),
+            np.array([4.0]),
+            np.zeros((0, 2)),
+            np.zeros(0),
+            np.array([3.0, 2.0]),
+            np.array([np.inf, np.inf]),
+        )
+        is None
+    )
+
+
+def knapsack_model():
+    values = [10.0, 13.0, 7.0, 8.0]
+    weights = [5.0, 6.0, 3.0, 4.0]
+    mdl = new_model("knapsack", "numpy")
+    x = mdl.binary_var_dict(range(4), name="x")
+    mdl.add_constraint(mdl.sum(weights[i] * x[i] for i in range(4)) <= 10.0)
+    mdl.maximize(mdl.sum(values[i] * x[i] for i in range(4)))
+    return mdl, x
+
+
+def test_numpy_model_solves_knapsack():
+    mdl, x = knapsack_model()
+    assert isinstance(mdl, NumpyModel)
+    solution = mdl.solve()
+
+    assert solution.objective_value == pytest.approx(21.0)
+    assert [round(solution.get_value(x[i])) for i in range(4)] == [0, 1, 0, 1]
+
+
+def test_simplex_iteration_limit_leaves_nodes_open(monkeypatch):
+    monkeypatch.setattr(
+        numpy_solver,
+        "_iterate",
+        functools.partial(numpy_solver._iterate, max_iterations=1),
+    )
+    assert (
+        solve_lp(
+            np.array([-1.0, -2.0]),
+            np.array([[1.0, 1.0], [1.0, -1.0]]),
+            np.array([4.0, 1.0]),
+            np.zeros((0, 2)),
+            np.zeros(0),
+            np.zeros(2),
+            np.array([3.0, 3.0]),
+        )
+        is ITERATION_LIMIT
+    )
+
+    # No relaxation is solved: not proven infeasible, only stopped
+    mdl, x = knapsack_model()
+    assert mdl.solve() is None
+    assert mdl.solve_details.status == "iteration limit exceeded"
+    assert mdl.solve_details.has_hit_limit()
+
+    # A MIP start needs no pivots to complete and stays the incumbent
+    mdl, x = knapsack_model()
+    add_mip_start(mdl, {x[0]: 1.0, x[1]: 0.0, x[2]: 1.0, x[3]: 0.0})
+    assert mdl.solve().objective_value == pytest.approx(17.0)
+    assert mdl.solve_details.has_hit_limit()
+    # The root relaxation is open, so there is no finite bound
+    assert mdl.solve_details.best_bound is None
+    assert mdl.solve_details.mip_relative_gap is None
+
+
+def test_unknown_solver_is_rejected():
+    with pytest.raises(ValueError):
+        new_model("m", "glpk")
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_numpy_backend_matches_docplex(basic_config, seed):
+    vm_demand = random_demand(6, seed)
+    for optimizer_class in (ColdMinUtilizationOptimizer, MinMaxPerClusterOptimizer):
+        results = {}
+        for solver in ("docplex", "numpy"):
+            optimizer = optimizer_class(
+                basic_config.clusters,
+                {},
+                list(vm_demand),
+                basic_config.initial_usage,
+                basic_config.cluster_capacity,
+                vm_demand,
+                solver=solver,
+            )
+            result = optimizer.optimize()
+            assert set(result[0]) == set(vm_demand)
+            results[solver] = objective(optimizer_class, result)
+
+        assert results["numpy"] == pytest.approx(results["docplex"], rel=1e-3)
+
+
+def test_numpy_backend_reports_infeasible_placement(basic_config):
+    vm_demand = {"vm1": {"cpu": 95.0, "mem": 10.0, "disk": 10.0}}
+    optimizer = ColdMinUtilizationOptimizer(
+        basic_config.clusters,
+        {},
+        ["vm1"],
+        basic_config.initial_usage,
+        basic_config.cluster_capacity,
+        vm_demand,
+        solver="numpy",
+    )
+    assert optimizer.optimize() == (None, None, None, None)
+
+
+def test_models_import_without_cplex():
+    # A fresh interpreter in which cplex and docplex cannot be imported
+    code = textwrap.dedent(
+        """
+        import importlib, pkgutil, sys
+
+        class NoCplex:
+            def find_spec(self, name, path=None, target=None):
+                if name.split(".")[0] in ("cplex", "docplex"):
+                    raise ImportError(name)
+
+        sys.meta_path.insert(0, NoCplex())
+        import src.models
+        for module in pkgutil.iter_modules(src.models.__path__):
+            importlib.import_module(f"src.models.{module.name}")
+        """
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_incremental_optimizer_requires_docplex(basic_config):
+    with pytest.raises(ValueError):
+        IncrementalMinUtilizationOptimizer(
+            basic_config.clusters,
+            {},
+            ["vm1"],
+            basic_config.initial_usage,
+            basic_config.cluster_capacity,
+            {"vm1": {"cpu": 1.0, "mem": 1.0, "disk": 1.0}},
+            solver="numpy",
+        )
+
+
+def min_max_model(solver, num_vms, num_clusters, seed, **limits):
+    rng = np.random.default_rng(seed)
+    demand = rng.uniform(1.0, 10.0, (num_vms, 3))
+    usage = rng.uniform(0.0, 0.5, (num_clusters, 3))
+    mdl = new_model("min_max", solver, **limits)
+    x = mdl.binary_var_dict(
+        ((v, c) for v in range(num_vms) for c in range(num_clusters)), name="x"
+    )
+    z = mdl.continuous_var(name="z")
+    for v in range(num_vms):
+        mdl.add_constraint(mdl.sum(x[v, c] for c in range(num_clusters)) == 1)
+    for c in range(num_clusters):
+        for j in range(3):
+            load = mdl.sum(demand[v, j] * x[v, c] for v in range(num_vms))
+            mdl.add_constraint(load / 100.0 + usage[c, j] <= z)
+    mdl.minimize(z)
+    return mdl
+
+
+def test_numpy_time_limit_returns_incumbent_with_gap():
+    # Proving this model optimal takes seconds of branch-and-bound
+    mdl = min_max_model("numpy", 10, 5, seed=1, time_limit=0.2)
+    solution = mdl.solve()
+
+    details = mdl.solve_details
+    assert solution is not None
+    assert details.has_hit_limit()
+    assert 0.0 <= details.mip_relative_gap < 1.0
+    assert details.time < 1.0
+
+
+def test_gap_tolerance_is_applied():
+    for solver in ("docplex", "numpy"):
+        mdl = min_max_model(solver, 6, 3, seed=0, mip_gap=0.05)
+        assert mdl.solve() is not None
+        assert mdl.solve_details.mip_relative_gap <= 0.05 + 1e-9
+        assert not mdl.solve_details.has_hit_limit()
+
+
+def test_optimizer_records_gap_of_its_solve(basic_config):
+    vm_demand = random_demand(4, 0)
+    for solver in ("docplex", "numpy"):
+        optimizer = ColdMinUtilizationOptimizer(
+            basic_config.clusters,
+            {},
+            list(vm_demand),
+            basic_config.initial_usage,
+            basic_config.cluster_capacity,
+            vm_demand,
+            solver=solver,
+            time_limit=5.0,
+            mip_gap=0.01,
+        )
+        assert optimizer.optimize()[0] is not None
+        assert 0.0 <= optimizer.gap <= 0.01 + 1e-9
+        assert optimizer.hit_limit is False
+
+
+def test_numpy_mip_start_is_the_first_incumbent():
+    mdl = new_model("start", "numpy", time_limit=0.0)
+    x = mdl.binary_var_dict(range(3), name="x")
+    y = mdl.continuous_var(name="y")
+    mdl.add_constraint(mdl.sum(x[i] for i in range(3)) == 1)
+    mdl.add_constraint(y >= 2.0 * x[0] + 3.0 * x[1] + 1.0 * x[2])
+    mdl.minimize(y)
+
+    # The search stops at once: only the completed start is available
+    add_mip_start(mdl, {x[0]: 0.0, x[1]: 1.0})
+    solution = mdl.solve()
+    assert solution.objective_value == pytest.approx(3.0)
+    assert solution.get_value(x[2]) == 0.0
+    assert mdl.solve_details.has_hit_limit()
+    assert mdl.solve_details.mip_relative_gap is None
+
+    mdl.time_limit = None
+    assert mdl.solve().objective_value == pytest.approx(1.0)
+
+
+class UnseededMinUtilizationOptimizer(ColdMinUtilizationOptimizer):
+    warm_start = False
+
+
+class UnseededMinMaxPerClusterOptimizer(MinMaxPerClusterOptimizer):
+    warm_start = False
+
+
+@pytest.mark.parametrize("solver", ["docplex", "numpy"])
+def test_warm_start_keeps_the_optimum(basic_config, solver):
+    vm_demand = random_demand(8, 3)
+    pairs = [
+        (ColdMinUtilizationOptimizer, UnseededMinUtilizationOptimizer),
+        (MinMaxPerClusterOptimizer, UnseededMinMaxPerClusterOptimizer),
+    ]
+    for seeded, unseeded in pairs:
+        results = {}
+        for optimizer_class in (seeded, unseeded):
+            optimizer = optimizer_class(
+                basic_config.clusters,
+                {},
+                list(vm_demand),
+                basic_config.initial_usage,
+                basic_config.cluster_capacity,
+                vm_demand,
+                seed=0,
+                solver=solver,
+            )
+            result = optimizer.optimize()
+            results[optimizer_class] = objective(optimizer_class, result)
+            if optimizer_class is seeded:
+                assert optimizer.warm_start_time is not None
+                # The greedy start is feasible, so its peak is never below the
+                # optimal peak
+                if seeded is ColdMinUtilizationOptimizer:
+                    assert optimizer.warm_start_utilization >= result[2] - 1e-6
+            else:
+                assert optimizer.warm_start_time is None
+
+        assert results[seeded] == pytest.approx(results[unseeded], rel=1e-3)
@@ -0,0 +1,136 @@
+import copy
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.models.baseline_optimizer import BaselineOptimizer
+from src.models.baseline_optimizer_inv import BaselineOptimizerInv
+from src.models.bin_packing_optimizer import MaxMinResidualOptimizer
+from src.models.cluster_state import ClusterState
+from src.models.state_store import ClusterStateStore, Proposal
+from src.services.sequential_placement import SequentialPlacementSimulation
+
+RESOURCES = ["cpu", "mem", "disk"]
+
+
+def vm(cpu, mem=5.0, disk=5.0):
+    return {"cpu": cpu, "mem": mem, "disk": disk}
+
+
+def make_store(basic_config):
+    return ClusterStateStore(
+        ClusterState.from_dicts(
+            basic_config.clusters,
+            basic_config.initial_usage,
+            basic_config.cluster_capacity,
+        )
+    )
+
+
+def test_commit_compare_and_swap(basic_config):
+    store = make_store(basic_config)
+    first = store.snapshot()
+    second = store.snapshot()
+
+    assert store.commit(Proposal(first.version, {"vm1": "c1"}, {"vm1": vm(10.0)}))
+    # Stale but still within capacity: applied after the re-check
+    assert store.commit(Proposal(second.version, {"vm2": "c1"}, {"vm2": vm(10.0)}))
+    # Stale and over capacity, or placing a VM already committed: rejected
+    assert (
+        store.commit(Proposal(second.version, {"vm3": "c1"}, {"vm3": vm(65.0)})) is None
+    )
+    assert (
+        store.commit(Proposal(second.version, {"vm1": "c2"}, {"vm1": vm(1.0)})) is None
+    )
+
+    stats = store.stats()
+    assert (stats["commits"], stats["merged"], stats["conflicts"]) == (1, 1, 2)
+    assert stats["version"] == 2
+    assert store.snapshot().placements == {"vm1": "c1", "vm2": "c1"}
+    assert store.snapshot().state.usage[0] == pytest.approx([0.4, 0.4, 0.3])
+    # The snapshot taken before the commits is unaffected
+    assert first.state.usage[0] == pytest.approx([0.2, 0.3, 0.2])
+
+
+def test_release_restores_usage(basic_config):
+    store = make_store(basic_config)
+    initial = store.snapshot().state.usage
+
+    plan = store.place(
+        MaxMinResidualOptimizer, ["vm1", "vm2"], {"vm1": vm(10.0), "vm2": vm(20.0)}
+    )
+    assert set(plan) == {"vm1", "vm2"}
+    assert store.release(["vm1", "vm2", "unknown"]) == ["vm1", "vm2"]
+
+    assert store.snapshot().state.usage == pytest.approx(initial)
+    assert store.snapshot().placements == {}
+    assert store.version == 2
+
+
+def test_concurrent_placers_never_overcommit(basic_config):
+    store = make_store(basic_config)
+    initial = store.snapshot().state
+    rng = np.random.default_rng(0)
+    demands = {f"vm{k}": vm(*rng.uniform(1.0, 4.0, 3).tolist()) for k in range(80)}
+
+    def worker(names):
+        return [
+            store.place(MaxMinResidualOptimizer, [name], {name: demands[name]})
+            for name in names
+        ]
+
+    names = list(demands)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(worker, [names[i::8] for i in range(8)]))
+
+    placed = {}
+    for plans in results:
+        for plan in plans:
+            if plan is not None:
+                placed.update(plan)
+
+    snapshot = store.snapshot()
+    assert snapshot.placements == placed
+    expected = initial.usage.copy()
+    for name, cluster in placed.items():
+        i = initial.cluster_index[cluster]
+        expected[i] += initial.demand_vector(demands[name]) / initial.capacity[i]
+    assert snapshot.state.usage == pytest.approx(expected)
+    assert np.all(snapshot.state.usage <= 1.0 + 1e-9)
+    stats = store.stats()
+    assert stats["commits"] + stats["merged"] == len(placed)
+
+
+@pytest.mark.parametrize("optimizer_class", [BaselineOptimizer, BaselineOptimizerInv])
+def test_baseline_leaves_caller_usage_alone(basic_config, optimizer_class):
+    initial_usage = copy.deepcopy(basic_config.initial_usage)
+    optimizer_class(
+        basic_config.clusters,
+        {},
+        ["vm1"],
+        basic_config.initial_usage,
+        basic_config.cluster_capacity,
+        {"vm1": vm(10.0)},
+        seed=0,
+    ).optimize()
+
+    assert basic_config.initial_usage == initial_usage
+
+
+def test_baseline_simulation_counts_each_vm_once(basic_config, output_manager):
+    basic_config.optimizer_model = BaselineOptimizer
+    basic_config.seed = 0
+    simulation = SequentialPlacementSimulation(basic_config, output_manager)
+    initial_usage = copy.deepcopy(simulation.current_usage)
+    simulation.run_simulation()
+
+    assert simulation.placement_history
+    expected = copy.deepcopy(initial_usage)
+    for record in simulation.placement_history:
+        for r in RESOURCES:
+            expected[record.cluster][r] += (
+                record.demand[r] / basic_config.cluster_capacity[record.cluster][r]
+            )
+    for c in basic_config.clusters:
+        assert simulation.current_usage[c] == pytest.approx(expected[c])
@@ -0,0 +1,86 @@
+import time
+
+import pytest
+
+from src.models.bin_packing_optimizer import MaxMinResidualOptimizer
+from src.services import test_config
+from src.services.trace_replay import read_trace, replay, write_trace
+
+
+def vm(cpu, mem=5.0, disk=5.0):
+    return {"cpu": cpu, "mem": mem, "disk": disk}
+
+
+def make_config():
+    return test_config.TestConfig(
+        name="trace",
+        num_vms=0,
+        clusters=["c1"],
+        cluster_capacity={"c1": {"cpu": 100.0, "mem": 100.0, "disk": 100.0}},
+        optimizer_model=MaxMinResidualOptimizer,
+        seed=0,
+    )
+
+
+@pytest.mark.parametrize("name", ["trace.csv", "trace.csv.gz"])
+def test_trace_round_trip(tmp_path, name):
+    rows = [
+        ("vm1", 0.0, vm(1.5), 10.0),
+        ("vm2", 0.25, vm(2.0, 3.0, 4.0), None),
+    ]
+    path = str(tmp_path / name)
+    write_trace(path, rows)
+
+    assert list(read_trace(path)) == rows
+
+
+def test_trace_lifetime_column_and_errors(tmp_path):
+    path = tmp_path / "trace.csv"
+    path.write_text("vm,arrival,cpu,mem,disk,lifetime\nvm1,2,1,1,1,3\nvm2,1,1,1,1,\n")
+    rows = read_trace(str(path))
+    assert next(rows) == ("vm1", 2.0, vm(1.0, 1.0, 1.0), 5.0)
+    # Arrivals must be sorted
+    with pytest.raises(ValueError, match=":3:"):
+        next(rows)
+
+    path.write_text("vm,arrival,cpu,mem\nvm1,0,1,1\n")
+    with pytest.raises(ValueError, match="disk"):
+        next(read_trace(str(path)))
+
+
+def test_departures_free_capacity_for_later_arrivals(tmp_path):
+    # Each VM takes 60% CPU: they only fit one at a time
+    path = str(tmp_path / "trace.csv")
+    write_trace(path, [(f"vm{k}", float(k), vm(60.0), k + 0.5) for k in range(3)])
+
+    summary = replay(make_config(), path)
+
+    assert summary["vms_placed"] == 3
+    assert summary["rejected_vms"] == 0
+    assert summary["departed_vms"] == 2
+    assert summary["final_utilization"]["c1"] == pytest.approx(vm(0.6, 0.05, 0.05))
+
+
+def test_unplaceable_vms_are_rejected_and_replay_goes_on(tmp_path):
+    path = str(tmp_path / "trace.csv")
+    write_trace(path, [(f"vm{k}", float(k), vm(60.0), None) for k in range(3)])
+
+    summary = replay(make_config(), path)
+
+    assert summary["vms_placed"] == 1
+    assert summary["rejected_vms"] == 2
+    assert summary["batches"] == 3
+    assert summary["latency"]["count"] == 3
+
+
+def test_scaled_replay_follows_the_clock(tmp_path):
+    path = str(tmp_path / "trace.csv")
+    write_trace(path, [(f"vm{k}", k * 0.5, vm(1.0), None) for k in range(3)])
+
+    start = time.perf_counter()
+    summary = replay(make_config(), path, speed=10.0)
+    elapsed = time.perf_counter() - start
+
+    # One simulated second of arrivals at 10x takes at least 0.1s
+    assert elapsed >= 0.1
+    assert summary["vms_placed"] == 3
@@ -1,67 +1,105 @@
 import argparse
 import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 
-import matplotlib.pyplot as plt
-import numpy as np
-
+from src.models.solvers import SOLVERS
+from src.services.profiling import PROFILERS
 from src.services.real_time_viz import run_visualization
+from src.services.rendering import PlotRenderer
+from src.services.results_store import StepWriter
 from src.services.sequential_placement import SequentialPlacementSimulation
 from src.services.test_config import generate_test_scenarios
-from src.services.utils import OutputManager
+from src.services.utils import OutputManager, configure_logging, init_worker_logging
+
+
+def create_simulation(scenario, output_manager):
+    """Simulation streaming its placement steps to data/steps/<scenario>.jsonl"""
+    step_writer = StepWriter.for_scenario(
+        output_manager, scenario.name, scenario.clusters
+    )
+    return SequentialPlacementSimulation(
+        scenario, output_manager, step_writer=step_writer, keep_history=False
+    )
+
+
+def summarize(simulation):
+    """Close the simulation's step file and summarize its results"""
+    simulation.step_writer.close()
+    scenario_results = simulation.summarize_results(
+        simulation.total_time, simulation.execution_times
+    )
+    scenario_results["steps_file"] = os.path.relpath(
+        simulation.step_writer.path,
+        simulation.output_manager.get_data_path(""),
+    )
+    return scenario_results
+
+
+def run_scenario(scenario, output_manager):
+    """Run one scenario without visualization"""
+    simulation = create_simulation(scenario, output_manager)
+    simulation.run_simulation()
+    return summarize(simulation)
 
 
 class TestRunner:
-    def __init__(self, use_visualization=False):  # Add parameter
+    __test__ = False  # Not a pytest test class
+
+    def __init__(
+        self,
+        use_visualization=False,
+        jobs=1,
+        base_seed=0,
+        plots=True,
+        dpi=300,
+        plot_format="png",
+        solver=None,
+        time_limit=None,
+        mip_gap=None,
+        profile=None,
+    ):
         self.scenarios = generate_test_scenarios()
         self.results = {}
         self.use_visualization = use_visualization  # Store preference
         self.output_manager = OutputManager()  # Add output manager
+        # Plots are rendered from the saved results once all scenarios ran
+        self.plots = plots
+        self.renderer = PlotRenderer(self.output_manager, dpi=dpi, fmt=plot_format)
+        # Scenarios run in a process pool of this size when greater than 1
+        self.jobs = jobs
+        # Each scenario gets its own seed, so results do not depend on the
+        # order or the process in which scenarios run
+        for i, scenario in enumerate(self.scenarios):
+            if scenario.seed is None:
+                scenario.seed = base_seed + i
+            if solver is not None:
+                scenario.solver = solver
+            if time_limit is not None:
+                scenario.time_limit = time_limit
+            if mip_gap is not None:
+                scenario.mip_gap = mip_gap
+            if profile:
+                scenario.profile = profile
 
     def run_all_tests(self):
         try:
             print(f"\nStarting test run: {self.output_manager.run_id}")
-            for i, scenario in enumerate(self.scenarios):
-                print(f"\nRunning scenario: {scenario.name}")
-                print("=" * 50)
-
-                simulation = SequentialPlacementSimulation(
-                    scenario, self.output_manager
-                )
-
-                if self.use_visualization:
-                    try:
-                        run_visualization(simulation)
-                        # Check if this is the last scenario
-                        if i == len(self.scenarios) - 1:
-                            # For the last scenario, change button text
-                            print("Last scenario completed. Click 'Finish' to exit.")
-                    except Exception as e:
-                        print(f"Visualization error: {e}")
-                        continue
-                else:
-                    print(f"Running without visualization: {scenario.name}")
-                    simulation.run_simulation()
-
-                scenario_results = simulation.summarize_results(
-                    simulation.total_time, simulation.execution_times
-                )
+            if self.jobs > 1:
+                self._run_parallel()
+            else:
+                self._run_sequential()
 
-                if scenario_results:
-                    print(f"Completed scenario: {scenario.name}")
-                    self.results[scenario.name] = scenario_results
-                    self._print_scenario_results(scenario.name, scenario_results)
-                else:
-                    print(f"Failed to get results for scenario: {scenario.name}")
-
-                # Plot results for this scenario
-                simulation.plot_results()
-
-            # Create comparative plots after all scenarios are complete
-            self.create_comparative_plots()
-
-            self._save_results()
+            results_data = self._save_results()
             print(f"\nResults saved in: {self.output_manager.output_dir}")
 
+            # Render scenario and comparative plots after all scenarios are
+            # complete, so they do not count towards any simulation timing
+            if self.plots:
+                print("Rendering plots...")
+                self.renderer.render(results_data, jobs=self.jobs)
+
         finally:
             # Ensure all tkinter windows are closed
             try:
@@ -72,6 +110,58 @@ class TestRunner:
             except Exception:
                 pass
 
+    def _run_sequential(self):
+        for scenario in self.scenarios:
+            print(f"\nRunning scenario: {scenario.name}")
+            print("=" * 50)
+
+            if self.use_visualization:
+                simulation = create_simulation(scenario, self.output_manager)
+                try:
+                    run_visualization(simulation)
+                except Exception as e:
+                    simulation.step_writer.close()
+                    print(f"Visualization error: {e}")
+                    continue
+
+                scenario_results = summarize(simulation)
+            else:
+                print(f"Running without visualization: {scenario.name}")
+                scenario_results = run_scenario(scenario, self.output_manager)
+
+            self._collect_results(scenario.name, scenario_results)
+
+    def _run_parallel(self):
+        """
+        Run the scenarios in a pool of self.jobs worker processes. Scenarios
+        are independent and seeded, and results are collected in scenario
+        order, so the outcome does not depend on the number of workers.
+        """
+        if self.use_visualization:
+            print("Visualization is not available with --jobs, running headless")
+
+        print(f"Running {len(self.scenarios)} scenarios with {self.jobs} workers")
+        with ProcessPoolExecutor(
+            max_workers=self.jobs,
+            initializer=init_worker_logging,
+            initargs=(logging.getLogger("src").getEffectiveLevel(),),
+        ) as executor:
+            all_results = executor.map(
+                run_scenario,
+                self.scenarios,
+                [self.output_manager] * len(self.scenarios),
+            )
+            for scenario, scenario_results in zip(self.scenarios, all_results):
+                self._collect_results(scenario.name, scenario_results)
+
+    def _collect_results(self, scenario_name, scenario_results):
+        if scenario_results:
+            print(f"Completed scenario: {scenario_name}")
+            self.results[scenario_name] = scenario_results
+            self._print_scenario_results(scenario_name, scenario_results)
+        else:
+            print(f"Failed to get results for scenario: {scenario_name}")
+
     def _print_scenario_results(self, scenario_name, results):
         print(f"\nResults for scenario: {scenario_name}")
 
@@ -84,11 +174,35 @@ class TestRunner:
         print(f"Average placement time: {results['avg_placement_time']:.3f} seconds")
         print(f"Min placement time: {results['min_placement_time']:.3f} seconds")
         print(f"Max placement time: {results['max_placement_time']:.3f} seconds")
+        print(
+            f"Amortized placement time: {results['amortized_placement_time']:.4f} "
+            f"seconds/VM over {results['batches']} batches"
+        )
+        print(f"Throughput: {results['throughput']:.1f} VMs/second")
+        latency = results["latency"]
+        print(
+            f"Placement latency p50/p90/p99: {latency['p50']:.3f}/"
+            f"{latency['p90']:.3f}/{latency['p99']:.3f} seconds, "
+            f"{results['limit_hits']} solves stopped at the time limit"
+        )
+        print(
+            "Solve time by phase: "
+            + ", ".join(
+                f"{phase} {seconds:.3f}s"
+                for phase, seconds in results["phase_times"].items()
+            )
+        )
+        if results["profile"]:
+            for row in results["profile"]["top_functions"][:5]:
+                print(
+                    f"  {row['cumulative']:8.3f}s cumulative, {row['calls']:>7} "
+                    f"calls: {row['function']}"
+                )
 
         print("\nFinal Resource Utilization:")
         for cluster, usage in results["final_utilization"].items():
             print(
-                f"{cluster}: {', '.join(f'{r}: {v*100:.1f}%' for r, v in usage.items())}"
+                f"{cluster}: {', '.join(f'{r}: {v * 100:.1f}%' for r, v in usage.items())}"
             )
 
         print("\nCluster Distribution:")
@@ -105,15 +219,22 @@ class TestRunner:
                 "avg_placement_time": results["avg_placement_time"],
                 "min_placement_time": results["min_placement_time"],
                 "max_placement_time": results["max_placement_time"],
+                "amortized_placement_time": results["amortized_placement_time"],
+                "throughput": results["throughput"],
+                "batches": results["batches"],
+                "latency": results["latency"],
+                "limit_hits": results["limit_hits"],
+                "phase_times": results["phase_times"],
+                "profile": results["profile"],
+                "initial_utilization": results["initial_utilization"],
                 "final_utilization": results["final_utilization"],
                 "cluster_distribution": {
                     cluster: len(vms)
                     for cluster, vms in results["cluster_distribution"].items()
                 },
-                # Remove the to_dict() call since metrics are already in dict format
-                "metrics_history": results["metrics_history"]
-                if results["metrics_history"]
-                else [],
+                # Per-step metrics are streamed to this file, relative to data/
+                "steps_file": results["steps_file"],
+                "initial_metrics": results["initial_metrics"],
                 "final_metrics": results["final_metrics"],
             }
             for scenario_name, results in self.results.items()
@@ -122,254 +243,7 @@ class TestRunner:
         output_file = self.output_manager.get_data_path("test_results.json")
         with open(output_file, "w") as f:
             json.dump(results_data, f, indent=2)
-
-    def create_comparative_plots(self):
-        """
-        Create comparative plots showing initial and final metrics across all scenarios.
-        """
-        if not self.results:
-            print("No results available for comparison")
-            return
-
-        plt.style.use("default")
-
-        # Prepare data
-        scenarios = list(self.results.keys())
-        n_scenarios = len(scenarios)
-
-        # Define proper color schemes
-        colors = {
-            "cpu": {"light": "#90EE90", "dark": "#2F4F4F"},
-            "mem": {"light": "#FFB6C1", "dark": "#8B0000"},
-            "disk": {"light": "#87CEEB", "dark": "#00008B"},
-        }
-
-        def extract_resource_metrics(metrics_data, is_initial=True):
-            """Helper function to extract resource metrics"""
-            try:
-                if is_initial:
-                    if not metrics_data["metrics_history"]:
-                        print("Warning: No metrics history found for scenario")
-                        return None
-                    metrics = metrics_data["metrics_history"][0]
-                else:
-                    if not metrics_data["final_metrics"]:
-                        print("Warning: No final metrics found for scenario")
-                        return None
-                    metrics = metrics_data["final_metrics"]
-
-                return {
-                    "cpu": metrics["resources"]["cpu"],
-                    "mem": metrics["resources"]["mem"],
-                    "disk": metrics["resources"]["disk"],
-                }
-            except (KeyError, IndexError) as e:
-                print(f"Error extracting metrics: {e}")
-                return None
-
-        # Extract initial and final metrics for each scenario
-        initial_metrics = {}
-        final_metrics = {}
-        imbalance_scores = {"initial": [], "final": []}
-        valid_scenarios = []
-
-        for scenario in scenarios:
-            result = self.results[scenario]
-            if not result["success"]:
-                print(f"Skipping failed scenario: {scenario}")
-                continue
-
-            initial_metric = extract_resource_metrics(result, True)
-            final_metric = extract_resource_metrics(result, False)
-
-            if initial_metric is None or final_metric is None:
-                print(f"Skipping scenario {scenario} due to missing metrics")
-                continue
-
-            try:
-                initial_imbalance = result["metrics_history"][0]["overall_imbalance"]
-                final_imbalance = result["final_metrics"]["overall_imbalance"]
-            except (KeyError, IndexError):
-                print(f"Skipping scenario {scenario} due to missing imbalance scores")
-                continue
-
-            initial_metrics[scenario] = initial_metric
-            final_metrics[scenario] = final_metric
-            imbalance_scores["initial"].append(initial_imbalance)
-            imbalance_scores["final"].append(final_imbalance)
-            valid_scenarios.append(scenario)
-
-        if not valid_scenarios:
-            print("No valid scenarios with complete metrics found")
-            return
-
-        # Update n_scenarios to use only valid ones
-        scenarios = valid_scenarios
-        n_scenarios = len(scenarios)
-
-        # Continue with plotting only if we have valid scenarios
-        if n_scenarios > 0:
-            # 1. Bar plot comparing initial and final imbalance scores
-            plt.figure(figsize=(12, 6))
-            x = np.arange(n_scenarios)
-            width = 0.35
-
-            plt.bar(
-                x - width / 2,
-                imbalance_scores["initial"],
-                width,
-                label="Initial",
-                color="#D3D3D3",
-            )
-            plt.bar(
-                x + width / 2,
-                imbalance_scores["final"],
-                width,
-                label="Final",
-                color="#4169E1",
-            )
-
-            plt.xlabel("Scenarios")
-            plt.ylabel("Imbalance Score")
-            plt.title("Initial vs Final Imbalance Scores Across Scenarios")
-            plt.xticks(x, scenarios, rotation=45)
-            plt.legend()
-            plt.grid(True, alpha=0.3)
-            plt.tight_layout()
-            plt.savefig(
-                self.output_manager.get_comparative_plot_path(
-                    "comparative_imbalance_scores.png"
-                ),
-                dpi=300,
-                bbox_inches="tight",
-            )
-            plt.close()
-
-            # 2. Resource utilization comparison
-            fig, axes = plt.subplots(3, 1, figsize=(12, 15))
-
-            for idx, resource in enumerate(["cpu", "mem", "disk"]):
-                ax = axes[idx]
-
-                initial_max = [
-                    initial_metrics[s][resource]["max_utilization"] * 100
-                    for s in scenarios
-                ]
-                final_max = [
-                    final_metrics[s][resource]["max_utilization"] * 100
-                    for s in scenarios
-                ]
-                initial_avg = [
-                    initial_metrics[s][resource]["avg_utilization"] * 100
-                    for s in scenarios
-                ]
-                final_avg = [
-                    final_metrics[s][resource]["avg_utilization"] * 100
-                    for s in scenarios
-                ]
-
-                x = np.arange(n_scenarios)
-                width = 0.2
-
-                ax.bar(
-                    x - width * 1.5,
-                    initial_max,
-                    width,
-                    label="Initial Max",
-                    color="#D3D3D3",
-                )
-                ax.bar(
-                    x - width / 2,
-                    final_max,
-                    width,
-                    label="Final Max",
-                    color=colors[resource]["light"],
-                )
-                ax.bar(
-                    x + width / 2,
-                    initial_avg,
-                    width,
-                    label="Initial Avg",
-                    color="#A9A9A9",
-                )
-                ax.bar(
-                    x + width * 1.5,
-                    final_avg,
-                    width,
-                    label="Final Avg",
-                    color=colors[resource]["dark"],
-                )
-
-                ax.set_title(f"{resource.upper()} Utilization Comparison")
-                ax.set_xticks(x)
-                ax.set_xticklabels(scenarios, rotation=45)
-                ax.set_ylabel("Utilization (%)")
-                ax.grid(True, alpha=0.3)
-                ax.legend()
-
-            plt.tight_layout()
-            plt.savefig(
-                self.output_manager.get_comparative_plot_path(
-                    "comparative_resource_utilization.png"
-                ),
-                dpi=300,
-                bbox_inches="tight",
-            )
-            plt.close()
-
-            # 3. Heatmap of improvement percentages
-            improvements = np.zeros((3, n_scenarios))
-
-            for idx, resource in enumerate(["cpu", "mem", "disk"]):
-                for s_idx, scenario in enumerate(scenarios):
-                    initial_imbalance = (
-                        initial_metrics[scenario][resource]["max_utilization"]
-                        - initial_metrics[scenario][resource]["avg_utilization"]
-                    )
-                    final_imbalance = (
-                        final_metrics[scenario][resource]["max_utilization"]
-                        - final_metrics[scenario][resource]["avg_utilization"]
-                    )
-                    if initial_imbalance > 0:
-                        improvements[idx, s_idx] = (
-                            (initial_imbalance - final_imbalance)
-                            / initial_imbalance
-                            * 100
-                        )
-                    else:
-                        improvements[idx, s_idx] = 0
-
-            plt.figure(figsize=(12, 6))
-            im = plt.imshow(improvements, aspect="auto", cmap="RdYlGn")
-            plt.colorbar(im, label="Improvement %")
-
-            plt.yticks(range(3), ["CPU", "Memory", "Disk"])
-            plt.xticks(range(n_scenarios), scenarios, rotation=45)
-            plt.title("Resource Balance Improvement by Scenario (%)")
-
-            # Add text annotations to the heatmap
-            for i in range(3):
-                for j in range(n_scenarios):
-                    plt.text(
-                        j,
-                        i,
-                        f"{improvements[i, j]:.1f}%",
-                        ha="center",
-                        va="center",
-                        color="black",
-                    )
-
-            plt.tight_layout()
-            plt.savefig(
-                self.output_manager.get_comparative_plot_path(
-                    "comparative_improvements_heatmap.png"
-                ),
-                dpi=300,
-                bbox_inches="tight",
-            )
-            plt.close()
-        else:
-            print("No plots generated due to lack of valid data")
+        return results_data
 
 
 if __name__ == "__main__":
@@ -377,8 +251,67 @@ if __name__ == "__main__":
     parser.add_argument(
         "--no-viz", action="store_true", help="Run without visualization"
     )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="count",
+        default=0,
+        help="Log each placement (-v) or full model and state details (-vv)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Run scenarios in parallel in this many worker processes",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Base seed; scenario i uses seed + i",
+    )
+    parser.add_argument(
+        "--no-plots",
+        action="store_true",
+        help="Only save result data; render later with python -m src.services.rendering",
+    )
+    parser.add_argument("--dpi", type=int, default=300, help="Plot resolution")
+    parser.add_argument(
+        "--plot-format", default="png", help="Plot file format (png, svg, pdf, ...)"
+    )
+    parser.add_argument(
+        "--solver",
+        choices=SOLVERS,
+        help="MIP backend (default: docplex when CPLEX is installed, else numpy)",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        help="Seconds per solve; a solve cut short keeps its best placement",
+    )
+    parser.add_argument("--mip-gap", type=float, help="Relative MIP gap per solve")
+    parser.add_argument(
+        "--profile",
+        action="append",
+        choices=PROFILERS,
+        help="Profile every placement (repeatable); cProfile files go to "
+        "data/profiles/<scenario>/",
+    )
     args = parser.parse_args()
-
-    runner = TestRunner(use_visualization=not args.no_viz)
+    configure_logging(args.verbose)
+
+    runner = TestRunner(
+        use_visualization=not args.no_viz,
+        jobs=args.jobs,
+        base_seed=args.seed,
+        plots=not args.no_plots,
+        dpi=args.dpi,
+        plot_format=args.plot_format,
+        solver=args.solver,
+        time_limit=args.time_limit,
+        mip_gap=args.mip_gap,
+        profile=args.profile,
+    )
     print(f"Starting new test run with ID: {runner.output_manager.run_id}")
     runner.run_all_tests()